@@ -1,8 +1,18 @@
 #
 # Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
 #
+"""Snowflake dialect for SQLAlchemy.
 
-from importlib.metadata import version as _get_version
+Only the SQLAlchemy types re-exported below are imported eagerly.  Everything
+else, including the dialect itself and, through it, ``snowflake.connector``,
+is imported on first attribute access (PEP 562), so building a ``URL`` or
+compiling a statement does not pay for modules it never uses.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.sql.sqltypes import UUID  # noqa
 from sqlalchemy.types import (  # noqa
@@ -23,77 +33,114 @@ from sqlalchemy.types import (  # noqa
     VARCHAR,
 )
 
-from . import base, snowdialect  # noqa
-from ._identifiers import FQN  # noqa
-from .custom_commands import (  # noqa
-    AWSBucket,
-    AzureContainer,
-    CloudStorageLocation,
-    CopyFormatter,
-    CopyIntoStorage,
-    CreateFileFormat,
-    CreateStage,
-    CSVFormatter,
-    ExternalStage,
-    GCSBucket,
-    InsertMulti,
-    JSONFormatter,
-    MergeInto,
-    PARQUETFormatter,
-)
-from .custom_types import (  # noqa
-    ARRAY,
-    BYTEINT,
-    CHARACTER,
-    DEC,
-    DECFLOAT,
-    DOUBLE,
-    FIXED,
-    GEOGRAPHY,
-    GEOMETRY,
-    MAP,
-    NUMBER,
-    OBJECT,
-    STRING,
-    TEXT,
-    TIMESTAMP_LTZ,
-    TIMESTAMP_NTZ,
-    TIMESTAMP_TZ,
-    TINYINT,
-    VARBINARY,
-    VARIANT,
-    VECTOR,
-)
-from .orm import SnowflakeBase, SnowflakeSession, snowflake_declarative_base  # noqa
-from .secret_logging import (  # noqa
-    SnowflakeSecretRedactionFilter,
-    add_secret_redaction_filter,
-    redact_secrets,
-)
-from .sql.custom_schema import (  # noqa
-    DynamicTable,
-    HybridTable,
-    IcebergTable,
-    SnowflakeTable,
-)
-from .sql.custom_schema.options import (  # noqa
-    AsQueryOption,
-    ClusterByOption,
-    IdentifierOption,
-    KeywordOption,
-    LiteralOption,
-    RowAccessPolicyOption,
-    SnowflakeKeyword,
-    TableOptionKey,
-    TargetLagOption,
-    TimeUnit,
-)
-from .util import _url as URL  # noqa
-from .util import create_snowflake_engine  # noqa
-
-base.dialect = dialect = snowdialect.dialect  # type: ignore[attr-defined]
+if TYPE_CHECKING:
+    from . import base, snowdialect  # noqa
+    from ._identifiers import FQN  # noqa
+    from .custom_commands import (  # noqa
+        AWSBucket,
+        AzureContainer,
+        CloudStorageLocation,
+        CopyFormatter,
+        CopyIntoStorage,
+        CreateFileFormat,
+        CreateStage,
+        CSVFormatter,
+        ExternalStage,
+        GCSBucket,
+        InsertMulti,
+        JSONFormatter,
+        MergeInto,
+        PARQUETFormatter,
+    )
+    from .custom_types import (  # noqa
+        ARRAY,
+        BYTEINT,
+        CHARACTER,
+        DEC,
+        DECFLOAT,
+        DOUBLE,
+        FIXED,
+        GEOGRAPHY,
+        GEOMETRY,
+        MAP,
+        NUMBER,
+        OBJECT,
+        STRING,
+        TEXT,
+        TIMESTAMP_LTZ,
+        TIMESTAMP_NTZ,
+        TIMESTAMP_TZ,
+        TINYINT,
+        VARBINARY,
+        VARIANT,
+        VECTOR,
+    )
+    from .async_queries import (  # noqa
+        AsyncQueryHandle,
+        gather_async,
+        submit_async,
+    )
+    from .batching import (  # noqa
+        BatchedStatement,
+        StatementBatch,
+        batch_statements,
+    )
+    from .fingerprint import statement_fingerprint  # noqa
+    from .functions import last_query_id, result_scan  # noqa
+    from .inspector import ReflectedTableStats, SnowflakeInspector  # noqa
+    from .instrumentation import (  # noqa
+        LoggingSink,
+        OpenTelemetrySink,
+        RingBufferSink,
+        StatementTiming,
+    )
+    from .operator_stats import (  # noqa
+        OperatorStats,
+        QueryOperatorStats,
+        get_query_operator_stats,
+    )
+    from .orm import SnowflakeBase, SnowflakeSession, snowflake_declarative_base  # noqa
+    from .pool_refresh import TokenExpiryRecycler  # noqa
+    from .query_plan import PlanOperation, QueryPlan, assert_pruning, explain  # noqa
+    from .reflection_stats import ReflectionStats  # noqa
+    from .result_cache import (  # noqa
+        CachedResult,
+        DiskResultCache,
+        MemoryResultCache,
+        ResultCache,
+        invalidate_result_cache,
+    )
+    from .retry import RetryPolicy  # noqa
+    from .secret_logging import (  # noqa
+        SnowflakeSecretRedactionFilter,
+        add_secret_redaction_filter,
+        redact_secrets,
+    )
+    from .session_state import get_session_state, reset_session_state  # noqa
+    from .snowdialect import dialect  # noqa
+    from .sql.custom_schema import (  # noqa
+        DynamicTable,
+        HybridTable,
+        IcebergTable,
+        SnowflakeTable,
+    )
+    from .sql.custom_schema.options import (  # noqa
+        AsQueryOption,
+        ClusterByOption,
+        IdentifierOption,
+        KeywordOption,
+        LiteralOption,
+        RowAccessPolicyOption,
+        SnowflakeKeyword,
+        TableOptionKey,
+        TargetLagOption,
+        TimeUnit,
+    )
+    from .util import _url as URL  # noqa
+    from .util import create_snowflake_engine, get_query_id, prewarm_pool  # noqa
+    from .warehouse_routing import WarehouseRoute, WarehouseRouter  # noqa
 
-__version__ = _get_version("snowflake-sqlalchemy")
+    __version__: str
 
 _custom_types = (
     "BIGINT",
@@ -177,7 +224,9 @@ _orm = (
     "snowflake_declarative_base",
 )
 
-_helpers = ("create_snowflake_engine", "FQN")
+_helpers = ("create_snowflake_engine", "prewarm_pool", "get_query_id", "FQN")
+
+_inspection = ("SnowflakeInspector", "ReflectedTableStats", "ReflectionStats")
 
 _secret_logging = (
     "SnowflakeSecretRedactionFilter",
@@ -185,6 +234,41 @@ _secret_logging = (
     "redact_secrets",
 )
 
+_async_queries = ("AsyncQueryHandle", "submit_async", "gather_async")
+
+_batching = ("BatchedStatement", "StatementBatch", "batch_statements")
+
+_pool_refresh = ("TokenExpiryRecycler",)
+
+_session_state = ("get_session_state", "reset_session_state")
+
+_fingerprint = ("statement_fingerprint",)
+
+_result_cache = (
+    "ResultCache",
+    "CachedResult",
+    "MemoryResultCache",
+    "DiskResultCache",
+    "invalidate_result_cache",
+)
+
+_retry = ("RetryPolicy",)
+
+_functions = ("result_scan", "last_query_id")
+
+_query_plan = ("explain", "assert_pruning", "QueryPlan", "PlanOperation")
+
+_operator_stats = ("get_query_operator_stats", "QueryOperatorStats", "OperatorStats")
+
+_warehouse_routing = ("WarehouseRouter", "WarehouseRoute")
+
+_instrumentation = (
+    "StatementTiming",
+    "LoggingSink",
+    "RingBufferSink",
+    "OpenTelemetrySink",
+)
+
 __all__ = (
     *_custom_types,
     *_custom_commands,
@@ -193,5 +277,105 @@ __all__ = (
     *_enums,
     *_orm,
     *_helpers,
+    *_inspection,
     *_secret_logging,
+    *_async_queries,
+    *_batching,
+    *_pool_refresh,
+    *_session_state,
+    *_instrumentation,
+    *_fingerprint,
+    *_result_cache,
+    *_retry,
+    *_warehouse_routing,
+    *_functions,
+    *_query_plan,
+    *_operator_stats,
 )
+
+# Public name -> (submodule, attribute) resolved by ``__getattr__``.
+_LAZY_ATTRIBUTES: dict[str, tuple[str, str]] = {
+    "URL": (".util", "_url"),
+    "create_snowflake_engine": (".util", "create_snowflake_engine"),
+    "prewarm_pool": (".util", "prewarm_pool"),
+    "get_query_id": (".util", "get_query_id"),
+    "FQN": ("._identifiers", "FQN"),
+    "dialect": (".snowdialect", "dialect"),
+    "ReflectionStats": (".reflection_stats", "ReflectionStats"),
+    **{name: (".custom_commands", name) for name in _custom_commands},
+    **{
+        name: (".custom_types", name)
+        for name in _custom_types
+        if name not in globals() and name != "URL"
+    },
+    **{name: (".sql.custom_schema", name) for name in _custom_tables},
+    **{
+        name: (".sql.custom_schema.options", name)
+        for name in (*_custom_table_options, *_enums)
+    },
+    **{name: (".orm", name) for name in _orm},
+    **{name: (".inspector", name) for name in _inspection if name != "ReflectionStats"},
+    **{name: (".secret_logging", name) for name in _secret_logging},
+    **{name: (".async_queries", name) for name in _async_queries},
+    **{name: (".batching", name) for name in _batching},
+    **{name: (".pool_refresh", name) for name in _pool_refresh},
+    **{name: (".session_state", name) for name in _session_state},
+    **{name: (".instrumentation", name) for name in _instrumentation},
+    **{name: (".fingerprint", name) for name in _fingerprint},
+    **{name: (".result_cache", name) for name in _result_cache},
+    **{name: (".retry", name) for name in _retry},
+    **{name: (".warehouse_routing", name) for name in _warehouse_routing},
+    **{name: (".functions", name) for name in _functions},
+    **{name: (".query_plan", name) for name in _query_plan},
+    **{name: (".operator_stats", name) for name in _operator_stats},
+}
+
+# Submodules that were historically bound on the package by its own imports.
+_LAZY_SUBMODULES = frozenset(
+    {
+        "_telemetry",
+        "aio",
+        "alembic_util",
+        "async_queries",
+        "base",
+        "batching",
+        "custom_commands",
+        "custom_types",
+        "fingerprint",
+        "functions",
+        "inspector",
+        "instrumentation",
+        "operator_stats",
+        "orm",
+        "pool_refresh",
+        "query_plan",
+        "result_cache",
+        "retry",
+        "secret_logging",
+        "session_state",
+        "snowdialect",
+        "sql",
+        "util",
+        "warehouse_routing",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_name, __name__), attribute)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name == "__version__":
+        from importlib.metadata import version
+
+        value = version("snowflake-sqlalchemy")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, *_LAZY_SUBMODULES, "__version__"})
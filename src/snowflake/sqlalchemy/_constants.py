@@ -1,8 +1,6 @@
 #
 # Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
 #
-from snowflake.connector.errorcode import ER_CONNECTION_IS_CLOSED
-
 from .version import VERSION
 
 # parameters needed for usage tracking
@@ -31,6 +29,21 @@ DISCONNECT_ERROR_CODES = frozenset(
         390195,  # authentication token expired (variant)
         390115,  # master token invalid
         390318,  # OAuth access token expired
-        ER_CONNECTION_IS_CLOSED,  # 250002, connection is closed (client side)
+        # connection is closed (client side); the connector's
+        # ``errorcode.ER_CONNECTION_IS_CLOSED``, inlined so importing this
+        # module does not load the connector.
+        250002,
+    }
+)
+
+# Error codes of a ``SHOW ... ->> SELECT`` pipe the server cannot compile
+# (no pipe operator, or no ``$1`` over ``SHOW`` output): only these turn
+# ``enable_show_column_projection`` off. Other errors (a missing object, a
+# privilege failure) would fail the plain ``SHOW`` too and are re-raised.
+SHOW_PROJECTION_UNSUPPORTED_ERROR_CODES = frozenset(
+    {
+        904,  # invalid identifier
+        1003,  # syntax error
+        2140,  # unknown function
     }
 )
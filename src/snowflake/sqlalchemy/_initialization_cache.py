@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Cache of the session facts ``SnowflakeDialect.initialize`` probes for.
+
+Entries are keyed by a digest of the connection identity (account, host, user,
+database, schema and role) and expire after a caller-supplied TTL.  They live
+in a process-wide dictionary and, optionally, in a small JSON file so that
+short-lived processes can skip the probe entirely.  Nothing secret is stored:
+the key is a hash and the values are the server version, current database and
+current schema.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Connection parameters that determine what the probe returns.
+_KEY_PARAMS = ("account", "host", "port", "user", "database", "schema", "role")
+
+_lock = threading.Lock()
+_process_cache: dict[str, tuple[float, list[Any]]] = {}
+
+
+def cache_key(cparams: Mapping[str, Any]) -> str:
+    """Return a digest identifying the session ``cparams`` would open."""
+    identity = {name: cparams.get(name) for name in _KEY_PARAMS}
+    raw = json.dumps(identity, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load(key: str, ttl: float, path: str | None = None) -> list[Any] | None:
+    """Return the cached probe row for ``key`` if younger than ``ttl`` seconds."""
+    now = time.time()
+    with _lock:
+        entry = _process_cache.get(key)
+    if entry is None and path:
+        entry = _read_file(path).get(key)
+        if entry is not None:
+            entry = (float(entry[0]), list(entry[1]))
+            with _lock:
+                _process_cache[key] = entry
+    if entry is None or now - entry[0] > ttl:
+        return None
+    return list(entry[1])
+
+
+def store(key: str, row: list[Any], path: str | None = None) -> None:
+    """Remember the probe row for ``key`` in the process and, if given, ``path``."""
+    entry = (time.time(), list(row))
+    with _lock:
+        _process_cache[key] = entry
+        if path:
+            entries = _read_file(path)
+            entries[key] = entry
+            _write_file(path, entries)
+
+
+def clear() -> None:
+    """Forget every in-process entry (the on-disk file is left alone)."""
+    with _lock:
+        _process_cache.clear()
+
+
+def _read_file(path: str) -> dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_file(path: str, entries: dict[str, Any]) -> None:
+    # Write to a temporary file and rename so concurrent readers never observe
+    # a partially written cache.
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError as e:
+        logger.debug("Could not write initialization cache %s: %s", path, e)
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not write initialization cache %s: %s", path, e)
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
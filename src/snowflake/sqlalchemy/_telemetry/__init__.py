@@ -4,7 +4,8 @@
 
 A connector-version-dispatch telemetry layer that decouples *gathering* the
 telemetry payloads (connector-agnostic, see ``payloads``) from *sending* them
-(version-specific adapters selected at runtime, see ``dispatch``).
+(version-specific adapters selected at runtime, see ``dispatch``, driven by a
+background thread, see ``sender``).
 """
 
 from __future__ import annotations
@@ -14,14 +15,18 @@ from typing import Any
 from .adapter import TelemetryAdapter, TelemetryEvents
 from .dispatch import get_adapter
 from .payloads import (
+    _TELEMETRY_CREDENTIAL_PARAMS,
     build_connection_parameters_payload,
     build_new_connection_payload,
 )
+from .sender import TelemetrySender, get_sender
 
 __all__ = [
     "TelemetryAdapter",
     "TelemetryEvents",
     "get_adapter",
+    "get_sender",
+    "TelemetrySender",
     "record_new_connection",
     "build_new_connection_payload",
     "build_connection_parameters_payload",
@@ -34,27 +39,46 @@ def record_new_connection(
     """Emit the new-connection telemetry events at connect time.
 
     Selects the connector-appropriate adapter, gates on the telemetry opt-in,
-    registers the legacy ``NEW_CONNECTION`` event (flat, sent as ``str(dict)``
+    and queues the legacy ``NEW_CONNECTION`` event (flat, sent as ``str(dict)``
     for backward compatibility) alongside the structured
-    ``NEW_CONNECTION_PARAMETERS`` event (nested dict / queryable JSON), then
-    flushes the batch.  The caller wraps this in a broad ``try/except`` so any
-    telemetry failure is non-fatal.
+    ``NEW_CONNECTION_PARAMETERS`` event (nested dict / queryable JSON) for the
+    background sender, so connecting never waits on the telemetry endpoint.
+    The caller wraps this in a broad ``try/except`` so any telemetry failure is
+    non-fatal.
     """
     adapter = get_adapter(connection)
     if not adapter.is_enabled(connection=connection):
         return
+    get_sender().submit(adapter, connection, _connection_events(dialect, cparams))
+
+
+def _connection_events(
+    dialect: Any, cparams: dict[str, Any] | None
+) -> list[tuple[str, str | dict]]:
+    """Return the new-connection events, built once per dialect.
+
+    Every connection of an engine shares its dialect flags and connect
+    parameters, so the payloads are cached on the dialect and only rebuilt when
+    the connect parameters, credentials aside, differ from those they were
+    built from.
+    """
+    # Credentials do not reach the payloads; keep them off the dialect too.
+    key = {
+        name: value
+        for name, value in (cparams or {}).items()
+        if name not in _TELEMETRY_CREDENTIAL_PARAMS
+    }
+    cached = getattr(dialect, "_telemetry_events", None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
     legacy_payload = build_new_connection_payload(dialect)
     structured_payload = build_connection_parameters_payload(dialect, cparams)
-
     # Legacy event keeps its historical ``str(dict)`` shape; the structured
     # event stays a dict so it lands as queryable JSON.
-    adapter.register(
-        TelemetryEvents.NEW_CONNECTION.value, str(legacy_payload), connection=connection
-    )
-    adapter.register(
-        TelemetryEvents.NEW_CONNECTION_PARAMETERS.value,
-        structured_payload,
-        connection=connection,
-    )
-    adapter.flush(connection=connection)
+    events: list[tuple[str, str | dict]] = [
+        (TelemetryEvents.NEW_CONNECTION.value, str(legacy_payload)),
+        (TelemetryEvents.NEW_CONNECTION_PARAMETERS.value, structured_payload),
+    ]
+    dialect._telemetry_events = (key, events)
+    return events
@@ -6,9 +6,12 @@ Uses the public 4.x telemetry API (``TelemetryClient`` / ``TelemetryData`` /
 ``TelemetryField``).  All connector imports are lazy (inside methods) so this
 module never hard-depends on the connector telemetry surface at import time.
 
-A fresh adapter instance is created per connection by ``dispatch.get_adapter``,
-so the cached ``TelemetryClient`` below is scoped to a single connection's
-``rest`` session (register x2 then flush) and never leaks across connections.
+A fresh adapter instance is created per connection by ``dispatch.get_adapter``.
+The background sender batches the events of connections of the same account,
+user and role opened close together through the first of those adapters, so
+the cached ``TelemetryClient`` below lives for one batch (register per event,
+then a single flush) and is bound to the ``rest`` session of the batch's first
+open connection.
 """
 
 from __future__ import annotations
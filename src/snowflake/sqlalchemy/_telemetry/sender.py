@@ -0,0 +1,191 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+"""Background delivery of telemetry events.
+
+``record_new_connection`` runs on the thread opening a connection, so it only
+enqueues events; a daemon thread sends them.  The queue is bounded and events
+are dropped (and counted) when it is full, so a slow or unreachable telemetry
+endpoint can never hold up or grow without bound in the application.  Events
+queued by connections of the same user opened close together are sent as one
+batch, and the queue is flushed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .adapter import TelemetryAdapter
+
+logger = logging.getLogger(__name__)
+
+#: Events waiting to be sent before new ones are dropped.
+MAX_QUEUED = 1000
+#: Connections whose events are sent in one batch.
+MAX_BATCH = 100
+#: How long the sender waits for more connections before sending a batch.
+LINGER_SECONDS = 0.05
+#: How long interpreter exit waits for queued events to be sent.
+EXIT_FLUSH_TIMEOUT = 2.0
+
+# Queue items: (adapter, connection, [(event_type, value), ...]) or a
+# ``threading.Event`` marker set once everything queued before it was sent.
+_Item = Any
+
+
+class TelemetrySender:
+    def __init__(
+        self,
+        max_queued: int = MAX_QUEUED,
+        max_batch: int = MAX_BATCH,
+        linger: float = LINGER_SECONDS,
+    ) -> None:
+        self._max_queued = max_queued
+        self._max_batch = max_batch
+        self._linger = linger
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[_Item] = queue.Queue(max_queued)
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._atexit_registered = False
+        #: Events dropped because the queue was full.
+        self.dropped = 0
+        #: Batches handed to an adapter's ``flush``.
+        self.batches_sent = 0
+
+    def submit(
+        self,
+        adapter: TelemetryAdapter,
+        connection: Any,
+        events: Sequence[tuple[str, str | dict]],
+    ) -> bool:
+        """Queue ``events`` for ``connection`` without blocking.
+
+        Returns ``False`` (and counts the events as dropped) when the queue is
+        full.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((adapter, connection, list(events)))
+        except queue.Full:
+            self.dropped += len(events)
+            logger.debug("Telemetry queue full; dropped %d event(s)", len(events))
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every event queued so far has been sent.
+
+        Returns ``False`` if that did not happen within ``timeout`` seconds.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != pid:
+                # Forked child: the parent's sender thread does not exist here
+                # and its queue may hold the parent's events.
+                self._queue = queue.Queue(self._max_queued)
+            if (
+                self._pid == pid
+                and self._thread is not None
+                and self._thread.is_alive()
+            ):
+                return
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run, name="snowflake-sqlalchemy-telemetry", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush, EXIT_FLUSH_TIMEOUT)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._linger
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0.001)))
+                except queue.Empty:
+                    break
+            markers = [item for item in batch if isinstance(item, threading.Event)]
+            self._send(
+                [item for item in batch if not isinstance(item, threading.Event)]
+            )
+            for marker in markers:
+                marker.set()
+
+    def _send(self, items: list[_Item]) -> None:
+        # Connections of the same user opened together share a single send
+        # through one of their adapters.  Events are only ever sent over a
+        # session of the account, user and role they describe.  The 4.x
+        # adapter binds its client to the first connection it sees, so start
+        # with one that is still open.
+        groups: dict[tuple, list[_Item]] = {}
+        for item in items:
+            key = (type(item[0]), _session_identity(item[1]))
+            groups.setdefault(key, []).append(item)
+        for group in groups.values():
+            group.sort(key=lambda item: _is_closed(item[1]))
+            adapter = group[0][0]
+            registered = 0
+            for _, connection, events in group:
+                try:
+                    for event_type, value in events:
+                        adapter.register(event_type, value, connection=connection)
+                    registered += 1
+                except Exception as e:
+                    _log_failure(e)
+            if not registered:
+                continue
+            try:
+                adapter.flush(connection=group[0][1])
+                self.batches_sent += 1
+            except Exception as e:
+                _log_failure(e)
+
+
+def _log_failure(e: Exception) -> None:
+    logger.debug("Failed to send telemetry data: %s: %s", type(e).__name__, str(e))
+
+
+def _session_identity(connection: Any) -> tuple:
+    return tuple(
+        getattr(connection, name, None) for name in ("host", "account", "user", "role")
+    )
+
+
+def _is_closed(connection: Any) -> bool:
+    try:
+        return bool(connection.is_closed())
+    except Exception:
+        return False
+
+
+_sender = TelemetrySender()
+
+
+def get_sender() -> TelemetrySender:
+    """Return the process-wide telemetry sender."""
+    return _sender
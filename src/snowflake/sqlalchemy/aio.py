@@ -0,0 +1,289 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""asyncio dialect for ``sqlalchemy.ext.asyncio``.
+
+``create_async_engine("snowflake+asyncio://...")`` selects
+:class:`SnowflakeDialect_asyncio`.  It drives the connector's native asyncio
+API (``snowflake.connector.aio``, which needs ``aiohttp``) so that one event
+loop can keep many queries in flight without a thread per query.  When the
+asyncio API is not installed, every blocking connector call is run in the
+event loop's default thread pool instead; that keeps the loop responsive but
+needs a pool thread per concurrently executing call.
+
+Everything else, including the compilers, reflection (through
+``AsyncConnection.run_sync``) and the connection options, is shared with the
+synchronous :class:`~snowflake.sqlalchemy.snowdialect.SnowflakeDialect`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import pool, util
+from sqlalchemy.connectors.asyncio import (
+    AsyncAdapt_dbapi_connection,
+    AsyncAdapt_dbapi_cursor,
+    AsyncAdapt_dbapi_module,
+    AsyncAdapt_dbapi_ss_cursor,
+    AsyncAdaptFallback_dbapi_connection,
+)
+from sqlalchemy.engine.interfaces import DBAPIConnection, DBAPICursor
+from sqlalchemy.engine.url import URL
+from sqlalchemy.util.concurrency import await_fallback, await_only
+
+from .base import SnowflakeExecutionContext
+from .snowdialect import SnowflakeDialect
+
+logger = logging.getLogger(__name__)
+
+_DBAPI_ATTRIBUTES = (
+    "apilevel",
+    "threadsafety",
+    "paramstyle",
+    "Error",
+    "InterfaceError",
+    "DatabaseError",
+    "DataError",
+    "OperationalError",
+    "IntegrityError",
+    "InternalError",
+    "ProgrammingError",
+    "NotSupportedError",
+)
+
+
+class AsyncAdapt_snowflake_cursor(AsyncAdapt_dbapi_cursor):
+    __slots__ = ()
+
+    @property
+    def sfqid(self) -> str | None:
+        return getattr(self._cursor, "sfqid", None)
+
+
+class AsyncAdapt_snowflake_ss_cursor(AsyncAdapt_dbapi_ss_cursor):
+    __slots__ = ()
+
+    @property
+    def sfqid(self) -> str | None:
+        return getattr(self._cursor, "sfqid", None)
+
+
+class AsyncAdapt_snowflake_connection(AsyncAdapt_dbapi_connection):
+    _cursor_cls = AsyncAdapt_snowflake_cursor
+    _ss_cursor_cls = AsyncAdapt_snowflake_ss_cursor
+
+    __slots__ = ()
+
+    def autocommit(self, mode: bool) -> None:
+        try:
+            self.await_(self._connection.autocommit(mode))
+        except Exception as error:
+            self._handle_exception(error)
+
+    def is_closed(self) -> bool:
+        return bool(self._connection.is_closed())
+
+
+class AsyncAdaptFallback_snowflake_connection(
+    AsyncAdaptFallback_dbapi_connection, AsyncAdapt_snowflake_connection
+):
+    __slots__ = ()
+
+
+class _ThreadedCursor:
+    """Awaitable facade over a synchronous connector cursor.
+
+    Each call that can block on the network runs in the event loop's default
+    executor.
+    """
+
+    def __init__(self, cursor: Any) -> None:
+        self._cursor = cursor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "_cursor":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    async def __aenter__(self) -> _ThreadedCursor:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def __aiter__(self) -> _ThreadedCursor:
+        return self
+
+    async def __anext__(self) -> Any:
+        row = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+    async def execute(self, *args: Any, **kwargs: Any) -> _ThreadedCursor:
+        await asyncio.to_thread(self._cursor.execute, *args, **kwargs)
+        return self
+
+    async def executemany(self, *args: Any, **kwargs: Any) -> _ThreadedCursor:
+        await asyncio.to_thread(self._cursor.executemany, *args, **kwargs)
+        return self
+
+    async def fetchone(self) -> Any:
+        return await asyncio.to_thread(self._cursor.fetchone)
+
+    async def fetchmany(self, size: int | None = None) -> Sequence[Any]:
+        return await asyncio.to_thread(self._cursor.fetchmany, size)
+
+    async def fetchall(self) -> Sequence[Any]:
+        return await asyncio.to_thread(self._cursor.fetchall)
+
+    async def nextset(self) -> Any:
+        return await asyncio.to_thread(self._cursor.nextset)
+
+    async def setinputsizes(self, *sizes: Any) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._cursor.close()
+
+
+class _ThreadedConnection:
+    """Awaitable facade over a synchronous connector connection.
+
+    Attributes the dialect reads or sets on the driver connection (for example
+    ``_interpolate_empty_sequences``) pass through to the wrapped connection.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        self._connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "_connection":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._connection, name, value)
+
+    def cursor(self, *args: Any, **kwargs: Any) -> _ThreadedCursor:
+        return _ThreadedCursor(self._connection.cursor(*args, **kwargs))
+
+    async def autocommit(self, mode: bool) -> None:
+        await asyncio.to_thread(self._connection.autocommit, mode)
+
+    async def commit(self) -> None:
+        await asyncio.to_thread(self._connection.commit)
+
+    async def rollback(self) -> None:
+        await asyncio.to_thread(self._connection.rollback)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._connection.close)
+
+    def is_closed(self) -> bool:
+        return bool(self._connection.is_closed())
+
+
+async def _connect_in_thread(connector: Any, *args: Any, **kwargs: Any) -> Any:
+    return _ThreadedConnection(
+        await asyncio.to_thread(connector.connect, *args, **kwargs)
+    )
+
+
+class AsyncAdapt_snowflake_dbapi(AsyncAdapt_dbapi_module):
+    """The DBAPI module handed to SQLAlchemy by :class:`SnowflakeDialect_asyncio`.
+
+    ``connector`` provides the PEP 249 attributes and exceptions (which the
+    asyncio API shares with the synchronous one).  ``aio`` is
+    ``snowflake.connector.aio``; when it is ``None`` connections are made with
+    ``connector.connect`` and used from the thread pool.
+    """
+
+    def __init__(self, connector: Any, aio: Any = None) -> None:
+        self.connector = connector
+        self.aio = aio
+        for name in _DBAPI_ATTRIBUTES:
+            setattr(self, name, getattr(connector, name))
+
+    @property
+    def is_native(self) -> bool:
+        return self.aio is not None
+
+    def connect(self, *args: Any, **kwargs: Any) -> AsyncAdapt_snowflake_connection:
+        async_fallback = kwargs.pop("async_fallback", False)
+        creator_fn = kwargs.pop("async_creator_fn", None)
+        if creator_fn is not None:
+            awaitable = creator_fn(*args, **kwargs)
+        elif self.aio is not None:
+            awaitable = self.aio.connect(*args, **kwargs)
+        else:
+            awaitable = _connect_in_thread(self.connector, *args, **kwargs)
+
+        if util.asbool(async_fallback):
+            return AsyncAdaptFallback_snowflake_connection(
+                self, await_fallback(awaitable)
+            )
+        return AsyncAdapt_snowflake_connection(self, await_only(awaitable))
+
+
+class SnowflakeExecutionContext_asyncio(SnowflakeExecutionContext):
+    def create_server_side_cursor(self) -> DBAPICursor:
+        return self._dbapi_connection.cursor(server_side=True)
+
+
+class SnowflakeDialect_asyncio(SnowflakeDialect):
+    driver = "asyncio"
+    # Shares the base dialect's compiler, so it shares its reasons to keep
+    # statement caching off (see ``SnowflakeDialect``).  Set on the class
+    # itself, as SQLAlchemy requires of every third-party dialect.
+    supports_statement_cache = False
+
+    is_async = True
+
+    # ``stream_results`` / ``AsyncConnection.stream`` fetch rows from the
+    # connector cursor as they are consumed instead of buffering them.
+    supports_server_side_cursors = True
+
+    execution_ctx_cls = SnowflakeExecutionContext_asyncio
+
+    @classmethod
+    def import_dbapi(cls) -> AsyncAdapt_snowflake_dbapi:
+        from snowflake import connector
+
+        try:
+            from snowflake.connector import aio
+        except ImportError as e:
+            # The asyncio API depends on optional packages (aiohttp).
+            logger.debug(
+                "snowflake.connector.aio is unavailable (%s); running connector "
+                "calls in threads",
+                e,
+            )
+            return AsyncAdapt_snowflake_dbapi(connector)
+        return AsyncAdapt_snowflake_dbapi(connector, aio)
+
+    @classmethod
+    def get_pool_class(cls, url: URL) -> type[pool.Pool]:
+        return pool.AsyncAdaptedQueuePool
+
+    def get_driver_connection(self, connection: DBAPIConnection) -> Any:
+        return connection._connection
+
+    def _log_new_connection_event(self, connection: Any, cparams: Any = None) -> None:
+        # The telemetry adapters talk to the synchronous connector's REST
+        # client; the asyncio connector records its own connection telemetry.
+        adapted = connection._connection
+        if isinstance(adapted, _ThreadedConnection):
+            super()._log_new_connection_event(adapted._connection, cparams)
+
+
+dialect = SnowflakeDialect_asyncio
@@ -0,0 +1,149 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Asynchronous query submission on a single connection.
+
+Executing with ``execution_options(async_submit=True)`` submits the statement
+with the connector's ``execute_async`` and returns an :class:`AsyncQueryHandle`
+instead of a result; the statement keeps running on the server while the
+connection is used for other work.  :func:`gather_async` submits several
+statements from one connection and waits for all of them, so independent heavy
+queries run concurrently on one authenticated session::
+
+    with engine.connect() as conn:
+        sales, users = gather_async(conn, [sales_query, users_query])
+
+A handle is tied to the connection that submitted it; resolve it before the
+connection is closed or returned to the pool.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection, CursorResult
+    from sqlalchemy.sql.expression import Executable
+
+    from .base import SnowflakeExecutionContext
+
+#: Delay between the first two status polls of :meth:`AsyncQueryHandle.result`
+#: when it is given a timeout; later polls back off to ``_MAX_POLL_INTERVAL``.
+_FIRST_POLL_INTERVAL = 0.05
+_MAX_POLL_INTERVAL = 1.0
+
+
+class AsyncQueryHandle:
+    """A statement submitted with ``async_submit=True``.
+
+    ``query_id`` identifies the query in Snowflake (``QUERY_HISTORY``,
+    ``RESULT_SCAN``), :meth:`done` polls its status and :meth:`result` waits
+    for it and returns the same :class:`~sqlalchemy.engine.CursorResult` a
+    blocking execution would have returned.
+    """
+
+    def __init__(self, context: SnowflakeExecutionContext) -> None:
+        self._context = context
+        self.query_id: str = context.cursor.sfqid
+        self._result: CursorResult[Any] | None = None
+
+    def __repr__(self) -> str:
+        return f"<AsyncQueryHandle query_id={self.query_id!r}>"
+
+    @property
+    def statement(self) -> str:
+        return self._context.statement
+
+    def done(self) -> bool:
+        """Return ``True`` once the query is no longer queued or running."""
+        if self._result is not None:
+            return True
+        driver = self._driver_connection
+        try:
+            status = driver.get_query_status(self.query_id)
+        except self._context.dialect.loaded_dbapi.Error as e:
+            raise self._wrap(e) from e
+        return not driver.is_still_running(status)
+
+    def result(self, timeout: float | None = None) -> CursorResult[Any]:
+        """Wait for the query and return its result.
+
+        Raises :class:`TimeoutError` if the query is still running after
+        ``timeout`` seconds (the query itself keeps running), and the usual
+        :class:`sqlalchemy.exc.DBAPIError` subclasses if it failed.
+        """
+        if self._result is None:
+            if timeout is not None:
+                self._wait(timeout)
+            context = self._context
+            try:
+                context.cursor.get_results_from_sfqid(self.query_id)
+            except context.dialect.loaded_dbapi.Error as e:
+                raise self._wrap(e) from e
+            self._result = context._setup_submitted_result()
+        return self._result
+
+    def _wait(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        interval = _FIRST_POLL_INTERVAL
+        while not self.done():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Query {self.query_id} still running after {timeout} seconds"
+                )
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+    @property
+    def _driver_connection(self) -> Any:
+        return self._context._dbapi_connection.driver_connection
+
+    def _wrap(self, error: Exception) -> sa_exc.StatementError:
+        context = self._context
+        return sa_exc.DBAPIError.instance(
+            context.statement,
+            context.parameters,
+            error,
+            context.dialect.loaded_dbapi.Error,
+            dialect=context.dialect,
+        )
+
+
+def submit_async(
+    connection: Connection,
+    statement: Executable | str,
+    parameters: Any = None,
+) -> AsyncQueryHandle:
+    """Submit ``statement`` on ``connection`` without waiting for it."""
+    if isinstance(statement, str):
+        statement = text(statement)
+    return connection.execution_options(async_submit=True).execute(  # type: ignore[return-value]
+        statement, parameters
+    )
+
+
+def gather_async(
+    connection: Connection,
+    statements: Iterable[Executable | str],
+    timeout: float | None = None,
+) -> list[CursorResult[Any]]:
+    """Run ``statements`` concurrently on ``connection`` and return their results.
+
+    Every statement is submitted before any result is awaited, so the total
+    wait is roughly that of the slowest statement.  Results are returned in
+    the order of ``statements``; ``timeout`` bounds the whole wait.
+    """
+    handles = [submit_async(connection, statement) for statement in statements]
+    if timeout is None:
+        return [handle.result() for handle in handles]
+    deadline = time.monotonic() + timeout
+    return [
+        handle.result(timeout=max(deadline - time.monotonic(), 0.0))
+        for handle in handles
+    ]
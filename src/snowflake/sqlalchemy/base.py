@@ -7,13 +7,15 @@ import itertools
 import operator
 import re
 import string
+import time
 import warnings
 from functools import reduce
-from typing import Any
+from typing import Any, cast
 
 from sqlalchemy import exc as sa_exc
 from sqlalchemy import inspect, sql
 from sqlalchemy import util as sa_util
+from sqlalchemy.engine import cursor as _cursor
 from sqlalchemy.engine import default
 from sqlalchemy.engine.interfaces import Dialect
 from sqlalchemy.orm import context
@@ -36,6 +38,7 @@ from sqlalchemy.sql.selectable import Join, Lateral, Select, SelectState
 from sqlalchemy.sql.type_api import TypeEngine
 
 from ._constants import DIALECT_NAME, NOT_NULL
+from .cancellation import TIMEOUT_OPTION, _timeout_kwargs
 from .custom_commands import (
     AWSBucket,
     AzureContainer,
@@ -68,12 +71,18 @@ from .exc import (
     SnowflakeWarning,
     UnexpectedOptionTypeError,
 )
+from .fingerprint import _apply_fingerprint_tag, _context_fingerprint
 from .functions import flatten
+from .instrumentation import StatementTiming, _emit, _result_bytes, _TimedFetchStrategy
+from .result_cache import CachedResult, _invalidate_written, _lookup
+from .single_flight import SingleFlight, _Flight
 from .sql.custom_schema.custom_table_base import CustomTableBase
 from .sql.custom_schema.options.table_option import TableOption
 from .util import (
     _find_left_clause_to_join_from,
+    _mark_connection_used,
     _set_connection_interpolate_empty_sequences,
+    _set_connection_transaction_dirty,
     _Snowflake_ORMJoin,
     _Snowflake_Selectable_Join,
     escape_backslashes,
@@ -153,6 +162,12 @@ RESERVED_WORDS = frozenset(
 AUTOCOMMIT_REGEXP = re.compile(
     r"\s*(?:UPDATE|INSERT|DELETE|MERGE|COPY)", re.I | re.UNICODE
 )
+# Textual statements that cannot open a transaction (with AUTOCOMMIT off,
+# Snowflake begins one implicitly at the first DML or locking statement).
+READ_ONLY_REGEXP = re.compile(
+    r"\s*(?:SELECT|SHOW|DESC|DESCRIBE|EXPLAIN)\b(?!.*\bFOR\s+UPDATE\b)",
+    re.I | re.S,
+)
 # used for quoting identifiers ie. table names, column names, etc.
 ILLEGAL_INITIAL_CHARACTERS = frozenset({d for d in string.digits}.union({"$"}))
 
@@ -714,6 +729,12 @@ class SnowflakeCompiler(compiler.SQLCompiler):
     # preparer helpers used in the COPY/stage visitors below).
     preparer: SnowflakeIdentifierPreparer
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        start = time.perf_counter()
+        super().__init__(*args, **kwargs)
+        # Reported as the compile phase of ``StatementTiming``.
+        self._compile_seconds = time.perf_counter() - start
+
     def visit_sequence(self, sequence: Sequence, **kw: Any) -> str:
         return self.dialect.identifier_preparer.format_sequence(sequence) + ".nextval"
 
@@ -733,6 +754,11 @@ class SnowflakeCompiler(compiler.SQLCompiler):
     def visit_sysdate_func(self, sysdate: functions.GenericFunction, **kw: Any) -> str:
         return "SYSDATE()"
 
+    def visit_result_scan_func(
+        self, result_scan: functions.GenericFunction, **kw: Any
+    ) -> str:
+        return f"TABLE(RESULT_SCAN{self.function_argspec(result_scan, **kw)})"
+
     def visit_json_getitem_op_binary(
         self, binary: BinaryExpression, operator: Any, **kw: Any
     ) -> str:
@@ -1338,6 +1364,35 @@ class SnowflakeCompiler(compiler.SQLCompiler):
 class SnowflakeExecutionContext(default.DefaultExecutionContext):
     INSERT_SQL_RE = re.compile(r"^insert\s+into", flags=re.IGNORECASE)
 
+    # Set in ``pre_exec`` when the dialect has a ``statement_sink``.
+    _statement_timing: StatementTiming | None = None
+    # ``perf_counter`` when ``_init_compiled`` started, and its duration.
+    _init_start: float | None = None
+    _bind_seconds = 0.0
+    # Statement-level QUERY_TAG set by the ``fingerprint_tag`` option.
+    _query_tag: str | None = None
+    # Set in ``pre_exec`` for statements using ``result_cache_ttl``.  The
+    # frozen rows the result is built from: a cache hit or a coalesced
+    # execution skips the execution, otherwise they are buffered by
+    # ``do_execute``.
+    _result_cache_key: str | None = None
+    _cached_result: CachedResult | None = None
+    # ``(registry, key, flight)`` while leading a ``single_flight`` execution.
+    _flight: tuple[SingleFlight, str, _Flight] | None = None
+
+    @classmethod
+    def _init_compiled(cls, dialect: Any, *args: Any, **kwargs: Any) -> Any:
+        if getattr(dialect, "_statement_sink", None) is None:
+            return super()._init_compiled(dialect, *args, **kwargs)
+        start = time.perf_counter()
+        self = cast(
+            SnowflakeExecutionContext,
+            super()._init_compiled(dialect, *args, **kwargs),
+        )
+        self._init_start = start
+        self._bind_seconds = time.perf_counter() - start
+        return self
+
     def fire_sequence(self, seq: Sequence, type_: TypeEngine[Any]) -> int:
         return self._execute_scalar(
             f"SELECT {self.identifier_preparer.format_sequence(seq)}.nextval",
@@ -1363,6 +1418,16 @@ class SnowflakeExecutionContext(default.DefaultExecutionContext):
             return autocommit and not self.isddl
 
     def pre_exec(self) -> None:
+        if self.execution_options.get("async_submit") and self.executemany:
+            raise sa_exc.ArgumentError(
+                "async_submit=True cannot be used with executemany; submit "
+                "each parameter set separately"
+            )
+        if (
+            getattr(self.dialect, "_elide_empty_transactions", False)
+            and not self._is_read_only()
+        ):
+            _set_connection_transaction_dirty(self._dbapi_connection, True)
         if self.compiled and self.identifier_preparer._double_percents:
             # for compiled statements, percent is doubled for escape, we turn on _interpolate_empty_sequences
             _set_connection_interpolate_empty_sequences(self._dbapi_connection, True)
@@ -1376,17 +1441,123 @@ class SnowflakeExecutionContext(default.DefaultExecutionContext):
         else:
             # for other cases, do no interpolate empty sequences as "%" is not double escaped
             _set_connection_interpolate_empty_sequences(self._dbapi_connection, False)
+        _apply_fingerprint_tag(self)
+        _lookup(self)
+        if getattr(self.dialect, "_statement_sink", None) is not None:
+            self._start_timing()
+
+    @sa_util.memoized_property
+    def statement_fingerprint(self) -> str:
+        """Parameter-agnostic fingerprint of the statement's shape."""
+        return _context_fingerprint(self)
+
+    @property
+    def query_id(self) -> str | None:
+        """Snowflake id of the query that produced this execution's rows.
+
+        For rows served by ``result_cache_ttl`` or ``single_flight`` that is
+        the query that originally produced them.  ``result.context.query_id``
+        is accepted by ``result_scan``.
+        """
+        if self._cached_result is not None:
+            return self._cached_result.query_id
+        return getattr(self.cursor, "sfqid", None)
+
+    def _cursor_kwargs(self) -> dict[str, Any]:
+        """Extra keyword arguments for the connector's ``execute``."""
+        kwargs = _timeout_kwargs(self.execution_options)
+        if kwargs and self.dialect.is_async:
+            raise sa_exc.ArgumentError(
+                f"{TIMEOUT_OPTION} is not supported by the asyncio dialect; set "
+                "the STATEMENT_TIMEOUT_IN_SECONDS session parameter instead"
+            )
+        if self._query_tag is not None:
+            kwargs["_statement_params"] = {"QUERY_TAG": self._query_tag}
+        return kwargs
+
+    def _start_timing(self) -> None:
+        timing = StatementTiming(self.statement)
+        if self._init_start is not None:
+            timing._start = self._init_start
+        timing.cache_hit = self.cache_hit is self.dialect.CACHE_HIT
+        if self.compiled is not None and not timing.cache_hit:
+            # Compilation ran just before this context was created.
+            timing.compile = getattr(self.compiled, "_compile_seconds", 0.0)
+            timing._start -= timing.compile
+        timing.bind = self._bind_seconds
+        timing.fingerprint = self.statement_fingerprint
+        timing._execute_start = time.perf_counter()
+        self._statement_timing = timing
+
+    def _is_read_only(self) -> bool:
+        """Whether the statement cannot have begun a transaction."""
+        if self.compiled is not None and not self.is_text and not self.isddl:
+            statement = self.compiled.statement
+            return bool(
+                getattr(statement, "is_select", False)
+                and getattr(statement, "_for_update_arg", None) is None
+            )
+        return bool(READ_ONLY_REGEXP.match(self.statement))
 
     def post_exec(self) -> None:
+        if getattr(self.dialect, "_ping_window", None) is not None:
+            _mark_connection_used(self._dbapi_connection)
         if self.compiled and self.identifier_preparer._double_percents:
             # for compiled statements, percent is doubled for escapeafter execution
             # we reset _interpolate_empty_sequences to false which is turned on in pre_exec
             _set_connection_interpolate_empty_sequences(self._dbapi_connection, False)
+        if not self._is_read_only():
+            _invalidate_written(self)
+        timing = self._statement_timing
+        if timing is not None and timing._execute_start is not None:
+            timing.execute = time.perf_counter() - timing._execute_start
+            # Rows served by ``result_cache_ttl`` / ``single_flight`` report
+            # the query that produced them.
+            timing.query_id = self.query_id
+            timing.rowcount = self.rowcount
+            if getattr(self.dialect, "_statement_bytes_fetched", False):
+                timing.bytes_fetched = _result_bytes(self.cursor)
+
+    def handle_dbapi_exception(self, e: BaseException) -> None:
+        timing = self._statement_timing
+        if timing is not None:
+            timing.error = e
+            _emit(self)
+        super().handle_dbapi_exception(e)
 
     @property
     def rowcount(self) -> int:
+        if self._cached_result is not None:
+            return len(self._cached_result.rows)
         return self.cursor.rowcount
 
+    def _setup_result_proxy(self) -> Any:
+        if self.execution_options.get("async_submit"):
+            from .async_queries import AsyncQueryHandle
+
+            # The statement was only submitted (``do_execute``); the result is
+            # built by ``AsyncQueryHandle.result`` once the query has finished.
+            _emit(self)
+            return AsyncQueryHandle(self)
+        entry = self._cached_result
+        if entry is not None:
+            self.cursor_fetch_strategy = _cursor.FullyBufferedCursorFetchStrategy(
+                None, entry.description, entry.rows
+            )
+        result = super()._setup_result_proxy()
+        if self._statement_timing is not None:
+            if result._soft_closed:
+                # No rows to fetch (DML, DDL) or already buffered.
+                _emit(self)
+            else:
+                result.cursor_strategy = _TimedFetchStrategy(
+                    result.cursor_strategy, self
+                )
+        return result
+
+    def _setup_submitted_result(self) -> Any:
+        return super()._setup_result_proxy()
+
 
 # Tracks (table_name, column_name) pairs for which the Identity-on-PK warning
 # has already been emitted this session, preventing duplicate output when the
@@ -1817,3 +1988,13 @@ class SnowflakeTypeCompiler(compiler.GenericTypeCompiler):
 construct_arguments = [(Table, {"clusterby": None})]
 
 functions.register_function("flatten", flatten, "snowflake")
+
+
+def __getattr__(name: str) -> Any:
+    # ``base.dialect`` used to be assigned by the package ``__init__``; resolve
+    # it on demand now that the package imports the dialect lazily.
+    if name == "dialect":
+        from .snowdialect import dialect
+
+        return dialect
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
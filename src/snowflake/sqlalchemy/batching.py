@@ -0,0 +1,261 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Send independent statements as one multi-statement request.
+
+Inside ``with batch_statements(connection):`` DDL and ``INSERT`` statements
+that do not return rows are not sent when executed; they are collected and
+sent together as a single request (the connector's ``num_statements``, i.e.
+``MULTI_STATEMENT_COUNT``), so ``metadata.create_all`` or a migration pays one
+round trip instead of one per statement::
+
+    with engine.begin() as conn, batch_statements(conn) as batch:
+        metadata.create_all(conn)
+    [s.query_id for s in batch.statements]
+
+Any other statement (queries, ``UPDATE`` / ``DELETE`` whose row counts the ORM
+checks, ``executemany``) first sends whatever is pending, to keep the order of
+execution, and then runs on its own as usual.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import re
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc as sa_exc
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine.interfaces import DBAPICursor
+
+    from .base import SnowflakeExecutionContext
+
+#: Execution option under which the active batch is stored.
+BATCH_OPTION = "snowflake_statement_batch"
+
+#: Largest number of statements sent in one request by default.
+DEFAULT_MAX_STATEMENTS = 100
+
+# Textual statements that are safe to defer: they do not return rows anyone
+# reads and nothing inspects their row count.
+_DEFERRABLE_TEXT_RE = re.compile(
+    r"\s*(?:CREATE|ALTER|DROP|COMMENT|GRANT|REVOKE|INSERT)\b", re.I
+)
+# ``--`` and ``//`` start comments running to the end of the line.
+_LINE_COMMENT_RE = re.compile(r"--|//")
+
+
+class BatchedStatement:
+    """One deferred statement and, once its batch is sent, its outcome."""
+
+    __slots__ = ("sql", "done", "query_id", "rowcount", "error")
+
+    def __init__(self, sql: str) -> None:
+        self.sql = sql
+        #: Whether the statement has run successfully.
+        self.done = False
+        #: Snowflake query id and row count of the statement, once it has run.
+        self.query_id: str | None = None
+        self.rowcount: int | None = None
+        #: The error the statement failed with.
+        self.error: Exception | None = None
+
+    def __repr__(self) -> str:
+        return f"<BatchedStatement query_id={self.query_id!r} sql={self.sql[:40]!r}>"
+
+
+class StatementBatch:
+    """Statements collected by :func:`batch_statements`.
+
+    ``statements`` lists every deferred statement in execution order; after a
+    request has been sent each carries its outcome.  When a statement fails
+    Snowflake stops there: the statements before it are ``done``, it carries
+    the ``error`` (also raised from the ``execute`` or block exit that sent
+    the request) and those after it did not run.  An error of the request as
+    a whole, before any statement ran, is only kept in ``error``.
+    """
+
+    def __init__(self, max_statements: int = DEFAULT_MAX_STATEMENTS) -> None:
+        self.max_statements = max_statements
+        self.statements: list[BatchedStatement] = []
+        #: Requests sent so far.
+        self.requests = 0
+        #: The error of the last failed request.
+        self.error: Exception | None = None
+        self._pending: list[BatchedStatement] = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _defer(
+        self,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: SnowflakeExecutionContext,
+    ) -> bool:
+        """Queue the statement if it can be batched; return whether it was."""
+        if not _is_deferrable(context):
+            self._flush(cursor, context)
+            return False
+        sql = _render(cursor, statement, parameters, context)
+        if sql is None:
+            self._flush(cursor, context)
+            return False
+        entry = BatchedStatement(sql)
+        self.statements.append(entry)
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_statements:
+            self._flush(cursor, context)
+        return True
+
+    def flush(self, connection: Connection) -> None:
+        """Send the pending statements now."""
+        if not self._pending:
+            return
+        dbapi_connection = connection.connection
+        cursor = dbapi_connection.cursor()
+        try:
+            self._flush(cursor, None, connection.dialect)
+        finally:
+            cursor.close()
+
+    def _flush(
+        self,
+        cursor: DBAPICursor,
+        context: SnowflakeExecutionContext | None,
+        dialect: Any = None,
+    ) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        dialect = dialect if context is None else context.dialect
+        sql = ";\n".join(entry.sql for entry in pending)
+        self.requests += 1
+        failing = pending[0] if len(pending) == 1 else None
+        dialect._running_statements._sending(cursor)
+        try:
+            if len(pending) == 1:
+                cursor.execute(sql)
+                _record(pending[0], cursor)
+            else:
+                saved_ids = getattr(cursor, "multi_statement_savedIds", None)
+                try:
+                    cursor.execute(sql, num_statements=len(pending))  # type: ignore[call-arg]
+                except dialect.loaded_dbapi.Error:
+                    if (
+                        getattr(cursor, "multi_statement_savedIds", None)
+                        is not saved_ids
+                    ):
+                        # The request ran, and stopped at its first statement.
+                        failing = pending[0]
+                    raise
+                # The connector is left on the first statement's result; each
+                # following one tells whether it ran, and reading them also
+                # surfaces the error of the one that failed.
+                _record(pending[0], cursor)
+                for entry in pending[1:]:
+                    failing = entry
+                    cursor.nextset()
+                    _record(entry, cursor)
+        except dialect.loaded_dbapi.Error as e:
+            self.error = e
+            if failing is not None:
+                failing.error = e
+            raise sa_exc.DBAPIError.instance(
+                failing.sql if failing is not None else sql,
+                None,
+                e,
+                dialect.loaded_dbapi.Error,
+                dialect=dialect,
+            ) from e
+
+    def _discard(self) -> None:
+        self._pending = []
+
+
+def _record(entry: BatchedStatement, cursor: DBAPICursor) -> None:
+    entry.done = True
+    entry.query_id = cursor.sfqid
+    rowcount = cursor.rowcount
+    entry.rowcount = rowcount if rowcount is not None and rowcount >= 0 else None
+
+
+def _is_deferrable(context: SnowflakeExecutionContext) -> bool:
+    if context.executemany or context.execution_options.get("async_submit"):
+        return False
+    if context.isddl:
+        return True
+    if context.compiled is not None and not context.is_text:
+        return bool(
+            context.isinsert
+            and not getattr(context.compiled, "effective_returning", None)
+        )
+    return bool(_DEFERRABLE_TEXT_RE.match(context.statement))
+
+
+def _render(
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: Any,
+    context: SnowflakeExecutionContext,
+) -> str | None:
+    """Return ``statement`` with its parameters bound, as the connector would,
+    ready to be joined with others; ``None`` if it has to run on its own.
+
+    Only client-side (``pyformat`` / ``format``) binding can be folded into
+    the statement text; server-side bound statements run on their own.  So do
+    statements ending in a line comment, which would swallow the separator.
+    """
+    sql = statement.rstrip().rstrip(";").rstrip()
+    if _LINE_COMMENT_RE.search(sql.rpartition("\n")[2]):
+        return None
+    if not parameters:
+        return sql
+    if context.dialect.paramstyle not in ("pyformat", "format"):
+        return None
+    converter = getattr(getattr(cursor, "connection", None), "converter", None)
+    if converter is None:
+        return None
+
+    def literal(value: Any) -> Any:
+        return converter.quote(converter.escape(converter.to_snowflake(value)))
+
+    if isinstance(parameters, Mapping):
+        return sql % {name: literal(value) for name, value in parameters.items()}
+    return sql % tuple(literal(value) for value in parameters)
+
+
+@contextlib.contextmanager
+def batch_statements(
+    connection: Connection, max_statements: int = DEFAULT_MAX_STATEMENTS
+) -> Iterator[StatementBatch]:
+    """Collect batchable statements run on ``connection`` into few requests.
+
+    Pending statements are sent when the block exits, when ``max_statements``
+    have accumulated, or before a statement that has to run on its own.  If
+    the block raises, statements still pending are dropped.
+    """
+    if connection.dialect.is_async:
+        raise sa_exc.InvalidRequestError(
+            "batch_statements() is not supported by the asyncio dialect"
+        )
+    if connection.get_execution_options().get(BATCH_OPTION) is not None:
+        raise sa_exc.InvalidRequestError(
+            "batch_statements() is already active on this connection"
+        )
+    batch = StatementBatch(max_statements)
+    connection.execution_options(**{BATCH_OPTION: batch})
+    try:
+        yield batch
+    except BaseException:
+        batch._discard()
+        raise
+    else:
+        batch.flush(connection)
+    finally:
+        connection.execution_options(**{BATCH_OPTION: None})
@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Statement timeouts and server-side cancellation.
+
+The ``timeout`` execution option is the connector's statement timeout: when it
+expires the connector cancels the query and raises, leaving the connection
+usable::
+
+    conn = conn.execution_options(timeout=30)
+
+A statement abandoned in any other way keeps running on the warehouse unless
+it is cancelled, so the dialect cancels it server-side by query id (or, while
+the id is not known yet, every query of the session, which runs only this
+one) when the execution is interrupted by ``KeyboardInterrupt``, asyncio task
+cancellation or another exit exception, and when the engine is disposed while
+it runs.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import exc as sa_exc
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_OPTION = "timeout"
+
+_QUERY_ID_RE = re.compile(r"^[0-9A-Za-z-]+$")
+
+
+def _timeout_kwargs(options: Any) -> dict[str, Any]:
+    timeout = options.get(TIMEOUT_OPTION)
+    if timeout is None:
+        return {}
+    if (
+        isinstance(timeout, bool)
+        or not isinstance(timeout, (int, float))
+        or timeout <= 0
+    ):
+        raise sa_exc.ArgumentError(
+            f"{TIMEOUT_OPTION} must be a positive number of seconds; got {timeout!r}"
+        )
+    return {"timeout": timeout}
+
+
+def _cancel(
+    dbapi_connection: Any, cursor: Any, previous_query_id: str | None = None
+) -> bool:
+    """Cancel what ``cursor`` runs; ``True`` when the request was sent.
+
+    ``previous_query_id`` is the cursor's ``sfqid`` before the execution.  The
+    connector only sets ``sfqid`` once the response arrives, so while it is
+    unchanged a reused cursor still holds the id of its previous query and the
+    id of the running one is not known yet.
+    """
+    query_id = getattr(cursor, "sfqid", None)
+    if query_id != previous_query_id and query_id and _QUERY_ID_RE.match(query_id):
+        sql = f"SELECT SYSTEM$CANCEL_QUERY('{query_id}')"
+    else:
+        driver = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        session_id = getattr(driver, "session_id", None)
+        if not isinstance(session_id, int):
+            return False
+        sql = f"SELECT SYSTEM$CANCEL_ALL_QUERIES({session_id})"
+    try:
+        cancel_cursor = dbapi_connection.cursor()
+        try:
+            cancel_cursor.execute(sql)
+        finally:
+            cancel_cursor.close()
+    except Exception as e:
+        logger.debug("Failed to cancel the query: %s: %s", type(e).__name__, str(e))
+        return False
+    return True
+
+
+class _RunningStatements:
+    """The statements executing on an engine's connections."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # id(cursor) -> (dbapi connection, cursor, the cursor's ``sfqid``
+        # before the statement was sent)
+        self._running: dict[int, tuple[Any, Any, str | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    @contextlib.contextmanager
+    def _track(self, dbapi_connection: Any, cursor: Any) -> Iterator[None]:
+        """Run the execution, cancelling it if it is abandoned."""
+        key = id(cursor)
+        with self._lock:
+            self._running[key] = (
+                dbapi_connection,
+                cursor,
+                getattr(cursor, "sfqid", None),
+            )
+        try:
+            yield
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                # KeyboardInterrupt, asyncio.CancelledError, ...: the
+                # statement may still be running on the warehouse.
+                with self._lock:
+                    running = self._running[key]
+                _cancel(*running)
+            raise
+        finally:
+            with self._lock:
+                del self._running[key]
+
+    def _sending(self, cursor: Any) -> None:
+        """Note that a tracked ``cursor`` is about to send a statement.
+
+        Statements sent before it on the same cursor (session parameters,
+        a batch flush) leave their query id in ``sfqid`` until the response
+        to this one arrives, so that id is not the running query's.
+        """
+        key = id(cursor)
+        with self._lock:
+            running = self._running.get(key)
+            if running is not None:
+                self._running[key] = (*running[:2], getattr(cursor, "sfqid", None))
+
+    def cancel_all(self) -> int:
+        """Cancel every running statement; return how many were cancelled."""
+        with self._lock:
+            running = list(self._running.values())
+        return sum(_cancel(*statement) for statement in running)
+
+
+def _cancel_on_dispose(engine: Any) -> None:
+    running: _RunningStatements = engine.dialect._running_statements
+    cancelled = running.cancel_all()
+    if cancelled:
+        logger.debug("Cancelled %d running statements on dispose", cancelled)
@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Parameter-agnostic statement fingerprints.
+
+``QUERY_HISTORY`` groups poorly for generated SQL: literal values, the length
+of expanded ``IN`` lists and anonymous alias numbers differ between executions
+of the same statement shape.  :func:`statement_fingerprint` hashes the
+statement with those normalized away, and every execution context exposes the
+fingerprint of its statement as ``context.statement_fingerprint``.
+
+The ``fingerprint_tag`` execution option attaches it to the query itself, so
+it shows up in Snowflake's telemetry without an extra round trip::
+
+    conn = conn.execution_options(fingerprint_tag="query_tag", fingerprint_label="orders-api")
+
+``"query_tag"`` sends ``{"fingerprint": ..., "label": ...}`` as the statement's
+``QUERY_TAG`` (a statement-level parameter; the session's ``QUERY_TAG`` is left
+alone), ``"comment"`` appends it to the SQL text as a ``/* ... */`` comment.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc as sa_exc
+
+if TYPE_CHECKING:
+    from .base import SnowflakeExecutionContext
+
+FINGERPRINT_TAG_OPTION = "fingerprint_tag"
+FINGERPRINT_LABEL_OPTION = "fingerprint_label"
+
+_TAG_MODES = ("comment", "query_tag")
+_LABEL_RE = re.compile(r"^[\w.:/@ -]{0,256}$")
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<quoted>"(?:[^"]|"")*")
+    | (?P<string>'(?:[^'\\]|''|\\.)*'|\$\$.*?\$\$)
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<placeholder>%\([^)]*\)s|%s|\?|(?<![:\w]):[A-Za-z_]\w*|__\[POSTCOMPILE_\w+\])
+    | (?P<number>(?<![\w.])\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)
+    | (?P<anon>\banon_\d+\b)
+    | (?P<space>\s+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# A list of values, e.g. an expanded ``IN`` list or multi-row ``VALUES``.
+_VALUE_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROW_LIST_RE = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+
+def _normalize_token(match: re.Match[str]) -> str:
+    kind = match.lastgroup
+    if kind == "quoted":
+        return match.group()
+    if kind in ("string", "placeholder", "number"):
+        return "?"
+    if kind == "anon":
+        return "anon_?"
+    # Comments and whitespace.
+    return " "
+
+
+def _normalize(statement: str) -> str:
+    # Lower-case everything but quoted identifiers, which are case sensitive.
+    parts = []
+    last = 0
+    for match in _TOKEN_RE.finditer(statement):
+        parts.append(statement[last : match.start()].lower())
+        parts.append(_normalize_token(match))
+        last = match.end()
+    parts.append(statement[last:].lower())
+    normalized = " ".join("".join(parts).split())
+    normalized = _VALUE_LIST_RE.sub("?", normalized)
+    return _ROW_LIST_RE.sub("(?)", normalized)
+
+
+@functools.lru_cache(maxsize=1024)
+def statement_fingerprint(statement: str) -> str:
+    """Return a 16 hex digit fingerprint of ``statement``'s shape.
+
+    Literals, bind placeholders, the length of value lists, anonymous alias
+    numbers, comments, whitespace and the case of unquoted text do not change
+    the fingerprint.
+    """
+    digest = hashlib.sha1(_normalize(statement).encode("utf-8"), usedforsecurity=False)
+    return digest.hexdigest()[:16]
+
+
+def _context_fingerprint(context: SnowflakeExecutionContext) -> str:
+    compiled = context.compiled
+    if compiled is None or context.is_text:
+        return statement_fingerprint(context.unicode_statement)
+    # The compiled form is what the statement cache keeps per cache key, so
+    # with caching enabled each statement shape is hashed once.
+    fingerprint: str | None = getattr(compiled, "_snowflake_fingerprint", None)
+    if fingerprint is None:
+        fingerprint = statement_fingerprint(compiled.string)
+        compiled._snowflake_fingerprint = fingerprint  # type: ignore[attr-defined]
+    return fingerprint
+
+
+def _apply_fingerprint_tag(context: SnowflakeExecutionContext) -> None:
+    """Attach the fingerprint as the ``fingerprint_tag`` option asks."""
+    options = context.execution_options
+    mode = options.get(FINGERPRINT_TAG_OPTION)
+    if mode is None:
+        return
+    if mode not in _TAG_MODES:
+        raise sa_exc.ArgumentError(
+            f"{FINGERPRINT_TAG_OPTION} must be one of {', '.join(_TAG_MODES)}; "
+            f"got {mode!r}"
+        )
+    tag: dict[str, Any] = {"fingerprint": context.statement_fingerprint}
+    label = options.get(FINGERPRINT_LABEL_OPTION)
+    if label is not None:
+        if not _LABEL_RE.match(label):
+            raise sa_exc.ArgumentError(
+                f"Invalid {FINGERPRINT_LABEL_OPTION} {label!r}: use up to 256 "
+                "letters, digits, spaces and '_.:/@-'"
+            )
+        tag["label"] = label
+    rendered = json.dumps(tag, separators=(",", ":"))
+    if mode == "query_tag" and not context.dialect.is_async:
+        context._query_tag = rendered
+    else:
+        # The asyncio adapter cannot pass statement parameters; fall back to
+        # the comment, which needs no extra round trip either.
+        context.statement = f"{context.statement} /* {rendered} */"
@@ -6,6 +6,7 @@ import warnings
 from typing import Any
 
 from sqlalchemy.sql import functions as sqlfunc
+from sqlalchemy.sql import sqltypes
 
 FLATTEN_WARNING = "For backward compatibility params are not rendered."
 
@@ -16,3 +17,34 @@ class flatten(sqlfunc.GenericFunction):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         warnings.warn(FLATTEN_WARNING, DeprecationWarning, stacklevel=2)
         super().__init__(*args, **kwargs)
+
+
+class result_scan(sqlfunc.GenericFunction):
+    """``TABLE(RESULT_SCAN(query_id))``: the rows of an earlier query.
+
+    Reading a result Snowflake kept (for 24 hours) costs no warehouse time
+    for the original query.  Declare the columns to select with
+    ``table_valued``, which makes it usable as any FROM clause::
+
+        scan = result_scan(query_id).table_valued(
+            column("id", Integer), column("total", Numeric)
+        )
+        select(scan.c.id).where(scan.c.total > 100)
+
+    ``query_id`` is a query id string or ``last_query_id()``.
+    """
+
+    name = "result_scan"
+    inherit_cache = True
+
+
+class last_query_id(sqlfunc.GenericFunction):
+    """``LAST_QUERY_ID([n])``: the id of a query run earlier in the session.
+
+    ``n`` counts from the first query of the session (``1``) or back from the
+    most recent one (``-1``, the default).
+    """
+
+    type = sqltypes.String()
+    name = "last_query_id"
+    inherit_cache = True
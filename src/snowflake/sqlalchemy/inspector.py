@@ -0,0 +1,130 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from sqlalchemy import event
+from sqlalchemy.engine import reflection
+
+from .reflection_stats import ReflectionStats, _InstrumentedInfoCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from sqlalchemy.engine.reflection import TableKey
+
+
+class ReflectedTableStats(TypedDict):
+    """Size and clustering information of a table as reported by
+    ``SHOW TABLES``.
+
+    ``rows`` and ``bytes`` are ``None`` where Snowflake does not report them
+    (e.g. external tables).  ``cluster_by`` holds the clustering key
+    expressions, with plain column names normalized the same way as reflected
+    column names; it is empty for tables without a clustering key.
+    """
+
+    kind: str | None
+    rows: int | None
+    bytes: int | None
+    cluster_by: list[str]
+    automatic_clustering: bool | None
+
+
+class SnowflakeInspector(reflection.Inspector):
+    """Inspector returned by ``inspect(engine)`` for Snowflake.
+
+    Adds Snowflake-specific reflection on top of
+    :class:`sqlalchemy.engine.reflection.Inspector`.  All additions share the
+    inspector's ``info_cache`` with the standard methods, so table statistics
+    come from the same ``SHOW TABLES`` pass ``get_table_names()`` runs.
+    """
+
+    #: Counters of the most recent :meth:`collect_stats` block, if any.
+    reflection_stats: ReflectionStats | None = None
+
+    @contextlib.contextmanager
+    def collect_stats(self) -> Iterator[ReflectionStats]:
+        """Record SQL round trips, rows, timings and cache hits of the
+        reflection run through this inspector inside the ``with`` block.
+
+        Pass the inspector itself as ``bind`` to reflect through it::
+
+            insp = inspect(engine)
+            with insp.collect_stats() as stats:
+                metadata.reflect(bind=insp)
+            print(stats.report())
+
+        Instrumentation is off unless this context manager is active.  SQL is
+        observed through cursor events on the inspector's bind; only
+        reflection statements are counted.
+        """
+        stats = ReflectionStats()
+        self.reflection_stats = stats
+        previous_cache = self.info_cache
+        self.info_cache = _InstrumentedInfoCache(previous_cache, stats)
+        started: dict[int, float] = {}
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            started[id(cursor)] = time.perf_counter()
+
+        def after_cursor_execute(conn, cursor, statement, *args):
+            start = started.pop(id(cursor), None)
+            elapsed = time.perf_counter() - start if start is not None else 0.0
+            rowcount = getattr(cursor, "rowcount", None)
+            stats._record_statement(
+                statement, rowcount if isinstance(rowcount, int) else 0, elapsed
+            )
+
+        event.listen(self.bind, "before_cursor_execute", before_cursor_execute)
+        event.listen(self.bind, "after_cursor_execute", after_cursor_execute)
+        try:
+            yield stats
+        finally:
+            event.remove(self.bind, "before_cursor_execute", before_cursor_execute)
+            event.remove(self.bind, "after_cursor_execute", after_cursor_execute)
+            # Keep entries cached during the block, without the instrumentation.
+            previous_cache.update(self.info_cache)
+            self.info_cache = previous_cache
+
+    def get_table_stats(
+        self, table_name: str, schema: str | None = None, **kw: Any
+    ) -> ReflectedTableStats:
+        """Return row count, size and clustering information for a table.
+
+        :param table_name: string name of the table.  For special quoting,
+         use :class:`.quoted_name`.
+        :param schema: string schema name; if omitted, uses the default schema
+         of the database connection.
+        """
+        with self._operation_context() as conn:
+            return self.dialect.get_table_stats(  # type: ignore[attr-defined]
+                conn, table_name, schema, info_cache=self.info_cache, **kw
+            )
+
+    def get_multi_table_stats(
+        self,
+        schema: str | None = None,
+        filter_names: Sequence[str] | None = None,
+        **kw: Any,
+    ) -> dict[TableKey, ReflectedTableStats]:
+        """Return :meth:`get_table_stats` for every table in a schema.
+
+        The dictionary is keyed by ``(schema, table_name)`` like the other
+        ``get_multi_*`` methods.  A single paged ``SHOW TABLES`` serves all
+        tables, and the result is cached alongside ``get_table_names()``.
+        """
+        with self._operation_context() as conn:
+            return dict(
+                self.dialect.get_multi_table_stats(  # type: ignore[attr-defined]
+                    conn,
+                    schema=schema,
+                    filter_names=filter_names,
+                    info_cache=self.info_cache,
+                    **kw,
+                )
+            )
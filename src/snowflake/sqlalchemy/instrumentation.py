@@ -0,0 +1,324 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Per-statement timings.
+
+With ``create_engine(..., statement_sink=sink)`` every statement the engine
+runs produces a :class:`StatementTiming` that is passed to ``sink`` once its
+result has been consumed (or right after execution, for statements without
+rows).  The timings split a statement's latency into the client-side phases
+and carry the Snowflake query id, so slow phases can be matched against
+``QUERY_HISTORY``::
+
+    sink = RingBufferSink()
+    engine = create_engine(url, statement_sink=sink)
+    ...
+    for timing in sink:
+        print(timing.query_id, timing.execute, timing.fetch)
+
+A sink is any callable taking a :class:`StatementTiming`; :class:`LoggingSink`,
+:class:`RingBufferSink` and :class:`OpenTelemetrySink` (which needs
+``opentelemetry-api``) are provided.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import time
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.engine.cursor import ResultFetchStrategy
+
+from .operator_stats import _deliver_with_operator_stats
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult
+    from sqlalchemy.engine.interfaces import DBAPICursor
+
+    from .base import SnowflakeExecutionContext
+    from .operator_stats import QueryOperatorStats
+
+logger = logging.getLogger(__name__)
+
+StatementSink = Callable[["StatementTiming"], None]
+
+
+class StatementTiming:
+    """Where the time of one statement went, in seconds.
+
+    ``compile`` is the SQL compilation (0 when the statement cache supplied
+    the compiled form, see ``cache_hit``), ``bind`` the parameter processing
+    that prepares the execution, ``execute`` the connector's ``execute`` call
+    (the round trip until the first result chunk), and ``fetch`` the time
+    spent in the connector's ``fetch*`` calls, which includes downloading
+    further result chunks.  ``total`` runs from the start of the execution to
+    the moment the result was exhausted or closed, so ``total`` minus the
+    phases is row processing plus the time the application spent between
+    fetches.
+    """
+
+    def __init__(self, statement: str) -> None:
+        self.statement = statement
+        #: ``statement_fingerprint`` of the statement.
+        self.fingerprint: str | None = None
+        #: Snowflake query id (``sfqid``) of the statement.
+        self.query_id: str | None = None
+        self.rowcount: int | None = None
+        #: Uncompressed size of the result chunks, when the connector reports
+        #: it and the engine was created with ``statement_bytes_fetched=True``.
+        self.bytes_fetched: int | None = None
+        self.cache_hit = False
+        #: The exception the statement failed with, if it did.
+        self.error: BaseException | None = None
+        #: Operator statistics, for statements slower than the dialect's
+        #: ``operator_stats_threshold`` (fetched in the background, see
+        #: :mod:`.operator_stats`).
+        self.operator_stats: QueryOperatorStats | None = None
+        #: Wall-clock start of the execution, in nanoseconds since the epoch.
+        self.started_at_ns = time.time_ns()
+        self.compile = 0.0
+        self.bind = 0.0
+        self.execute = 0.0
+        self.fetch = 0.0
+        self.total = 0.0
+        self._start = time.perf_counter()
+        self._execute_start: float | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<StatementTiming query_id={self.query_id!r} total={self.total:.6f} "
+            f"execute={self.execute:.6f} fetch={self.fetch:.6f}>"
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "fingerprint": self.fingerprint,
+            "query_id": self.query_id,
+            "rowcount": self.rowcount,
+            "bytes_fetched": self.bytes_fetched,
+            "cache_hit": self.cache_hit,
+            "error": None if self.error is None else repr(self.error),
+            "compile": self.compile,
+            "bind": self.bind,
+            "execute": self.execute,
+            "fetch": self.fetch,
+            "total": self.total,
+            "operator_stats": None
+            if self.operator_stats is None
+            else self.operator_stats.as_dict(),
+        }
+
+
+class LoggingSink:
+    """Log each timing, optionally only those slower than ``min_total``."""
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        level: int = logging.INFO,
+        min_total: float = 0.0,
+    ) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+        self.min_total = min_total
+
+    def __call__(self, timing: StatementTiming) -> None:
+        if timing.total < self.min_total or not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(
+            self.level,
+            "query_id=%s fingerprint=%s total=%.6f compile=%.6f bind=%.6f execute=%.6f "
+            "fetch=%.6f rowcount=%s bytes=%s error=%s statement=%s",
+            timing.query_id,
+            timing.fingerprint,
+            timing.total,
+            timing.compile,
+            timing.bind,
+            timing.execute,
+            timing.fetch,
+            timing.rowcount,
+            timing.bytes_fetched,
+            timing.error,
+            timing.statement,
+        )
+
+
+class RingBufferSink:
+    """Keep the last ``maxlen`` timings in memory."""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self.records: collections.deque[StatementTiming] = collections.deque(
+            maxlen=maxlen
+        )
+
+    def __call__(self, timing: StatementTiming) -> None:
+        self.records.append(timing)
+
+    def __iter__(self) -> Iterator[StatementTiming]:
+        return iter(list(self.records))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+class OpenTelemetrySink:
+    """Record each statement as an OpenTelemetry span.
+
+    The span covers ``total`` and carries the phases as attributes.  Needs the
+    ``opentelemetry-api`` package (``snowflake-sqlalchemy[opentelemetry]``).
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if tracer is None:
+            from opentelemetry import trace
+
+            tracer = trace.get_tracer("snowflake.sqlalchemy")
+        self.tracer = tracer
+
+    def __call__(self, timing: StatementTiming) -> None:
+        span = self.tracer.start_span(
+            "snowflake.query",
+            start_time=timing.started_at_ns,
+            attributes={
+                "db.system": "snowflake",
+                "db.statement": timing.statement,
+                "snowflake.query_id": timing.query_id or "",
+                "snowflake.statement_fingerprint": timing.fingerprint or "",
+                "snowflake.rowcount": -1
+                if timing.rowcount is None
+                else timing.rowcount,
+                "snowflake.cache_hit": timing.cache_hit,
+                "snowflake.time.compile": timing.compile,
+                "snowflake.time.bind": timing.bind,
+                "snowflake.time.execute": timing.execute,
+                "snowflake.time.fetch": timing.fetch,
+            },
+        )
+        if timing.operator_stats is not None:
+            span.set_attribute(
+                "snowflake.bytes_spilled", timing.operator_stats.bytes_spilled
+            )
+        if timing.error is not None:
+            span.record_exception(timing.error)
+        span.end(end_time=timing.started_at_ns + int(timing.total * 1e9))
+
+
+def _emit(context: SnowflakeExecutionContext) -> None:
+    timing: StatementTiming | None = context._statement_timing
+    if timing is None:
+        return
+    context._statement_timing = None
+    timing.total = time.perf_counter() - timing._start
+    sink: StatementSink = context.dialect._statement_sink  # type: ignore[attr-defined]
+
+    def deliver(timing: StatementTiming) -> None:
+        try:
+            sink(timing)
+        except Exception as e:
+            logger.debug("Statement sink failed: %s: %s", type(e).__name__, str(e))
+
+    if not _deliver_with_operator_stats(context, timing, deliver):
+        deliver(timing)
+
+
+def _result_bytes(cursor: Any) -> int | None:
+    get_result_batches = getattr(cursor, "get_result_batches", None)
+    if get_result_batches is None:
+        return None
+    try:
+        sizes = [b.uncompressed_size for b in get_result_batches() or ()]
+    except Exception:
+        return None
+    known = [size for size in sizes if size is not None]
+    return sum(known) if known else None
+
+
+class _TimedFetchStrategy(ResultFetchStrategy):
+    """Time the connector fetches of a result and report when it closes."""
+
+    __slots__ = ("_inner", "_context", "_fetch_start", "alternate_cursor_description")
+
+    def __init__(
+        self, inner: ResultFetchStrategy, context: SnowflakeExecutionContext
+    ) -> None:
+        self._inner = inner
+        self._context = context
+        self._fetch_start: float | None = None
+        self.alternate_cursor_description = inner.alternate_cursor_description
+
+    def _timed(self, method: str, *args: Any) -> Any:
+        self._fetch_start = time.perf_counter()
+        try:
+            return getattr(self._inner, method)(*args)
+        finally:
+            self._stop_fetch()
+
+    def _stop_fetch(self) -> None:
+        # The fetch that exhausts the result closes it, and so emits, before
+        # it returns; count its time first.
+        if self._fetch_start is None:
+            return
+        timing = self._context._statement_timing
+        if timing is not None:
+            timing.fetch += time.perf_counter() - self._fetch_start
+        self._fetch_start = None
+
+    def fetchone(
+        self,
+        result: CursorResult[Any],
+        dbapi_cursor: DBAPICursor,
+        hard_close: bool = False,
+    ) -> Any:
+        return self._timed("fetchone", result, dbapi_cursor, hard_close)
+
+    def fetchmany(
+        self,
+        result: CursorResult[Any],
+        dbapi_cursor: DBAPICursor,
+        size: int | None = None,
+    ) -> Any:
+        return self._timed("fetchmany", result, dbapi_cursor, size)
+
+    def fetchall(self, result: CursorResult[Any], dbapi_cursor: DBAPICursor) -> Any:
+        return self._timed("fetchall", result, dbapi_cursor)
+
+    def soft_close(
+        self, result: CursorResult[Any], dbapi_cursor: DBAPICursor | None
+    ) -> None:
+        self._stop_fetch()
+        _emit(self._context)
+        self._inner.soft_close(result, dbapi_cursor)
+
+    def hard_close(
+        self, result: CursorResult[Any], dbapi_cursor: DBAPICursor | None
+    ) -> None:
+        self._stop_fetch()
+        _emit(self._context)
+        self._inner.hard_close(result, dbapi_cursor)
+
+    def yield_per(
+        self, result: CursorResult[Any], dbapi_cursor: DBAPICursor, num: int
+    ) -> None:
+        self._inner.yield_per(result, dbapi_cursor, num)
+        result.cursor_strategy = _TimedFetchStrategy(
+            result.cursor_strategy, self._context
+        )
+
+    def handle_exception(
+        self,
+        result: CursorResult[Any],
+        dbapi_cursor: DBAPICursor | None,
+        err: BaseException,
+    ) -> Any:
+        self._stop_fetch()
+        timing = self._context._statement_timing
+        if timing is not None:
+            timing.error = err
+        _emit(self._context)
+        return self._inner.handle_exception(result, dbapi_cursor, err)
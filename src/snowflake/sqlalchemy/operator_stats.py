@@ -0,0 +1,263 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Per-operator statistics of executed queries.
+
+:func:`get_query_operator_stats` runs ``GET_QUERY_OPERATOR_STATS`` for a
+query id (or a result, see ``get_query_id``) and returns a
+:class:`QueryOperatorStats`, which sums up what usually explains a slow
+query: spilling, rows flowing through each operator, partition pruning and
+joins that output more rows than they read::
+
+    result = connection.execute(report)
+    stats = get_query_operator_stats(connection, result)
+    stats.bytes_spilled, stats.partitions_scanned, stats.exploding_joins()
+
+With ``create_engine(..., statement_sink=sink, operator_stats_threshold=5)``,
+the statistics of every statement whose execution took longer than 5 seconds
+are fetched and attached to its ``StatementTiming`` as ``operator_stats``
+before it reaches the sink.  The fetch is one more query, for those statements
+only, sent from a background thread over another connection of the engine's
+pool: the statement's own session keeps ``LAST_QUERY_ID()`` and its query
+history, and the application does not wait for it.  Such timings reach the
+sink from that thread, after the timings of later statements.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Connection, Engine
+
+from .util import get_query_id
+
+if TYPE_CHECKING:
+    from .base import SnowflakeExecutionContext
+    from .instrumentation import StatementTiming
+
+logger = logging.getLogger(__name__)
+
+_QUERY_ID_RE = re.compile(r"^[0-9A-Za-z-]+$")
+
+
+def _variant(value: Any) -> dict[str, Any]:
+    # VARIANT columns arrive as JSON text.
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value or {}
+
+
+class OperatorStats:
+    """The statistics of one operator, e.g. a ``TableScan`` or a ``Join``."""
+
+    def __init__(self, row: Mapping[str, Any]) -> None:
+        self.step_id: int = row.get("STEP_ID") or 0
+        self.operator_id: int = row.get("OPERATOR_ID") or 0
+        self.operator_type: str = row.get("OPERATOR_TYPE") or ""
+        parents = row.get("PARENT_OPERATORS")
+        self.parent_operators: list[int] = list(
+            json.loads(parents) if isinstance(parents, str) else parents or ()
+        )
+        #: ``OPERATOR_STATISTICS`` and ``OPERATOR_ATTRIBUTES``, decoded.
+        self.statistics = _variant(row.get("OPERATOR_STATISTICS"))
+        self.attributes = _variant(row.get("OPERATOR_ATTRIBUTES"))
+        breakdown = _variant(row.get("EXECUTION_TIME_BREAKDOWN"))
+        #: Share of the query's execution time spent in this operator.
+        self.time_percentage: float = breakdown.get("overall_percentage") or 0.0
+
+        spilling = self.statistics.get("spilling") or {}
+        pruning = self.statistics.get("pruning") or {}
+        self.input_rows: int | None = self.statistics.get("input_rows")
+        self.output_rows: int | None = self.statistics.get("output_rows")
+        self.bytes_spilled_local: int = spilling.get("bytes_spilled_local_storage") or 0
+        self.bytes_spilled_remote: int = (
+            spilling.get("bytes_spilled_remote_storage") or 0
+        )
+        self.partitions_scanned: int | None = pruning.get("partitions_scanned")
+        self.partitions_total: int | None = pruning.get("partitions_total")
+
+    def __repr__(self) -> str:
+        return (
+            f"<OperatorStats {self.step_id}.{self.operator_id} "
+            f"{self.operator_type} rows={self.input_rows}->{self.output_rows}>"
+        )
+
+    @property
+    def join_explosion(self) -> float | None:
+        """Output rows per input row of a join; ``None`` for other operators."""
+        if "join" not in self.operator_type.lower() or not self.input_rows:
+            return None
+        return (self.output_rows or 0) / self.input_rows
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "step_id": self.step_id,
+            "operator_id": self.operator_id,
+            "operator_type": self.operator_type,
+            "parent_operators": self.parent_operators,
+            "input_rows": self.input_rows,
+            "output_rows": self.output_rows,
+            "bytes_spilled_local": self.bytes_spilled_local,
+            "bytes_spilled_remote": self.bytes_spilled_remote,
+            "partitions_scanned": self.partitions_scanned,
+            "partitions_total": self.partitions_total,
+            "time_percentage": self.time_percentage,
+        }
+
+
+class QueryOperatorStats:
+    """``GET_QUERY_OPERATOR_STATS`` of one query."""
+
+    def __init__(self, query_id: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        self.query_id = query_id
+        self.operators = [
+            OperatorStats({key.upper(): value for key, value in row.items()})
+            for row in rows
+        ]
+
+    def __iter__(self) -> Iterator[OperatorStats]:
+        return iter(self.operators)
+
+    def __repr__(self) -> str:
+        return (
+            f"<QueryOperatorStats {self.query_id} operators={len(self.operators)} "
+            f"bytes_spilled={self.bytes_spilled}>"
+        )
+
+    @property
+    def bytes_spilled_local(self) -> int:
+        return sum(op.bytes_spilled_local for op in self.operators)
+
+    @property
+    def bytes_spilled_remote(self) -> int:
+        return sum(op.bytes_spilled_remote for op in self.operators)
+
+    @property
+    def bytes_spilled(self) -> int:
+        """Bytes spilled to local and remote storage."""
+        return self.bytes_spilled_local + self.bytes_spilled_remote
+
+    @property
+    def partitions_scanned(self) -> int:
+        return sum(op.partitions_scanned or 0 for op in self.operators)
+
+    @property
+    def partitions_total(self) -> int:
+        return sum(op.partitions_total or 0 for op in self.operators)
+
+    def exploding_joins(self, factor: float = 1.0) -> list[OperatorStats]:
+        """Joins returning more than ``factor`` rows per input row."""
+        return [
+            op
+            for op in self.operators
+            if op.join_explosion is not None and op.join_explosion > factor
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "query_id": self.query_id,
+            "bytes_spilled_local": self.bytes_spilled_local,
+            "bytes_spilled_remote": self.bytes_spilled_remote,
+            "partitions_scanned": self.partitions_scanned,
+            "partitions_total": self.partitions_total,
+            "operators": [op.as_dict() for op in self.operators],
+        }
+
+
+def _stats_sql(query_id: str) -> str:
+    if not _QUERY_ID_RE.match(query_id):
+        raise sa_exc.ArgumentError(f"Invalid query id: {query_id!r}")
+    return f"SELECT * FROM TABLE(GET_QUERY_OPERATOR_STATS('{query_id}'))"
+
+
+def get_query_operator_stats(connection: Connection, query: Any) -> QueryOperatorStats:
+    """Fetch the operator statistics of ``query``.
+
+    ``query`` is a query id or a result returned by ``execute``.  The query
+    must have completed, and have been run by the connection's user.
+    """
+    query_id = query if isinstance(query, str) else get_query_id(query)
+    if not query_id:
+        raise sa_exc.ArgumentError(f"No Snowflake query id for {query!r}")
+    result = connection.exec_driver_sql(_stats_sql(query_id))
+    return QueryOperatorStats(query_id, [dict(row) for row in result.mappings()])
+
+
+def _deliver_with_operator_stats(
+    context: SnowflakeExecutionContext,
+    timing: StatementTiming,
+    deliver: Callable[[StatementTiming], None],
+) -> bool:
+    """Have ``deliver`` called once the statistics are attached.
+
+    Only for statements slower than the dialect's threshold; returns whether
+    the timing was taken over.
+    """
+    dialect = context.dialect
+    threshold: float | None = getattr(dialect, "_operator_stats_threshold", None)
+    if (
+        threshold is None
+        or timing.execute < threshold
+        or timing.error is not None
+        or not timing.query_id
+    ):
+        return False
+    executor: ThreadPoolExecutor = dialect._operator_stats_executor  # type: ignore[attr-defined]
+    try:
+        executor.submit(_fetch, context.root_connection.engine, timing, deliver)
+    except RuntimeError:
+        # Raced with ``engine.dispose()`` shutting the executor down.
+        return False
+    return True
+
+
+def _operator_stats_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="snowflake-sqlalchemy-operator-stats"
+    )
+
+
+def _shutdown_operator_stats(engine: Engine) -> None:
+    """``engine_disposed`` hook: stop the dialect's statistics thread.
+
+    Fetches already queued still run.  The engine stays usable after
+    ``dispose()``, so a fresh executor takes over; it starts no thread until
+    a slow statement needs one.
+    """
+    dialect = engine.dialect
+    executor: ThreadPoolExecutor = dialect._operator_stats_executor  # type: ignore[attr-defined]
+    dialect._operator_stats_executor = _operator_stats_executor()  # type: ignore[attr-defined]
+    executor.shutdown(wait=False)
+
+
+def _fetch(
+    engine: Engine,
+    timing: StatementTiming,
+    deliver: Callable[[StatementTiming], None],
+) -> None:
+    assert timing.query_id is not None
+    try:
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(_stats_sql(timing.query_id))
+                names = [column[0] for column in cursor.description or ()]
+                rows = [dict(zip(names, row, strict=True)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.debug(
+            "Failed to fetch operator statistics: %s: %s", type(e).__name__, str(e)
+        )
+    else:
+        timing.operator_stats = QueryOperatorStats(timing.query_id, rows)
+    deliver(timing)
@@ -0,0 +1,172 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Replace pooled connections before their Snowflake login expires.
+
+A Snowflake session is backed by a master token that is valid for a fixed time
+after authentication (four hours unless the account says otherwise); the
+session token is renewed from it, but once the master token expires the
+connection has to authenticate again, which otherwise happens in the middle of
+whatever request next uses it.  :class:`TokenExpiryRecycler` records each
+connection's expiry when it is opened and, ``margin`` seconds before that,
+soft-invalidates its pool entry, so the pool opens a fresh connection the next
+time the entry is checked out instead of handing out one whose login may
+expire mid-request::
+
+    recycler = TokenExpiryRecycler(engine, margin=300).start()
+    ...
+    recycler.stop()
+
+Entries are marked when they are returned to the pool and by a background pass
+every ``interval`` seconds, for the idle ones.  Checking out a connection that
+is already past its deadline replaces it on the spot, through SQLAlchemy's
+usual ``DisconnectionError`` handling.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+#: Seconds before the master token expires at which connections are replaced.
+DEFAULT_MARGIN = 300.0
+#: Seconds between background passes.
+DEFAULT_INTERVAL = 60.0
+# Used when the connection does not report its master token validity.
+_DEFAULT_VALIDITY = 4 * 3600
+
+_EXPIRES_AT = "_sqlalchemy_expires_at"
+
+
+def _master_validity(dbapi_connection: Any) -> float:
+    rest = getattr(dbapi_connection, "rest", None)
+    return getattr(rest, "master_validity_in_seconds", None) or _DEFAULT_VALIDITY
+
+
+class TokenExpiryRecycler:
+    """Recycle ``engine``'s pooled connections ahead of master token expiry.
+
+    ``recycled`` counts the connections retired so far.  Pass
+    ``AsyncEngine.sync_engine`` for an asyncio engine.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        margin: float = DEFAULT_MARGIN,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        self.engine = engine
+        self.margin = margin
+        self.interval = interval
+        #: Connections retired before their login expired.
+        self.recycled = 0
+        self._lock = threading.Lock()
+        self._records: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listening = False
+        self._listen()
+
+    def start(self) -> TokenExpiryRecycler:
+        """Run :meth:`refresh` every ``interval`` seconds on a daemon thread."""
+        self._listen()
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="snowflake-sqlalchemy-recycler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background thread and detach from the engine's pool."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._listening:
+            for name, listener in self._listeners():
+                event.remove(self.engine, name, listener)
+            self._listening = False
+
+    def refresh(self) -> int:
+        """Retire the connections that expire before the next pass.
+
+        Returns how many were retired.  Their pool entries are only
+        soft-invalidated: nothing is checked out, closed or opened here, and
+        the pool replaces each one when it is next checked out.
+        """
+        horizon = time.monotonic() + self.interval
+        with self._lock:
+            records = list(self._records)
+        return sum(self._retire(record, horizon) for record in records)
+
+    def _listen(self) -> None:
+        if not self._listening:
+            for name, listener in self._listeners():
+                event.listen(self.engine, name, listener)
+            self._listening = True
+
+    def _listeners(self) -> list[tuple[str, Any]]:
+        return [
+            ("connect", self._on_connect),
+            ("checkout", self._on_checkout),
+            ("checkin", self._on_checkin),
+        ]
+
+    def _retire(self, connection_record: Any, horizon: float) -> bool:
+        expires_at = getattr(connection_record.dbapi_connection, _EXPIRES_AT, None)
+        if expires_at is None or expires_at > horizon:
+            return False
+        with self._lock:
+            if connection_record not in self._records:
+                return False
+            self._records.discard(connection_record)
+            self.recycled += 1
+        connection_record.invalidate(soft=True)
+        return True
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.debug(
+                    "Failed to recycle expiring connections: %s: %s",
+                    type(e).__name__,
+                    str(e),
+                )
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        expires_at = time.monotonic() + _master_validity(dbapi_connection) - self.margin
+        setattr(dbapi_connection, _EXPIRES_AT, expires_at)
+        with self._lock:
+            self._records.add(connection_record)
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        if dbapi_connection is not None:
+            self._retire(connection_record, time.monotonic() + self.interval)
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        expires_at = getattr(dbapi_connection, _EXPIRES_AT, None)
+        if expires_at is None or expires_at > time.monotonic():
+            return
+        with self._lock:
+            self._records.discard(connection_record)
+            self.recycled += 1
+        # The pool invalidates the connection and opens a new one.
+        raise sa_exc.DisconnectionError(
+            "Snowflake login of the pooled connection is about to expire"
+        )
@@ -0,0 +1,194 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""``EXPLAIN`` plans, with partition pruning statistics.
+
+:func:`explain` compiles a statement for Snowflake, runs ``EXPLAIN`` on it
+(which compiles the query without running it) and parses the plan::
+
+    plan = explain(connection, select(orders).where(orders.c.day == today))
+    plan.partitions_assigned, plan.partitions_total, plan.tables
+
+:func:`assert_pruning` turns it into a regression test that fails when a query
+stops pruning micro-partitions::
+
+    assert_pruning(plan, max_ratio=0.05, table="orders")
+
+:meth:`QueryPlan.from_json` parses recorded ``EXPLAIN USING JSON`` output, so
+the checks also run offline.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ClauseElement
+
+_FORMATS = ("json", "text", "tabular")
+
+
+class PlanOperation:
+    """One operator of a plan, e.g. a ``TableScan``, ``Filter`` or ``Join``."""
+
+    def __init__(self, data: Mapping[str, Any], step: int = 0) -> None:
+        self.id: int = data["id"]
+        #: Index of the plan step (query) the operator belongs to.
+        self.step = step
+        self.operation: str = data.get("operation", "")
+        #: Ids of the operators consuming this one's output.
+        self.parents: list[int] = list(
+            data.get("parentOperators")
+            or ([data["parent"]] if data.get("parent") is not None else [])
+        )
+        self.expressions: list[str] = list(data.get("expressions") or ())
+        #: Fully qualified names of the tables (or other objects) it reads.
+        self.objects: list[str] = list(data.get("objects") or ())
+        self.alias: str | None = data.get("alias")
+        self.partitions_assigned: int | None = data.get("partitionsAssigned")
+        self.partitions_total: int | None = data.get("partitionsTotal")
+        self.bytes_assigned: int | None = data.get("bytesAssigned")
+
+    def __repr__(self) -> str:
+        return f"<PlanOperation {self.id} {self.operation} {self.objects or ''}>"
+
+    def reads(self, table: str) -> bool:
+        """Whether the operator reads ``table`` (``name``, ``schema.name``...)."""
+        return any(_name_matches(name, table) for name in self.objects)
+
+
+class QueryPlan:
+    """A parsed ``EXPLAIN USING JSON`` plan."""
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        #: The plan as returned by Snowflake.
+        self.raw = data
+        stats = data.get("GlobalStats") or {}
+        self.partitions_assigned: int = stats.get("partitionsAssigned", 0)
+        self.partitions_total: int = stats.get("partitionsTotal", 0)
+        self.bytes_assigned: int = stats.get("bytesAssigned", 0)
+        self.operations = [
+            PlanOperation(operation, step)
+            for step, operations in enumerate(data.get("Operations") or ())
+            for operation in operations
+        ]
+
+    @classmethod
+    def from_json(cls, plan: str | bytes | Mapping[str, Any]) -> QueryPlan:
+        """Parse ``EXPLAIN USING JSON`` output (the text or the decoded object)."""
+        if isinstance(plan, (str, bytes)):
+            plan = json.loads(plan)
+        return cls(plan)  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[PlanOperation]:
+        return iter(self.operations)
+
+    def __repr__(self) -> str:
+        return (
+            f"<QueryPlan partitions={self.partitions_assigned}/"
+            f"{self.partitions_total} operations={len(self.operations)}>"
+        )
+
+    @property
+    def tables(self) -> list[str]:
+        """Names of the objects the plan reads, in plan order."""
+        return list(
+            dict.fromkeys(name for op in self.operations for name in op.objects)
+        )
+
+    def scans(self, table: str | None = None) -> list[PlanOperation]:
+        """The operators reading tables, or only ``table``."""
+        return [
+            op
+            for op in self.operations
+            if op.partitions_total is not None and (table is None or op.reads(table))
+        ]
+
+    def partition_ratio(self, table: str | None = None) -> float:
+        """Fraction of the partitions the query scans, of ``table`` or overall.
+
+        ``0.0`` for tables without partitions.
+        """
+        if table is None:
+            assigned, total = self.partitions_assigned, self.partitions_total
+        else:
+            scans = self.scans(table)
+            if not scans:
+                raise LookupError(f"The plan does not scan {table!r}: {self.tables}")
+            assigned = sum(op.partitions_assigned or 0 for op in scans)
+            total = sum(op.partitions_total or 0 for op in scans)
+        return assigned / total if total else 0.0
+
+
+def explain(
+    connection: Connection,
+    statement: ClauseElement | str,
+    format: str = "json",
+) -> Any:
+    """Return the plan Snowflake makes for ``statement``.
+
+    ``statement`` is compiled by the connection's dialect with its bound
+    values rendered inline.  ``format`` is ``"json"`` for a
+    :class:`QueryPlan`, ``"text"`` for the text plan or ``"tabular"`` for
+    the plan rows as dictionaries.
+    """
+    fmt = format.lower()
+    if fmt not in _FORMATS:
+        raise sa_exc.ArgumentError(
+            f"format must be one of {', '.join(_FORMATS)}; got {format!r}"
+        )
+    if isinstance(statement, str):
+        sql = statement
+    else:
+        sql = str(
+            statement.compile(
+                dialect=connection.dialect,
+                compile_kwargs={"literal_binds": True, "render_postcompile": True},
+            )
+        )
+    result = connection.exec_driver_sql(f"EXPLAIN USING {fmt.upper()} {sql}")
+    if fmt == "tabular":
+        return [dict(row) for row in result.mappings()]
+    value = result.scalar_one()
+    if fmt == "text":
+        return value
+    return QueryPlan.from_json(value)
+
+
+def assert_pruning(plan: QueryPlan, max_ratio: float, table: str | None = None) -> None:
+    """Fail unless the plan scans at most ``max_ratio`` of the partitions.
+
+    Of ``table`` when given (also failing when the plan does not read it),
+    of all the tables the query reads otherwise.  Meant for tests::
+
+        def test_daily_report_prunes(connection):
+            assert_pruning(explain(connection, daily_report), 0.1, "events")
+    """
+    try:
+        ratio = plan.partition_ratio(table)
+    except LookupError as e:
+        raise AssertionError(str(e)) from None
+    if ratio > max_ratio:
+        scans = ", ".join(
+            f"{'/'.join(op.objects)} {op.partitions_assigned}/{op.partitions_total}"
+            for op in plan.scans(table)
+        )
+        raise AssertionError(
+            f"The query scans {ratio:.1%} of the partitions"
+            f"{f' of {table}' if table else ''}, more than {max_ratio:.1%}: {scans}"
+        )
+
+
+def _name_matches(name: str, table: str) -> bool:
+    # ``DB.SCHEMA.T`` matches ``t``, ``schema.t`` and ``db.schema.t``.
+    parts = [part.strip('"') for part in name.split(".")]
+    wanted = [part.strip('"') for part in table.split(".")]
+    if len(wanted) > len(parts):
+        return False
+    return all(
+        have.upper() == want.upper()
+        for have, want in zip(parts[-len(wanted) :], wanted, strict=True)
+    )
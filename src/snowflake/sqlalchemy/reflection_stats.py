@@ -0,0 +1,214 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+from __future__ import annotations
+
+import re
+import time
+from typing import Any
+
+# Reflection statements carry a ``/* sqlalchemy:<method> */`` marker naming the
+# dialect method that issued them; see e.g. ``_get_schema_primary_keys``.
+_REFLECTION_TAG_RE = re.compile(r"/\*\s*sqlalchemy:(\w+)\s*\*/")
+_VERB_RE = re.compile(r"\s*(\w+)")
+
+# ``_StructuredTypeInfoManager`` falls back to ``DESC TABLE`` under this tag.
+_DESC_FALLBACK_TAG = "_get_schema_columns"
+
+
+class PhaseStats:
+    """Round trips, rows and wall time of the SQL issued for one reflection
+    phase (the ``sqlalchemy:<method>`` tag of the statements)."""
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.rows = 0
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "round_trips": self.round_trips,
+            "rows": self.rows,
+            "elapsed": self.elapsed,
+        }
+
+
+class MethodStats:
+    """Cache hits, misses and wall time of one ``@reflection.cache`` method.
+
+    ``elapsed`` is only accumulated on misses and includes the time spent in
+    nested cached methods.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "elapsed": self.elapsed}
+
+
+class ReflectionStats:
+    """Counters collected by :meth:`.SnowflakeInspector.collect_stats`.
+
+    ``phases`` maps each reflection phase to its :class:`PhaseStats`.
+    Statements are attributed to the ``sqlalchemy:<method>`` tag embedded in
+    their SQL, or to the innermost cached method running when untagged SQL is
+    issued; SQL issued outside of reflection is ignored.  ``methods`` maps each
+    ``@reflection.cache`` method to its :class:`MethodStats`.  ``show_pages``
+    counts ``SHOW`` round trips (each page of a paged listing is one) and
+    ``desc_fallbacks`` counts per-table ``DESC TABLE`` column fallbacks.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.phases: dict[str, PhaseStats] = {}
+        self.methods: dict[str, MethodStats] = {}
+        self.show_pages = 0
+        self.desc_fallbacks = 0
+        # Stack of (cache key, start time) for cached methods currently running.
+        self._running: list[tuple[Any, float]] = []
+
+    @property
+    def round_trips(self) -> int:
+        return sum(p.round_trips for p in self.phases.values())
+
+    @property
+    def rows(self) -> int:
+        return sum(p.rows for p in self.phases.values())
+
+    @property
+    def elapsed(self) -> float:
+        return sum(p.elapsed for p in self.phases.values())
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(m.hits for m in self.methods.values())
+
+    @property
+    def cache_misses(self) -> int:
+        return sum(m.misses for m in self.methods.values())
+
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all counters as plain, JSON-serializable data."""
+        return {
+            "round_trips": self.round_trips,
+            "rows": self.rows,
+            "elapsed": self.elapsed,
+            "show_pages": self.show_pages,
+            "desc_fallbacks": self.desc_fallbacks,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "phases": {name: p.as_dict() for name, p in sorted(self.phases.items())},
+            "methods": {name: m.as_dict() for name, m in sorted(self.methods.items())},
+        }
+
+    def report(self) -> str:
+        """Return a human-readable summary, slowest phases first."""
+        lines = [
+            f"reflection: {self.round_trips} round trips, {self.rows} rows, "
+            f"{self.elapsed:.3f}s in SQL, {self.show_pages} SHOW pages, "
+            f"{self.desc_fallbacks} DESC fallbacks, cache "
+            f"{self.cache_hits} hits / {self.cache_misses} misses",
+        ]
+        for name, phase in sorted(
+            self.phases.items(), key=lambda item: item[1].elapsed, reverse=True
+        ):
+            lines.append(
+                f"  sql    {name}: {phase.round_trips} round trips, "
+                f"{phase.rows} rows, {phase.elapsed:.3f}s"
+            )
+        for name, method in sorted(
+            self.methods.items(), key=lambda item: item[1].elapsed, reverse=True
+        ):
+            lines.append(
+                f"  cache  {name}: {method.hits} hits, {method.misses} misses, "
+                f"{method.elapsed:.3f}s"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReflectionStats round_trips={self.round_trips} rows={self.rows} "
+            f"cache_hits={self.cache_hits} cache_misses={self.cache_misses}>"
+        )
+
+    def _method(self, name: str) -> MethodStats:
+        if name not in self.methods:
+            self.methods[name] = MethodStats()
+        return self.methods[name]
+
+    def _record_lookup(self, key: Any, hit: bool) -> None:
+        if not (isinstance(key, tuple) and key and isinstance(key[0], str)):
+            return
+        method = self._method(key[0])
+        if hit:
+            method.hits += 1
+        else:
+            method.misses += 1
+            self._running.append((key, time.perf_counter()))
+
+    def _record_store(self, key: Any) -> None:
+        # Pop back to the matching miss; entries above it belong to nested
+        # calls that raised before storing a result.
+        for index in range(len(self._running) - 1, -1, -1):
+            if self._running[index][0] == key:
+                started = self._running[index][1]
+                del self._running[index:]
+                self._method(key[0]).elapsed += time.perf_counter() - started
+                return
+
+    def _record_statement(self, statement: str, rows: int, elapsed: float) -> None:
+        tag = _REFLECTION_TAG_RE.search(statement)
+        if tag is not None:
+            phase_name = tag.group(1)
+        elif self._running:
+            phase_name = self._running[-1][0][0]
+        else:
+            return
+        phase = self.phases.setdefault(phase_name, PhaseStats())
+        phase.round_trips += 1
+        phase.rows += max(rows, 0)
+        phase.elapsed += elapsed
+
+        verb = _VERB_RE.match(statement)
+        keyword = verb.group(1).upper() if verb else ""
+        if keyword == "SHOW":
+            self.show_pages += 1
+        elif keyword in ("DESC", "DESCRIBE") and phase_name == _DESC_FALLBACK_TAG:
+            self.desc_fallbacks += 1
+
+
+class _InstrumentedInfoCache(dict):
+    """``info_cache`` that reports ``@reflection.cache`` lookups to a
+    :class:`ReflectionStats`.
+
+    ``reflection.cache`` probes with ``get()`` and stores misses with
+    ``__setitem__``; a few dialect helpers look up entries directly.
+    """
+
+    def __init__(self, entries: dict, stats: ReflectionStats) -> None:
+        super().__init__(entries)
+        self.stats = stats
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = super().get(key)
+        self.stats._record_lookup(key, value is not None)
+        return default if value is None else value
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.stats._record_lookup(key, True)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.stats._record_store(key)
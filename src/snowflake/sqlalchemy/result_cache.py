@@ -0,0 +1,503 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Client-side result cache with a time to live.
+
+The ``result_cache_ttl`` execution option serves repeated reads from a local
+cache instead of Snowflake::
+
+    conn = conn.execution_options(result_cache_ttl=30)
+    conn.execute(dashboard_query)  # runs the query, caches the rows
+    conn.execute(dashboard_query)  # no round trip for the next 30 seconds
+
+An entry is keyed by the SQL text (the compiled form the statement cache
+holds), the bound parameters, the session's account, user, role, warehouse,
+database and schema, and the ``session_parameters`` / ``warehouse`` options.
+Only read-only statements are cached, and their rows are buffered in full.
+Statements reading anything but tables and subqueries (table functions,
+stages) are not cached, since writes could not invalidate their entries.
+
+The backend is the dialect's ``result_cache`` argument: a
+:class:`MemoryResultCache` (the default, per engine) or a
+:class:`DiskResultCache` shared by the worker processes of a host.  DML and
+DDL run through the engine drop the entries that read their target table, once
+when they run and again at ``COMMIT`` or ``ROLLBACK``;
+:func:`invalidate_result_cache` does it for writes the engine cannot see.
+Until then the connection that wrote a table neither reads it from the cache
+nor caches it, since it sees rows others can't (and, after a ``ROLLBACK``,
+rows that never existed).
+"""
+
+from __future__ import annotations
+
+import abc
+import collections
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from .util import _connection_autocommit
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection, Engine
+
+    from .base import SnowflakeExecutionContext
+
+RESULT_CACHE_TTL_OPTION = "result_cache_ttl"
+
+# Tables written since the last COMMIT / ROLLBACK, on the driver connection;
+# always empty in autocommit mode.
+_PENDING_INVALIDATIONS = "_sqlalchemy_result_cache_pending"
+
+_NAME = r'(?:"(?:[^"]|"")+"|[\w$]+)'
+_QUALIFIED_NAME = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+# Tokens of a statement: whitespace and comments (group 1, skipped), string
+# literals, quoted and unquoted names, and single characters.
+_TOKEN_RE = re.compile(
+    r"(\s+|--[^\n]*|//[^\n]*|/\*.*?\*/)"
+    r"|'(?:[^'\\]|\\.|'')*'"
+    r'|"(?:[^"]|"")+"'
+    r"|[\w$]+"
+    r"|.",
+    re.S,
+)
+_UNQUOTED_NAME_RE = re.compile(r"^[A-Za-z_][\w$]*$")
+# Words that may follow an item of a FROM list, so are never its alias.
+_FROM_ITEM_FOLLOWERS = frozenset(
+    """
+    WHERE GROUP ORDER HAVING QUALIFY LIMIT OFFSET FETCH UNION INTERSECT EXCEPT
+    MINUS JOIN INNER LEFT RIGHT FULL OUTER CROSS NATURAL ASOF ON USING WINDOW
+    FOR PIVOT UNPIVOT MATCH_RECOGNIZE SAMPLE TABLESAMPLE AT BEFORE CHANGES
+    CONNECT START LATERAL
+    """.split()
+)
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:"
+    r"insert\s+(?:overwrite\s+)?into"
+    r"|update"
+    r"|delete\s+from"
+    r"|merge\s+into"
+    r"|copy\s+into"
+    r"|truncate\s+(?:table\s+)?(?:if\s+exists\s+)?"
+    r"|(?:create|drop|alter|undrop)\s+(?:or\s+replace\s+)?(?:[\w]+\s+)*?"
+    r"(?:table|view)\s+(?:if\s+(?:not\s+)?exists\s+)?"
+    rf")\s*({_QUALIFIED_NAME})",
+    re.I | re.S,
+)
+_LAST_PART_RE = re.compile(rf"({_NAME})\s*$")
+
+
+def _table_name(qualified: str) -> str:
+    """The table part of a name, as Snowflake resolves it."""
+    match = _LAST_PART_RE.search(qualified)
+    name = match.group(1) if match else qualified
+    if name.startswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name.upper()
+
+
+def _read_tables(statement: str) -> frozenset[str] | None:
+    """The tables ``statement`` reads; ``None`` when they can't all be told.
+
+    Every item of every ``FROM`` list and ``JOIN`` counts, subqueries
+    included.  Table functions, stages and anything else that isn't a plain
+    (qualified) name or a subquery make the answer unknown.
+    """
+    tokens = [
+        match.group(0)
+        for match in _TOKEN_RE.finditer(statement)
+        if match.group(1) is None
+    ]
+    tables: set[str] = set()
+    for position, token in enumerate(tokens):
+        if token.upper() not in ("FROM", "JOIN"):
+            continue
+        index = _from_item(tokens, position + 1, tables)
+        while index is not None and index < len(tokens) and tokens[index] == ",":
+            index = _from_item(tokens, index + 1, tables)
+        if index is None:
+            return None
+    return frozenset(tables)
+
+
+def _is_name(token: str) -> bool:
+    return token.startswith('"') or bool(_UNQUOTED_NAME_RE.match(token))
+
+
+def _from_item(tokens: list[str], index: int, tables: set[str]) -> int | None:
+    """Add the table of the FROM item at ``index``; return the index after it."""
+    if index < len(tokens) and tokens[index] == "(":
+        # A subquery: its own FROM lists are read where they start.
+        depth = 0
+        for end in range(index, len(tokens)):
+            depth += {"(": 1, ")": -1}.get(tokens[end], 0)
+            if depth == 0:
+                break
+        else:
+            return None
+        index = end + 1
+    elif index < len(tokens) and _is_name(tokens[index]):
+        while index + 2 < len(tokens) and tokens[index + 1] == ".":
+            if not _is_name(tokens[index + 2]):
+                return None
+            index += 2
+        if index + 1 < len(tokens) and tokens[index + 1] == "(":
+            # A table function.
+            return None
+        tables.add(_table_name(tokens[index]))
+        index += 1
+    else:
+        return None
+    # An alias, with or without AS.
+    if index < len(tokens) and tokens[index].upper() == "AS":
+        index += 1
+        if index >= len(tokens) or not _is_name(tokens[index]):
+            return None
+        return index + 1
+    if (
+        index < len(tokens)
+        and _is_name(tokens[index])
+        and tokens[index].upper() not in _FROM_ITEM_FOLLOWERS
+    ):
+        index += 1
+    return index
+
+
+def _written_tables(statement: str) -> frozenset[str]:
+    match = _WRITE_TABLE_RE.match(statement)
+    return frozenset((_table_name(match.group(1)),)) if match else frozenset()
+
+
+class CachedResult:
+    """The frozen rows of one statement."""
+
+    # Id of the query the rows came from.
+    query_id: str | None = None
+
+    def __init__(
+        self,
+        description: Sequence[tuple[Any, ...]],
+        rows: Sequence[tuple[Any, ...]],
+        tables: frozenset[str],
+        ttl: float,
+        query_id: str | None = None,
+    ) -> None:
+        self.description = [tuple(d) for d in description]
+        self.rows = [tuple(r) for r in rows]
+        self.tables = tables
+        self.query_id = query_id
+        self.created_at = time.time()
+        self.expires_at = self.created_at + ttl
+        self.size = len(pickle.dumps((self.description, self.rows)))
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class ResultCache(abc.ABC):
+    """Interface of the ``result_cache`` backends.
+
+    ``hits`` and ``misses`` count lookups; entries bigger than ``max_bytes``
+    are not stored.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def get(self, key: str) -> CachedResult | None: ...
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CachedResult) -> None: ...
+
+    @abc.abstractmethod
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """Drop the entries that read any of ``tables``."""
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryResultCache(ResultCache):
+    """In-process LRU cache holding up to ``max_bytes`` of pickled results."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        super().__init__(max_bytes)
+        self._entries: collections.OrderedDict[str, CachedResult] = (
+            collections.OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expired:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CachedResult) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        tables = frozenset(tables)
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.tables & tables]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: str) -> None:
+        self._size -= self._entries.pop(key).size
+
+
+class DiskResultCache(ResultCache):
+    """Cache in a local directory, shared by every process using ``path``.
+
+    Entries are pickle files, so ``path`` must only be writable by trusted
+    users.  Invalidating a table writes a marker that makes older entries
+    reading it stale in every process; the oldest files are removed once the
+    directory holds more than ``max_bytes``.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        super().__init__(max_bytes)
+        self.path = path
+        self._markers = os.path.join(path, "invalidated")
+        os.makedirs(self._markers, exist_ok=True)
+
+    def get(self, key: str) -> CachedResult | None:
+        entry = self._load(key)
+        if entry is not None and (entry.expired or self._is_invalidated(entry)):
+            self._unlink(self._entry_path(key))
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: CachedResult) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self._write(self._entry_path(key), pickle.dumps(entry))
+        self._evict()
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        now = repr(time.time()).encode()
+        for table in tables:
+            self._write(self._marker_path(table), now)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.path):
+            if name.endswith(".pickle"):
+                self._unlink(os.path.join(self.path, name))
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.pickle")
+
+    def _marker_path(self, table: str) -> str:
+        digest = hashlib.sha256(table.encode("utf-8")).hexdigest()
+        return os.path.join(self._markers, digest)
+
+    def _load(self, key: str) -> CachedResult | None:
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                return pickle.load(f)  # noqa: S301 - trusted local directory
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _is_invalidated(self, entry: CachedResult) -> bool:
+        for table in entry.tables:
+            try:
+                with open(self._marker_path(table), "rb") as f:
+                    invalidated_at = float(f.read())
+            except (OSError, ValueError):
+                continue
+            if invalidated_at >= entry.created_at:
+                return True
+        return False
+
+    def _write(self, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            self._unlink(tmp)
+            raise
+
+    def _evict(self) -> None:
+        files = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".pickle"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def invalidate_result_cache(bind: Engine | Connection, *tables: str) -> None:
+    """Drop cached results reading ``tables`` (all of them when none are given).
+
+    Table names are matched as Snowflake resolves them: unquoted names are
+    case-insensitive, so pass ``"orders"`` or ``'"MixedCase"'``.
+    """
+    cache: ResultCache = bind.dialect._result_cache  # type: ignore[attr-defined]
+    if tables:
+        cache.invalidate(_table_name(table) for table in tables)
+    else:
+        cache.clear()
+
+
+def _cache_key(context: SnowflakeExecutionContext) -> str:
+    driver = getattr(
+        context._dbapi_connection, "driver_connection", context._dbapi_connection
+    )
+    options = context.execution_options
+    parameters = context.parameters[0] if context.parameters else None
+    if isinstance(parameters, dict):
+        parameters = sorted(parameters.items())
+    parts = (
+        context.statement,
+        parameters,
+        [
+            getattr(driver, name, None)
+            for name in ("account", "user", "role", "warehouse", "database", "schema")
+        ],
+        sorted((options.get("session_parameters") or {}).items()),
+        options.get("warehouse"),
+    )
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _lookup(context: SnowflakeExecutionContext) -> None:
+    """Look the statement up when it asked for ``result_cache_ttl``."""
+    options = context.execution_options
+    ttl = options.get(RESULT_CACHE_TTL_OPTION)
+    if (
+        not ttl
+        or context.executemany
+        or options.get("async_submit")
+        or options.get("stream_results")
+        or not context._is_read_only()
+    ):
+        return
+    tables = _read_tables(context.statement)
+    if tables is None:
+        # Its entry could not be invalidated by writes to what it reads.
+        return
+    if tables & _pending_writes(context):
+        # Uncommitted writes of this connection: not for the shared cache.
+        return
+    key = _cache_key(context)
+    context._result_cache_key = key
+    context._cached_result = context.dialect._result_cache.get(key)  # type: ignore[attr-defined]
+
+
+def _buffer(context: SnowflakeExecutionContext) -> CachedResult | None:
+    """Freeze the rows of a statement just executed, when it is to be shared.
+
+    That is when it uses ``result_cache_ttl`` (the rows are stored) or leads a
+    ``single_flight`` execution.  The result is then built from the frozen
+    rows.
+    """
+    key = context._result_cache_key
+    if key is None and context._flight is None:
+        return None
+    description = context.cursor.description
+    if description is None:
+        return None
+    entry = CachedResult(
+        description,
+        context.cursor.fetchall(),
+        _read_tables(context.statement) or frozenset(),
+        float(context.execution_options.get(RESULT_CACHE_TTL_OPTION) or 0),
+        getattr(context.cursor, "sfqid", None),
+    )
+    if key is not None:
+        context.dialect._result_cache.set(key, entry)  # type: ignore[attr-defined]
+    context._cached_result = entry
+    return entry
+
+
+def _invalidate_written(context: SnowflakeExecutionContext) -> None:
+    """Drop entries reading the table a DML / DDL statement wrote."""
+    tables = _written_tables(context.statement)
+    if not tables:
+        return
+    context.dialect._result_cache.invalidate(tables)  # type: ignore[attr-defined]
+    if _connection_autocommit(context._dbapi_connection):
+        return
+    driver = getattr(
+        context._dbapi_connection, "driver_connection", context._dbapi_connection
+    )
+    pending = getattr(driver, _PENDING_INVALIDATIONS, None)
+    if pending is None:
+        pending = set()
+        setattr(driver, _PENDING_INVALIDATIONS, pending)
+    pending.update(tables)
+
+
+def _pending_writes(context: SnowflakeExecutionContext) -> set[str]:
+    """Tables the connection wrote in its open transaction."""
+    driver = getattr(
+        context._dbapi_connection, "driver_connection", context._dbapi_connection
+    )
+    return getattr(driver, _PENDING_INVALIDATIONS, None) or set()
+
+
+def _end_transaction(dialect: Any, dbapi_connection: Any) -> None:
+    """Invalidate what the transaction wrote again, now it is settled."""
+    driver = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    pending = getattr(driver, _PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    # Readers the statement parser could not tie to the written tables may
+    # have cached rows between the write and the COMMIT / ROLLBACK.
+    dialect._result_cache.invalidate(pending)
+    pending.clear()
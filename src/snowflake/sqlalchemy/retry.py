@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Retrying idempotent statements after transient errors.
+
+With a :class:`RetryPolicy` on the engine, a statement that fails with a
+transient error (a request that timed out or got a 5xx / 429 answer after the
+connector's own retries, or a connection-class SQLSTATE) is sent again, after
+an exponential backoff with full jitter, up to ``max_attempts`` times::
+
+    policy = RetryPolicy(max_attempts=4)
+    engine = create_engine(url, retry_policy=policy)
+    ...
+    policy.retries, policy.recovered, policy.exhausted
+
+Only idempotent statements are retried: reads by default, and any statement
+executed with ``execution_options(idempotent=True)``; ``idempotent=False``
+turns retries off for a read.  The statement runs again on the same session,
+which, being token based, survives transport errors.  Errors that mean the
+session is gone (``SnowflakeDialect.is_disconnect``) are not retried: the
+transaction went with it, so SQLAlchemy invalidates the connection as usual.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Collection
+from typing import TYPE_CHECKING
+
+from sqlalchemy.util import await_only
+
+from ._constants import DISCONNECT_ERROR_CODES
+from .batching import BATCH_OPTION
+
+if TYPE_CHECKING:
+    from .base import SnowflakeExecutionContext
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_OPTION = "idempotent"
+
+#: Connector error numbers of transient failures.
+DEFAULT_RETRYABLE_ERRNOS = frozenset(
+    {
+        250003,  # failed to get the response (ER_FAILED_TO_REQUEST)
+        251011,  # request timed out (ER_CONNECTION_TIMEOUT)
+        251012,  # retryable HTTP code after the connector's retries
+        290408,  # HTTP 408
+        290429,  # HTTP 429
+        290500,  # HTTP 500
+        290502,  # HTTP 502
+        290503,  # HTTP 503
+        290504,  # HTTP 504
+    }
+)
+#: SQLSTATEs of transient failures: the connection exception class.
+DEFAULT_RETRYABLE_SQLSTATES = frozenset({"08001", "08003", "08004", "08006", "08S01"})
+
+
+class RetryPolicy:
+    """When and how often to retry idempotent statements.
+
+    Attempt ``n`` (from 1) that fails with a retryable error is followed,
+    after a random delay of up to ``min(max_delay, base_delay * 2 ** (n - 1))``
+    seconds, by attempt ``n + 1``, until ``max_attempts``.  The counters are
+    shared by every connection of the engines using the policy.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        retryable_errnos: Collection[int] = DEFAULT_RETRYABLE_ERRNOS,
+        retryable_sqlstates: Collection[str] = DEFAULT_RETRYABLE_SQLSTATES,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1; got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_errnos = frozenset(retryable_errnos)
+        self.retryable_sqlstates = frozenset(retryable_sqlstates)
+        self._lock = threading.Lock()
+        #: Attempts made after a transient error.
+        self.retries = 0
+        #: Statements that succeeded after at least one retry.
+        self.recovered = 0
+        #: Statements that still failed after ``max_attempts`` attempts.
+        self.exhausted = 0
+        #: Retries by error number (or SQLSTATE for errors without one).
+        self.errors: collections.Counter[int | str] = collections.Counter()
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether ``error`` is transient, according to this policy."""
+        errno = getattr(error, "errno", None)
+        if errno in DISCONNECT_ERROR_CODES:
+            return False
+        if errno in self.retryable_errnos:
+            return True
+        return getattr(error, "sqlstate", None) in self.retryable_sqlstates
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt ``attempt``."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _run(self, execute: Callable[[], None], is_async: bool = False) -> None:
+        attempt = 1
+        while True:
+            try:
+                execute()
+            except Exception as e:
+                if not self.is_retryable(e):
+                    raise
+                if attempt >= self.max_attempts:
+                    with self._lock:
+                        self.exhausted += 1
+                    raise
+                delay = self.delay(attempt)
+                with self._lock:
+                    self.retries += 1
+                    self.errors[getattr(e, "errno", None) or e.sqlstate] += 1  # type: ignore[attr-defined]
+                logger.debug(
+                    "Retrying after attempt %d failed: %s: %s",
+                    attempt,
+                    type(e).__name__,
+                    str(e),
+                )
+                if is_async:
+                    await_only(asyncio.sleep(delay))
+                else:
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            if attempt > 1:
+                with self._lock:
+                    self.recovered += 1
+            return
+
+
+def _retry_policy(context: SnowflakeExecutionContext) -> RetryPolicy | None:
+    """The policy to execute ``context`` with, if it may be retried."""
+    policy: RetryPolicy | None = getattr(context.dialect, "_retry_policy", None)
+    if policy is None:
+        return None
+    options = context.execution_options
+    if options.get("async_submit") or options.get(BATCH_OPTION) is not None:
+        return None
+    idempotent = options.get(IDEMPOTENT_OPTION)
+    if idempotent is None:
+        idempotent = context._is_read_only()
+    return policy if idempotent else None
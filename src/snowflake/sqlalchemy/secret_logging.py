@@ -20,6 +20,8 @@ statements; it masks the secret values while leaving the rest of the statement
 intact.
 """
 
+from __future__ import annotations
+
 import logging
 import re
 
@@ -41,17 +43,52 @@ _SECRET_LITERAL_RE = re.compile(
 )
 
 
-def redact_secrets(text: str) -> str:
+# Cheap substring scan run before the regex: every secret key starts with one
+# of these prefixes (``AWS_``, ``AZURE_``, ``MASTER_``), so text containing none
+# of them, which is nearly every statement, skips the regex entirely.
+_SECRET_KEY_PREFIXES = tuple(
+    sorted({"".join(k.partition("_")[:2]) for k in SECRET_OPTION_KEYS})
+)
+
+# A secret literal cut open by truncation: the key and the start of the value
+# up to the end of the text.
+_TRUNCATED_SECRET_LITERAL_RE = re.compile(
+    r"(?P<key>(?:%s))(?P<sep>\s*=\s*)'(?:''|\\.|[^'\\])*\\?\Z"
+    % "|".join(re.escape(k) for k in sorted(SECRET_OPTION_KEYS))
+)
+
+
+def _may_contain_secret(text: str) -> bool:
+    return any(prefix in text for prefix in _SECRET_KEY_PREFIXES)
+
+
+def redact_secrets(text: str, max_length: int | None = None) -> str:
     """Replace secret option literals in ``text`` with ``KEY='***'``.
 
     Only the values of :data:`SECRET_OPTION_KEYS` are masked; structural options
     (``TYPE``, ``AWS_ROLE``, ``KMS_KEY_ID``, ...) and the rest of the statement
     are left untouched.  Safe to call on any string; non-matching text is
     returned unchanged.
+
+    When ``max_length`` is given, longer text is first cut to that many
+    characters and a ``... [N characters truncated]`` marker is appended; a
+    secret value cut open by the truncation is masked as well.
     """
-    return _SECRET_LITERAL_RE.sub(
-        lambda m: f"{m.group('key')}{m.group('sep')}'{REDACTED_SECRET}'", text
-    )
+    truncated = 0
+    if max_length is not None and len(text) > max_length:
+        truncated = len(text) - max_length
+        text = text[:max_length]
+    if _may_contain_secret(text):
+        text = _SECRET_LITERAL_RE.sub(_mask, text)
+        if truncated:
+            text = _TRUNCATED_SECRET_LITERAL_RE.sub(_mask, text)
+    if truncated:
+        text = f"{text}... [{truncated} characters truncated]"
+    return text
+
+
+def _mask(m: re.Match[str]) -> str:
+    return f"{m.group('key')}{m.group('sep')}'{REDACTED_SECRET}'"
 
 
 class SnowflakeSecretRedactionFilter(logging.Filter):
@@ -59,39 +96,57 @@ class SnowflakeSecretRedactionFilter(logging.Filter):
 
     Attach to the handler (preferred) or logger that emits SQLAlchemy engine
     statements.  Never drops records (always returns ``True``); it only rewrites
-    the message and string arguments in place.
+    the message and string arguments in place.  Arguments that are not strings,
+    such as the parameter sets SQLAlchemy logs (already abbreviated by the
+    engine), cannot carry an inline ``KEY='...'`` literal and are left alone.
+
+    ``max_length`` caps the message and each string argument, see
+    :func:`redact_secrets`.
     """
 
+    def __init__(self, name: str = "", max_length: int | None = None) -> None:
+        super().__init__(name)
+        self.max_length = max_length
+
     def filter(self, record: logging.LogRecord) -> bool:
         if isinstance(record.msg, str):
-            record.msg = redact_secrets(record.msg)
+            record.msg = redact_secrets(record.msg, self.max_length)
         if record.args:
             if isinstance(record.args, dict):
-                record.args = {
-                    k: (redact_secrets(v) if isinstance(v, str) else v)
-                    for k, v in record.args.items()
-                }
-            else:
-                record.args = tuple(
-                    redact_secrets(a) if isinstance(a, str) else a for a in record.args
-                )
+                if any(self._rewrites(v) for v in record.args.values()):
+                    record.args = {
+                        k: self._redact_arg(v) for k, v in record.args.items()
+                    }
+            elif any(self._rewrites(a) for a in record.args):
+                record.args = tuple(self._redact_arg(a) for a in record.args)
         return True
 
+    def _rewrites(self, arg: object) -> bool:
+        if not isinstance(arg, str):
+            return False
+        if self.max_length is not None and len(arg) > self.max_length:
+            return True
+        return _may_contain_secret(arg)
+
+    def _redact_arg(self, arg: object) -> object:
+        return redact_secrets(arg, self.max_length) if isinstance(arg, str) else arg
+
 
-def add_secret_redaction_filter(target):
+def add_secret_redaction_filter(target, max_length: int | None = None):
     """Attach a :class:`SnowflakeSecretRedactionFilter` to ``target``.
 
     ``target`` may be a :class:`logging.Logger` or a :class:`logging.Handler`.
     Attaching to the handler is the reliable choice: filters on an ancestor
     logger are not re-applied to records that merely propagate up to it, whereas
-    handler filters run on every record the handler emits.  Returns the filter
-    instance so it can later be removed with ``target.removeFilter(...)``.
+    handler filters run on every record the handler emits.  ``max_length``
+    caps the length of each logged statement.  Returns the filter instance so
+    it can later be removed with ``target.removeFilter(...)``.
     """
     if not isinstance(target, (logging.Logger, logging.Handler)):
         raise TypeError(
             "target must be a logging.Logger or logging.Handler, "
             f"got {type(target).__name__}"
         )
-    redaction_filter = SnowflakeSecretRedactionFilter()
+    redaction_filter = SnowflakeSecretRedactionFilter(max_length=max_length)
     target.addFilter(redaction_filter)
     return redaction_filter
@@ -0,0 +1,199 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Session parameters and warehouse set per execution, sent only when changed.
+
+The ``session_parameters`` and ``warehouse`` execution options make a statement
+run with the given session parameters and warehouse::
+
+    conn = conn.execution_options(
+        session_parameters={"QUERY_TAG": tenant, "TIMEZONE": "UTC"},
+        warehouse="REPORTING_WH",
+    )
+
+Each DBAPI connection remembers the values it was last given, so a pooled
+connection that already has them costs no round trip; otherwise the changed
+parameters are sent in one ``ALTER SESSION SET a = ..., b = ...`` (and a
+``USE WAREHOUSE``) right before the statement.  A ``None`` value unsets the
+parameter.
+
+Session parameters are not transactional in Snowflake, so the remembered state
+survives ``ROLLBACK``.  It is forgotten when the connection is invalidated
+(the replacement connection starts empty), when sending it fails, and when the
+application runs its own ``ALTER SESSION`` or ``USE`` statement.
+
+Values do not leak from one checkout to the next.  When the connection is
+returned to the pool, the first statement of its next checkout unsets the
+parameters that checkout does not ask for and switches back to the warehouse
+the connection was opened with; values it asks for again are left alone, so
+a pool serving one set of options still sends them once per connection.  A
+connection whose session can't be restored that way (its state was forgotten,
+or it had no warehouse before the switch) is recycled instead of reused.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc as sa_exc
+
+from .util import escape_string_literal_interior
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine.interfaces import DBAPICursor
+
+    from .base import SnowflakeExecutionContext
+
+SESSION_PARAMETERS_OPTION = "session_parameters"
+WAREHOUSE_OPTION = "warehouse"
+
+_STATE = "_sqlalchemy_session_state"
+# Set on check-in; the next execution restores the session first.
+_RELEASED = "_sqlalchemy_session_released"
+# Set when applied values were forgotten, so they can't be restored.
+_UNKNOWN = "_sqlalchemy_session_unknown"
+# Warehouse the connection had before the first ``USE WAREHOUSE``.
+_ORIGINAL_WAREHOUSE = "_sqlalchemy_original_warehouse"
+# State key of the current warehouse; never a valid parameter name.
+_WAREHOUSE_KEY = "USE WAREHOUSE"
+
+_PARAMETER_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SESSION_CHANGING_RE = re.compile(r"\s*(?:ALTER\s+SESSION|USE)\b", re.I)
+
+
+def get_session_state(dbapi_connection: Any) -> dict[str, str | None]:
+    """Return what the connection is known to have been set to.
+
+    Keys are upper-case parameter names (``None`` for unset parameters) and
+    ``"USE WAREHOUSE"`` for the warehouse.
+    """
+    return dict(getattr(_driver(dbapi_connection), _STATE, None) or {})
+
+
+def reset_session_state(dbapi_connection: Any) -> None:
+    """Forget the remembered state, so the next execution sends it again."""
+    driver = _driver(dbapi_connection)
+    _forget(driver, getattr(driver, _STATE, None))
+
+
+def _driver(dbapi_connection: Any) -> Any:
+    return getattr(dbapi_connection, "driver_connection", dbapi_connection)
+
+
+def _forget(driver: Any, state: dict[str, str | None] | None) -> None:
+    if state:
+        state.clear()
+        setattr(driver, _UNKNOWN, True)
+
+
+def _release_session_state(dbapi_connection: Any, connection_record: Any) -> None:
+    """Pool ``checkin`` listener: have the next checkout restore the session."""
+    if dbapi_connection is None:
+        return
+    driver = _driver(dbapi_connection)
+    state = getattr(driver, _STATE, None)
+    if getattr(driver, _UNKNOWN, False) or (
+        state
+        and _WAREHOUSE_KEY in state
+        and getattr(driver, _ORIGINAL_WAREHOUSE, None) is None
+    ):
+        # Snowflake has no way back to "no warehouse".
+        connection_record.invalidate(soft=True)
+    elif state:
+        setattr(driver, _RELEASED, True)
+
+
+def _sync_session_state(
+    cursor: DBAPICursor, statement: str, context: SnowflakeExecutionContext
+) -> None:
+    """Bring the session in line with the execution options before ``statement``."""
+    options = context.execution_options
+    parameters = options.get(SESSION_PARAMETERS_OPTION)
+    warehouse = options.get(WAREHOUSE_OPTION)
+    driver = _driver(context._dbapi_connection)
+    released = getattr(driver, _RELEASED, False)
+    if released:
+        setattr(driver, _RELEASED, False)
+    if parameters or warehouse is not None or released:
+        _apply(cursor, context, driver, parameters or {}, warehouse, released)
+    state = getattr(driver, _STATE, None)
+    if state and _SESSION_CHANGING_RE.match(statement):
+        # The application changes the session itself.
+        _forget(driver, state)
+
+
+def _apply(
+    cursor: DBAPICursor,
+    context: SnowflakeExecutionContext,
+    driver: Any,
+    parameters: dict[str, Any],
+    warehouse: str | None,
+    restore: bool = False,
+) -> None:
+    state: dict[str, str | None] | None = getattr(driver, _STATE, None)
+    if state is None:
+        state = {}
+        setattr(driver, _STATE, state)
+
+    requested = set()
+    changes: dict[str, str | None] = {}
+    for name, value in parameters.items():
+        if not _PARAMETER_NAME_RE.match(name):
+            raise sa_exc.ArgumentError(f"Invalid session parameter name: {name!r}")
+        key = name.upper()
+        requested.add(key)
+        rendered = None if value is None else _render_value(value)
+        if key not in state or state[key] != rendered:
+            changes[key] = rendered
+    if restore:
+        # Undo what the previous checkout set and this one doesn't ask for.
+        for key, value in state.items():
+            if value is not None and key not in requested and key != _WAREHOUSE_KEY:
+                changes[key] = None
+        if warehouse is None and _WAREHOUSE_KEY in state:
+            warehouse = getattr(driver, _ORIGINAL_WAREHOUSE, None)
+    if warehouse is not None and state.get(_WAREHOUSE_KEY) != warehouse:
+        if not hasattr(driver, _ORIGINAL_WAREHOUSE):
+            setattr(driver, _ORIGINAL_WAREHOUSE, getattr(driver, "warehouse", None))
+        changes[_WAREHOUSE_KEY] = warehouse
+    if not changes:
+        return
+
+    statements = []
+    assignments = [
+        f"{key} = {value}"
+        for key, value in changes.items()
+        if value is not None and key != _WAREHOUSE_KEY
+    ]
+    if assignments:
+        statements.append(f"ALTER SESSION SET {', '.join(assignments)}")
+    unset = [key for key, value in changes.items() if value is None]
+    if unset:
+        statements.append(f"ALTER SESSION UNSET {', '.join(unset)}")
+    if _WAREHOUSE_KEY in changes:
+        quoted = context.identifier_preparer.quote(warehouse)
+        statements.append(f"USE WAREHOUSE {quoted}")
+
+    try:
+        if len(statements) == 1 or context.dialect.is_async:
+            for sql in statements:
+                cursor.execute(sql)
+        else:
+            cursor.execute(";\n".join(statements), num_statements=len(statements))  # type: ignore[call-arg]
+    except BaseException:
+        # Part of it may have been applied.
+        state.clear()
+        setattr(driver, _UNKNOWN, True)
+        raise
+    state.update(changes)
+    if _WAREHOUSE_KEY in changes:
+        context.dialect.warehouse_switches += 1  # type: ignore[attr-defined]
+
+
+def _render_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return f"'{escape_string_literal_interior(str(value))}'"
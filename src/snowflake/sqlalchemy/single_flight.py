@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Coalescing of identical concurrent reads.
+
+With the ``single_flight`` execution option, a read that is already running
+on another connection of the same engine (same SQL, parameters and session
+context, keyed like ``result_cache_ttl``) is not sent again: the later
+executions wait for the running one and get a copy of its buffered rows::
+
+    stmt = select(report).execution_options(single_flight=True)
+
+Only read-only statements are coalesced, and only on connections without
+uncommitted writes (those see rows the others can't).  When the running
+execution fails, the waiting ones run the statement themselves.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from sqlalchemy import exc as sa_exc
+
+from .result_cache import CachedResult, _cache_key, _pending_writes
+
+if TYPE_CHECKING:
+    from .base import SnowflakeExecutionContext
+
+SINGLE_FLIGHT_OPTION = "single_flight"
+
+
+class _Flight:
+    __slots__ = ("done", "entry", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.entry: CachedResult | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """The executions in flight for one engine (``dialect._single_flight``)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        #: Executions served by another execution's result.
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _join(self, key: str) -> tuple[_Flight, bool]:
+        """Return the flight for ``key`` and whether the caller leads it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _finish(self, key: str, flight: _Flight, entry: CachedResult | None) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if flight.done.is_set():
+                return
+            flight.entry = entry
+            if entry is not None:
+                self.coalesced += flight.waiters
+            flight.done.set()
+
+
+def _join_flight(context: SnowflakeExecutionContext) -> bool:
+    """Join an identical execution in flight; ``True`` when it served this one.
+
+    Otherwise the caller runs the statement, leading a new flight when the
+    statement asked for coalescing.
+    """
+    options = context.execution_options
+    if (
+        not options.get(SINGLE_FLIGHT_OPTION)
+        or context.executemany
+        or options.get("async_submit")
+        or options.get("stream_results")
+        or not context._is_read_only()
+        or _pending_writes(context)
+    ):
+        return False
+    if context.dialect.is_async:
+        raise sa_exc.ArgumentError(
+            f"{SINGLE_FLIGHT_OPTION} is not supported by the asyncio dialect"
+        )
+    registry: SingleFlight = context.dialect._single_flight  # type: ignore[attr-defined]
+    key = _cache_key(context)
+    flight, leader = registry._join(key)
+    if not leader:
+        flight.done.wait()
+        if flight.entry is None:
+            # The leading execution failed; run it here instead.
+            return False
+        context._cached_result = flight.entry
+        return True
+    context._flight = (registry, key, flight)
+    return False
+
+
+def _finish_flight(
+    context: SnowflakeExecutionContext, entry: CachedResult | None
+) -> None:
+    """Hand ``entry`` (``None`` on failure) to the executions waiting on this one."""
+    if context._flight is None:
+        return
+    registry, key, flight = context._flight
+    context._flight = None
+    registry._finish(key, flight, entry)
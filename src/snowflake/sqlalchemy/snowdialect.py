@@ -5,18 +5,23 @@ from __future__ import annotations
 
 import decimal
 import logging
+import re
 import warnings
 from collections import defaultdict
-from collections.abc import Collection, Sequence
+from collections.abc import Callable, Collection, Iterator, Sequence
 from enum import Enum
 from logging import getLogger
-from typing import TYPE_CHECKING, Any, NamedTuple, cast
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, cast
 
 if TYPE_CHECKING:
+    from snowflake.connector.connection import SnowflakeConnection
+
     from sqlalchemy.engine import CursorResult, Row
     from sqlalchemy.engine.interfaces import (
         DBAPIConnection,
+        DBAPICursor,
         DBAPIModule,
+        ExecutionContext,
         ReflectedCheckConstraint,
         ReflectedColumn,
         ReflectedForeignKeyConstraint,
@@ -24,12 +29,9 @@ if TYPE_CHECKING:
         ReflectedTableComment,
     )
 
-from urllib.parse import unquote_plus
+    from .instrumentation import StatementSink
 
-from snowflake.connector import errors as sf_errors
-from snowflake.connector.connection import DEFAULT_CONFIGURATION, SnowflakeConnection
-from snowflake.connector.constants import UTF8
-from snowflake.connector.util_text import parse_account
+from urllib.parse import unquote_plus
 
 import sqlalchemy.sql.sqltypes as sqltypes
 from snowflake.sqlalchemy.name_utils import _NameUtils
@@ -44,12 +46,15 @@ from sqlalchemy.engine.interfaces import (
 )
 from sqlalchemy.schema import Table
 from sqlalchemy.sql import text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.sql.sqltypes import NullType
 from sqlalchemy.types import FLOAT, Date, DateTime, Float, Time
 
+from . import _initialization_cache
 from ._constants import (
     DIALECT_NAME,
     DISCONNECT_ERROR_CODES,
+    SHOW_PROJECTION_UNSUPPORTED_ERROR_CODES,
 )
 from .base import (
     SnowflakeCompiler,
@@ -58,6 +63,8 @@ from .base import (
     SnowflakeIdentifierPreparer,
     SnowflakeTypeCompiler,
 )
+from .batching import BATCH_OPTION
+from .cancellation import _cancel_on_dispose, _RunningStatements
 from .custom_types import (
     DECFLOAT_PRECISION,
     VECTOR,
@@ -67,6 +74,8 @@ from .custom_types import (
     _CUSTOM_Float,
     _CUSTOM_Time,
 )
+from .inspector import ReflectedTableStats, SnowflakeInspector
+from .operator_stats import _operator_stats_executor, _shutdown_operator_stats
 from .parser.custom_type_parser import *  # noqa
 from .parser.custom_type_parser import (
     _CUSTOM_DECIMAL,  # noqa
@@ -74,9 +83,19 @@ from .parser.custom_type_parser import (
     parse_index_columns,
     parse_type,
 )
+from .result_cache import MemoryResultCache, ResultCache, _buffer
+from .result_cache import _end_transaction as _result_cache_end_transaction
+from .retry import RetryPolicy, _retry_policy
+from .session_state import _release_session_state, _sync_session_state
+from .single_flight import SingleFlight, _finish_flight, _join_flight
 from .sql.custom_schema.custom_table_prefix import CustomTablePrefix
 from .util import (
     _URL_QUERY_BLOCKED_KWARGS,
+    _connection_idle_seconds,
+    _connection_transaction_dirty,
+    _mark_connection_used,
+    _set_connection_autocommit,
+    _set_connection_transaction_dirty,
     _update_connection_application_name,
     escape_string_literal_interior,
     parse_url_boolean,
@@ -99,16 +118,23 @@ _ENABLE_SQLALCHEMY_AS_APPLICATION_NAME = True
 logger = getLogger(__name__)
 
 
-# ``TelemetryEvents`` now lives in the ``_telemetry`` package; re-export it
-# here so existing imports (and tests) that reference it via ``snowdialect``
-# keep working.  ``TelemetryField`` is re-exported for tests that build or
-# inspect connector ``TelemetryData`` in mocks.
-from snowflake.sqlalchemy._telemetry import TelemetryEvents  # noqa: E402,F401
+def __getattr__(name: str) -> Any:
+    # ``TelemetryEvents`` now lives in the ``_telemetry`` package; re-export it
+    # here so existing imports (and tests) that reference it via ``snowdialect``
+    # keep working.  ``TelemetryField`` is re-exported for tests that build or
+    # inspect connector ``TelemetryData`` in mocks.  Both are resolved on first
+    # access so importing the dialect does not load telemetry or the connector.
+    if name == "TelemetryEvents":
+        from ._telemetry import TelemetryEvents
 
-try:  # noqa: E402
-    from snowflake.connector.telemetry import TelemetryField  # noqa: F401
-except Exception:  # pragma: no cover - connector without a telemetry module
-    TelemetryField = None  # type: ignore[assignment,misc]
+        return TelemetryEvents
+    if name == "TelemetryField":
+        try:
+            from snowflake.connector.telemetry import TelemetryField
+        except Exception:  # pragma: no cover - connector without telemetry
+            return None
+        return TelemetryField
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SnowflakeIsolationLevel(Enum):
@@ -134,7 +160,7 @@ class _RedactionHandler(logging.Handler):
         pass
 
 
-def _ensure_engine_log_redaction() -> None:
+def _ensure_engine_log_redaction(max_length: int | None = None) -> None:
     """Attach a SnowflakeSecretRedactionFilter to the SQLAlchemy engine logger.
 
     Inserts a _RedactionHandler at position 0 on the shared
@@ -143,22 +169,53 @@ def _ensure_engine_log_redaction() -> None:
     handler's filters which rewrite ``record.msg`` in-place before any real
     handler (StreamHandler, FileHandler, …) emits the record.  Idempotent:
     calling multiple times (e.g. from several engines) adds the handler only
-    once.
+    once.  ``max_length``, when given, caps logged statements for every engine
+    sharing the logger.
     """
     from .secret_logging import SnowflakeSecretRedactionFilter
 
     parent = getLogger("sqlalchemy.engine.Engine")
-    if any(
-        isinstance(h, _RedactionHandler)
-        and any(isinstance(f, SnowflakeSecretRedactionFilter) for f in h.filters)
+    existing = [
+        f
         for h in parent.handlers
-    ):
+        if isinstance(h, _RedactionHandler)
+        for f in h.filters
+        if isinstance(f, SnowflakeSecretRedactionFilter)
+    ]
+    if existing:
+        if max_length is not None:
+            for f in existing:
+                f.max_length = max_length
         return
     h = _RedactionHandler()
-    h.addFilter(SnowflakeSecretRedactionFilter())
+    h.addFilter(SnowflakeSecretRedactionFilter(max_length=max_length))
     parent.handlers.insert(0, h)
 
 
+# ``SHOW TABLES`` output columns read by ``_get_schema_tables_info``: the
+# object name, the ``is_*`` flags that ``get_prefixes_from_data`` maps onto
+# ``CustomTablePrefix`` (DEFAULT has no flag column) and the columns behind
+# ``get_table_stats``.
+_SHOW_TABLES_STATS_COLUMNS = (
+    "kind",
+    "rows",
+    "bytes",
+    "cluster_by",
+    "automatic_clustering",
+)
+_SHOW_TABLES_INFO_COLUMNS = (
+    "name",
+    *(
+        f"is_{prefix.name.lower()}"
+        for prefix in CustomTablePrefix
+        if prefix is not CustomTablePrefix.DEFAULT
+    ),
+    *_SHOW_TABLES_STATS_COLUMNS,
+)
+
+# A clustering key expression that is a bare (unquoted) column name.
+_SIMPLE_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
 _README_URL = "https://github.com/snowflakedb/snowflake-sqlalchemy/blob/main/README.md"
 
 _LEGACY_URL_PARAMS_REMOVED_MSG = (
@@ -196,8 +253,10 @@ class SnowflakeDialect(default.DefaultDialect):
     # TODO: support SQL caching, for more info see: https://docs.sqlalchemy.org/en/14/core/connections.html#caching-for-third-party-dialects
     supports_statement_cache = False
 
-    encoding = UTF8
+    encoding = "utf-8"
     default_paramstyle = "pyformat"
+
+    inspector = SnowflakeInspector
     colspecs = colspecs
     ischema_names = ischema_names
 
@@ -280,6 +339,18 @@ class SnowflakeDialect(default.DefaultDialect):
         enable_structured_type_json: bool | None = None,
         case_sensitive_identifiers: bool = False,
         redact_log_secrets: bool = True,
+        redact_log_max_length: int | None = None,
+        enable_show_column_projection: bool = False,
+        enable_database_wide_reflection: bool = False,
+        initialization_cache_ttl: float | None = None,
+        initialization_cache_path: str | None = None,
+        elide_empty_transactions: bool = False,
+        ping_window: float | None = None,
+        statement_sink: StatementSink | None = None,
+        operator_stats_threshold: float | None = None,
+        statement_bytes_fetched: bool = False,
+        result_cache: ResultCache | None = None,
+        retry_policy: RetryPolicy | None = None,
         json_serializer: Any = None,
         json_deserializer: Any = None,
         **kwargs: Any,
@@ -328,12 +399,90 @@ class SnowflakeDialect(default.DefaultDialect):
         self._json_serializer = json_serializer
         self._json_deserializer = json_deserializer
         self._redact_log_secrets = redact_log_secrets
+        # Cap on the length of each statement written to the engine log.
+        self._redact_log_max_length = redact_log_max_length
+        # Project paged SHOW output down to the columns reflection reads (via
+        # the ``->>`` pipe operator) instead of transferring every column.
+        self._enable_show_column_projection = enable_show_column_projection
+        # Serve schema-wide constraint and column reflection from one
+        # ``IN DATABASE`` / database-level information_schema pass per database.
+        self._enable_database_wide_reflection = enable_database_wide_reflection
+        # Reuse the initialization probe across engines of this process (and
+        # across processes via ``initialization_cache_path``) for this long.
+        self._initialization_cache_ttl = initialization_cache_ttl
+        self._initialization_cache_path = initialization_cache_path
+        # Identity of the sessions this dialect opens, recorded by ``connect``.
+        self._initialization_cache_key: str | None = None
+        # ``(version, database, schema)`` row while ``initialize`` is running.
+        self._initialization_probe: Sequence[Any] | None = None
+        # ``(cparams without credentials, events)`` of the new-connection
+        # telemetry, as last built.
+        self._telemetry_events: tuple[dict, list] | None = None
+        # Skip COMMIT / ROLLBACK when no statement ran since the last one.
+        self._elide_empty_transactions = elide_empty_transactions
+        #: COMMIT / ROLLBACK round trips skipped by ``elide_empty_transactions``.
+        self.elided_transaction_round_trips = 0
+        # ``do_ping`` trusts a connection used successfully this recently.
+        self._ping_window = ping_window
+        #: ``pool_pre_ping`` round trips skipped thanks to ``ping_window``.
+        self.skipped_pings = 0
+        #: ``USE WAREHOUSE`` round trips sent for the ``warehouse`` option.
+        self.warehouse_switches = 0
+        # Receives a ``StatementTiming`` for every statement when set.
+        self._statement_sink = statement_sink
+        # Statements executing longer than this many seconds reach the sink
+        # with their operator statistics.
+        self._operator_stats_threshold = operator_stats_threshold
+        if operator_stats_threshold is not None and self.is_async:
+            raise sa_exc.ArgumentError(
+                "operator_stats_threshold is not supported by the asyncio dialect"
+            )
+        # Fetches those statistics off the request thread, one at a time;
+        # shut down when the engine is disposed.
+        self._operator_stats_executor = (
+            _operator_stats_executor() if operator_stats_threshold is not None else None
+        )
+        # Fill ``StatementTiming.bytes_fetched``; the connector logs a
+        # telemetry event for every ``get_result_batches`` call this makes.
+        self._statement_bytes_fetched = statement_bytes_fetched
+        # Backend of ``result_cache_ttl``.  Writes are tracked even before
+        # the first cached read, so it always exists.
+        self._result_cache = (
+            result_cache if result_cache is not None else MemoryResultCache()
+        )
+        # Reads running with ``single_flight``, for coalescing.
+        self._single_flight = SingleFlight()
+        # Statements executing on this engine's connections, cancelled
+        # server-side when they are abandoned.
+        self._running_statements = _RunningStatements()
+        # Retries idempotent statements after transient errors when set.
+        self._retry_policy = retry_policy
+
+    @classmethod
+    def engine_created(cls, engine: Any) -> None:
+        super().engine_created(engine)
+        sa_vnt.listen(engine, "engine_disposed", _cancel_on_dispose)
+        sa_vnt.listen(engine, "checkin", _release_session_state)
+        if engine.dialect._operator_stats_executor is not None:
+            sa_vnt.listen(engine, "engine_disposed", _shutdown_operator_stats)
+
+    @property
+    def coalesced_executions(self) -> int:
+        """Executions served by an identical ``single_flight`` execution."""
+        return self._single_flight.coalesced
 
     def initialize(self, connection: Connection) -> None:
-        super().initialize(connection)
+        # Fetch everything ``initialize`` needs in one round trip (or none,
+        # when cached); _get_server_version_info and _get_default_schema_name
+        # read from it instead of querying separately.
+        self._initialization_probe = self._probe_session(connection)
+        try:
+            super().initialize(connection)
+        finally:
+            self._initialization_probe = None
         self.div_is_floordiv = self.force_div_is_floordiv
         if self._redact_log_secrets:
-            _ensure_engine_log_redaction()
+            _ensure_engine_log_redaction(self._redact_log_max_length)
 
     def is_disconnect(
         self,
@@ -347,6 +496,8 @@ class SnowflakeDialect(default.DefaultDialect):
         which lets generic reconnect logic recover from expired sessions/tokens
         (e.g. "Authentication token has expired", "Session no longer exists").
         """
+        from snowflake.connector import errors as sf_errors
+
         if isinstance(e, sf_errors.Error) and e.errno in DISCONNECT_ERROR_CODES:
             return True
         return super().is_disconnect(e, connection, cursor)
@@ -366,6 +517,8 @@ class SnowflakeDialect(default.DefaultDialect):
         name: str, value: str | tuple[str, ...]
     ) -> str | int | bool | tuple[str, ...]:
         """Cast param value if possible to type defined in connector-python."""
+        from snowflake.connector.connection import DEFAULT_CONFIGURATION
+
         if not (maybe_type_configuration := DEFAULT_CONFIGURATION.get(name)):
             return value
 
@@ -408,6 +561,8 @@ class SnowflakeDialect(default.DefaultDialect):
             # re-implementing the rules here. This keeps dashes in org-style account
             # names (e.g. ``gnamsrm-vi65876``) intact and stays consistent with the
             # driver across all notations (SNOW-730644).
+            from snowflake.connector.util_text import parse_account
+
             opts["account"] = parse_account(opts["host"])
             opts["host"] = opts["host"] + ".snowflakecomputing.com"
             opts["port"] = "443"
@@ -441,6 +596,40 @@ class SnowflakeDialect(default.DefaultDialect):
                 case_sensitive_identifiers
             )
 
+        # Handle enable_show_column_projection URL parameter
+        enable_show_column_projection = query.pop("enable_show_column_projection", None)
+        if enable_show_column_projection is not None:
+            self._enable_show_column_projection = parse_url_boolean(
+                enable_show_column_projection
+            )
+
+        # Handle enable_database_wide_reflection URL parameter
+        enable_database_wide_reflection = query.pop(
+            "enable_database_wide_reflection", None
+        )
+        if enable_database_wide_reflection is not None:
+            self._enable_database_wide_reflection = parse_url_boolean(
+                enable_database_wide_reflection
+            )
+
+        # Handle elide_empty_transactions URL parameter
+        elide_empty_transactions = query.pop("elide_empty_transactions", None)
+        if elide_empty_transactions is not None:
+            self._elide_empty_transactions = parse_url_boolean(elide_empty_transactions)
+
+        # Handle ping_window URL parameter
+        ping_window = query.pop("ping_window", None)
+        if ping_window is not None:
+            self._ping_window = float(str(ping_window))
+
+        # Handle initialization_cache_ttl / initialization_cache_path URL parameters
+        initialization_cache_ttl = query.pop("initialization_cache_ttl", None)
+        if initialization_cache_ttl is not None:
+            self._initialization_cache_ttl = float(str(initialization_cache_ttl))
+        initialization_cache_path = query.pop("initialization_cache_path", None)
+        if initialization_cache_path is not None:
+            self._initialization_cache_path = str(initialization_cache_path)
+
         # URL sets the query parameter values as strings, we need to cast to
         # expected types when necessary.  Sensitive connector kwargs are never
         # accepted from the URL query string (the legacy_url_params opt-out shim
@@ -477,11 +666,130 @@ class SnowflakeDialect(default.DefaultDialect):
             SnowflakeIsolationLevel.AUTOCOMMIT.value,
         ]
 
+    def do_execute(
+        self,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None = None,
+    ) -> None:
+        if context is not None:
+            if getattr(context, "_cached_result", None) is not None:
+                # Served from ``result_cache_ttl``; nothing to send.
+                return
+            if _join_flight(context):  # type: ignore[arg-type]
+                # Served by an identical ``single_flight`` execution.
+                return
+            try:
+                connection = context._dbapi_connection  # type: ignore[attr-defined]
+                with self._running_statements._track(connection, cursor):
+                    policy = _retry_policy(context)  # type: ignore[arg-type]
+                    if policy is None:
+                        self._do_execute(cursor, statement, parameters, context)
+                    else:
+                        policy._run(
+                            lambda: self._do_execute(
+                                cursor, statement, parameters, context
+                            ),
+                            self.is_async,
+                        )
+                entry = _buffer(context)  # type: ignore[arg-type]
+            except BaseException:
+                _finish_flight(context, None)  # type: ignore[arg-type]
+                raise
+            _finish_flight(context, entry)  # type: ignore[arg-type]
+            return
+        cursor.execute(statement, parameters)
+
+    def _do_execute(
+        self,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+    ) -> None:
+        _sync_session_state(cursor, statement, context)  # type: ignore[arg-type]
+        batch = context.execution_options.get(BATCH_OPTION)
+        if batch is not None and batch._defer(cursor, statement, parameters, context):
+            return
+        kwargs = context._cursor_kwargs()  # type: ignore[attr-defined]
+        self._running_statements._sending(cursor)
+        if context.execution_options.get("async_submit"):
+            cursor.execute_async(statement, parameters, **kwargs)
+            return
+        cursor.execute(statement, parameters, **kwargs)
+
+    def do_execute_no_params(
+        self,
+        cursor: DBAPICursor,
+        statement: str,
+        context: ExecutionContext | None = None,
+    ) -> None:
+        self.do_execute(cursor, statement, None, context)
+
+    def do_executemany(
+        self,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None = None,
+    ) -> None:
+        if context is not None:
+            _sync_session_state(cursor, statement, context)  # type: ignore[arg-type]
+            batch = context.execution_options.get(BATCH_OPTION)
+            if batch is not None:
+                # Keep the order of execution: send what is pending first.
+                batch._flush(cursor, context)
+            kwargs = context._cursor_kwargs()  # type: ignore[attr-defined]
+            connection = context._dbapi_connection  # type: ignore[attr-defined]
+            with self._running_statements._track(connection, cursor):
+                cursor.executemany(statement, parameters, **kwargs)
+            return
+        cursor.executemany(statement, parameters)
+
     def do_rollback(self, dbapi_connection: DBAPIConnection) -> None:
-        dbapi_connection.rollback()
+        if self._elide_empty_transactions:
+            self._end_transaction(dbapi_connection, dbapi_connection.rollback)
+        else:
+            dbapi_connection.rollback()
+        _result_cache_end_transaction(self, dbapi_connection)
 
     def do_commit(self, dbapi_connection: DBAPIConnection) -> None:
-        dbapi_connection.commit()
+        if self._elide_empty_transactions:
+            self._end_transaction(dbapi_connection, dbapi_connection.commit)
+        else:
+            dbapi_connection.commit()
+        _result_cache_end_transaction(self, dbapi_connection)
+
+    def _end_transaction(
+        self, dbapi_connection: DBAPIConnection, end: Callable[[], None]
+    ) -> None:
+        # With no statement since the last COMMIT / ROLLBACK (recorded by
+        # ``SnowflakeExecutionContext.pre_exec``) there is no transaction for
+        # the server to end, e.g. on every pool check-in of a read-only request.
+        if not _connection_transaction_dirty(dbapi_connection):
+            self.elided_transaction_round_trips += 1
+            return
+        end()
+        _set_connection_transaction_dirty(dbapi_connection, False)
+
+    def do_ping(self, dbapi_connection: DBAPIConnection) -> bool:
+        if self._ping_window is None:
+            return super().do_ping(dbapi_connection)
+        driver_connection = getattr(
+            dbapi_connection, "driver_connection", dbapi_connection
+        )
+        if driver_connection.is_closed():
+            return False
+        idle = _connection_idle_seconds(dbapi_connection)
+        if idle is not None and idle < self._ping_window:
+            # A round trip succeeded moments ago; the session is as likely to
+            # be alive as a ``SELECT 1`` would prove.
+            self.skipped_pings += 1
+            return True
+        alive = super().do_ping(dbapi_connection)
+        _mark_connection_used(dbapi_connection)
+        return alive
 
     def get_default_isolation_level(self, dbapi_conn: Any) -> str:  # type: ignore[override]
         return SnowflakeIsolationLevel.READ_COMMITTED.value
@@ -489,10 +797,9 @@ class SnowflakeDialect(default.DefaultDialect):
     def set_isolation_level(
         self, dbapi_connection: DBAPIConnection, level: str
     ) -> None:
-        if level == SnowflakeIsolationLevel.AUTOCOMMIT.value:
-            dbapi_connection.autocommit(True)
-        else:
-            dbapi_connection.autocommit(False)
+        autocommit = level == SnowflakeIsolationLevel.AUTOCOMMIT.value
+        dbapi_connection.autocommit(autocommit)
+        _set_connection_autocommit(dbapi_connection, autocommit)
 
     @reflection.cache
     def has_sequence(
@@ -523,6 +830,8 @@ class SnowflakeDialect(default.DefaultDialect):
             have = row is not None
             return have
         except sa_exc.DBAPIError as e:
+            from snowflake.connector import errors as sf_errors
+
             if e.orig.__class__ == sf_errors.ProgrammingError:
                 return False
             raise
@@ -600,18 +909,46 @@ class SnowflakeDialect(default.DefaultDialect):
     def _current_database_schema(
         self, connection: Connection, **kw: Any
     ) -> tuple[str | None, str | None]:
-        res = connection.execute(
-            text("select current_database(), current_schema();")
-        ).fetchone()
+        if self._initialization_probe is not None:
+            # ``initialize`` already fetched them with the version.
+            res: Sequence[Any] | None = self._initialization_probe[1:]
+        else:
+            res = connection.execute(
+                text("select current_database(), current_schema();")
+            ).fetchone()
         return (
             self.normalize_name(res[0]),  # type: ignore[index]
             self.normalize_name(res[1]),  # type: ignore[index]
         )
 
+    def _probe_session(self, connection: Connection) -> Sequence[Any] | None:
+        """Return ``(CURRENT_VERSION(), CURRENT_DATABASE(), CURRENT_SCHEMA())``
+        from the initialization cache or a single query."""
+        ttl = self._initialization_cache_ttl or 0.0
+        key = self._initialization_cache_key if ttl > 0 else None
+        if key is not None:
+            cached = _initialization_cache.load(
+                key, ttl, self._initialization_cache_path
+            )
+            if cached is not None:
+                return cached
+        row = connection.execute(
+            text("SELECT CURRENT_VERSION(), CURRENT_DATABASE(), CURRENT_SCHEMA()")
+        ).fetchone()
+        if row is None or len(row) < 3:
+            return None
+        probe = list(row)
+        if key is not None:
+            _initialization_cache.store(key, probe, self._initialization_cache_path)
+        return probe
+
     def _get_server_version_info(self, connection: Connection) -> tuple[int, ...]:
         """Query and parse the Snowflake server version."""
-        result = connection.execute(text("SELECT CURRENT_VERSION()"))
-        version_row = result.fetchone()
+        if self._initialization_probe is not None:
+            version_row: Sequence[Any] | None = self._initialization_probe[:1]
+        else:
+            result = connection.execute(text("SELECT CURRENT_VERSION()"))
+            version_row = result.fetchone()
         if version_row is None or len(version_row) == 0:
             return None  # type: ignore[return-value]
         # Split in case <internal identifier> documented in http://docs.snowflake.com/en/sql-reference/functions/current_version is added
@@ -875,6 +1212,125 @@ class SnowflakeDialect(default.DefaultDialect):
             self._normalize_schema_target(self.default_schema_name, current_database),
         }
 
+    # ---------------------------------------------------------------------------
+    # Database-wide reflection
+    # ---------------------------------------------------------------------------
+
+    def _use_database_wide_reflection(self, kw: dict[str, Any]) -> bool:
+        """Database-wide passes only pay off when their result is cached, so
+        they are used only with ``enable_database_wide_reflection`` and an
+        ``info_cache`` (i.e. when called through an ``Inspector``)."""
+        return (
+            self._enable_database_wide_reflection and kw.get("info_cache") is not None
+        )
+
+    def _schema_partition_key(self, database: str, schema: str) -> str:
+        """Key a database-wide result by schema in the same ``"DB"."SCHEMA"``
+        form ``_get_full_schema_name`` produces, from the raw stored names."""
+        ip = self.identifier_preparer
+        return f"{ip.quote_identifier(database)}.{ip.quote_identifier(schema)}"
+
+    @reflection.cache
+    def _get_database_constraint_rows(
+        self, connection: Connection, kind: str, database: str, **kw: Any
+    ) -> dict[str, list[Any]] | Literal[False]:
+        """SHOW <kind> IN DATABASE — one pass for every schema of ``database``.
+
+        ``kind`` is ``PRIMARY KEYS``, ``UNIQUE KEYS`` or ``IMPORTED KEYS``.
+        Rows are partitioned by their (constrained-side) schema so the
+        per-schema ``_get_schema_*`` helpers can parse them exactly as they
+        parse ``SHOW ... IN SCHEMA`` output.  Returns False when the
+        database-wide command fails, e.g. on the SHOW row cap or a missing
+        privilege, so callers fall back to the per-schema commands; unlike
+        None, False is kept by ``reflection.cache``, so the failing command
+        runs once per database rather than once per schema.
+        """
+        schema_column = "fk_schema_name" if kind == "IMPORTED KEYS" else "schema_name"
+        try:
+            result = connection.execute(
+                text(
+                    f"SHOW /* sqlalchemy:_get_database_constraint_rows */ {kind} "
+                    f"IN DATABASE {self.identifier_preparer.quote_identifier(database)}"
+                )
+            )
+        except sa_exc.ProgrammingError:
+            logger.debug("Failed to reflect %s in database %s", kind, database)
+            return False
+        partitions: dict[str, list[Any]] = defaultdict(list)
+        for row in result:
+            key = self._schema_partition_key(database, row._mapping[schema_column])
+            partitions[key].append(row)
+        return dict(partitions)
+
+    def _get_database_rows_for_schema(
+        self, connection: Connection, kind: str, schema: str | None, kw: dict[str, Any]
+    ) -> list[Any] | None:
+        """This schema's share of ``_get_database_constraint_rows``, or None
+        when the per-schema ``SHOW ... IN SCHEMA`` path should be used."""
+        if not schema or not self._use_database_wide_reflection(kw):
+            return None
+        database, _ = self._db_plus_schema(schema)
+        if database is None:
+            return None
+        # Only info_cache is forwarded so every caller, whatever reflection
+        # kwargs it carries, shares one cache entry per database.
+        partitions = self._get_database_constraint_rows(
+            connection, kind, database, info_cache=kw["info_cache"]
+        )
+        if partitions is False:
+            return None
+        return partitions.get(schema, [])
+
+    @reflection.cache
+    def _get_database_columns_info(
+        self, connection: Connection, database: str, **kw: Any
+    ) -> dict[str, list[tuple[Any, ...]]] | Literal[False]:
+        """One database-level information_schema.columns query, partitioned by
+        schema into the row shape ``_get_schema_columns`` unpacks.
+
+        Returns False on Snowflake's information_schema result-size error
+        90030 so callers fall back to the per-schema query; False (unlike
+        None) is cached, so the database-wide query is not retried per schema.
+        """
+        info_schema_table = (
+            f"{self.identifier_preparer.quote(database)}.information_schema.columns"
+        )
+        try:
+            result = connection.execute(
+                text(
+                    f"""
+            SELECT /* sqlalchemy:_get_schema_columns */
+                   ic.table_schema,
+                   ic.table_name,
+                   ic.column_name,
+                   ic.data_type,
+                   ic.character_maximum_length,
+                   ic.numeric_precision,
+                   ic.numeric_scale,
+                   ic.is_nullable,
+                   ic.column_default,
+                   ic.is_identity,
+                   ic.comment,
+                   ic.identity_start,
+                   ic.identity_increment,
+                   ic.identity_generation,
+                   ic.identity_cycle,
+                   ic.identity_ordered,
+                   ic.data_type_alias
+              FROM {info_schema_table} ic
+             ORDER BY ic.ordinal_position"""
+                )
+            )
+        except sa_exc.ProgrammingError as pe:
+            if getattr(pe.orig, "errno", None) == 90030:
+                return False
+            raise
+        partitions: dict[str, list[tuple[Any, ...]]] = defaultdict(list)
+        for table_schema, *column_row in result:
+            key = self._schema_partition_key(database, table_schema)
+            partitions[key].append(tuple(column_row))
+        return dict(partitions)
+
     # ---------------------------------------------------------------------------
     # Primary key reflection
     # ---------------------------------------------------------------------------
@@ -908,9 +1364,17 @@ class SnowflakeDialect(default.DefaultDialect):
         """SHOW PRIMARY KEYS IN SCHEMA — schema-wide path for get_pk_constraint
         (SA 1.4) and get_multi_pk_constraint (SA 2.x).
 
+        With ``enable_database_wide_reflection`` the rows come from a single
+        cached ``SHOW PRIMARY KEYS IN DATABASE`` instead.
+
         Results are cached for the lifetime of a connection via @reflection.cache.
         DDL executed mid-session will not be reflected until a new connection is used.
         """
+        rows = self._get_database_rows_for_schema(
+            connection, "PRIMARY KEYS", schema, kw
+        )
+        if rows is not None:
+            return self._parse_pk_rows(rows)
         result = connection.execute(
             text(
                 f"SHOW /* sqlalchemy:_get_schema_primary_keys */ PRIMARY KEYS IN SCHEMA {schema}"
@@ -988,9 +1452,15 @@ class SnowflakeDialect(default.DefaultDialect):
         """SHOW UNIQUE KEYS IN SCHEMA — schema-wide path for get_unique_constraints
         (SA 1.4) and get_multi_unique_constraints (SA 2.x).
 
+        With ``enable_database_wide_reflection`` the rows come from a single
+        cached ``SHOW UNIQUE KEYS IN DATABASE`` instead.
+
         Results are cached for the lifetime of a connection via @reflection.cache.
         DDL executed mid-session will not be reflected until a new connection is used.
         """
+        rows = self._get_database_rows_for_schema(connection, "UNIQUE KEYS", schema, kw)
+        if rows is not None:
+            return self._parse_uk_rows(rows)
         result = connection.execute(
             text(
                 f"SHOW /* sqlalchemy:_get_schema_unique_constraints */ UNIQUE KEYS IN SCHEMA {schema}"
@@ -1087,6 +1557,10 @@ class SnowflakeDialect(default.DefaultDialect):
         the correct place and so user metadata that qualifies the target schema
         explicitly matches the reflected value.
 
+        With ``enable_database_wide_reflection`` the rows come from a single
+        cached ``SHOW IMPORTED KEYS IN DATABASE``; they are still parsed per
+        schema so the same-schema normalization above is unchanged.
+
         Results are cached for the lifetime of a connection via @reflection.cache.
         DDL executed mid-session will not be reflected until a new connection is used.
         """
@@ -1095,6 +1569,11 @@ class SnowflakeDialect(default.DefaultDialect):
             schema,  # type: ignore[arg-type]
             current_database,
         )
+        rows = self._get_database_rows_for_schema(
+            connection, "IMPORTED KEYS", schema, kw
+        )
+        if rows is not None:
+            return self._parse_fk_rows(rows, same_schemas)
         result = connection.execute(
             text(
                 f"SHOW /* sqlalchemy:_get_schema_foreign_keys */ IMPORTED KEYS IN SCHEMA {schema}"
@@ -1597,6 +2076,13 @@ class SnowflakeDialect(default.DefaultDialect):
                 f"Expected fully-qualified schema name 'database.schema', got '{schema_name}'"
             )
 
+        if self._use_database_wide_reflection(kw):
+            partitions = self._get_database_columns_info(
+                connection, database_raw, info_cache=kw["info_cache"]
+            )
+            if partitions is not False:
+                return partitions.get(schema_name, [])  # type: ignore[return-value]
+
         database_part = self.identifier_preparer.quote(database_raw)
         schema_only = self.denormalize_name(schema_raw)
         info_schema_table = f"{database_part}.information_schema.columns"
@@ -1710,11 +2196,14 @@ class SnowflakeDialect(default.DefaultDialect):
                 return None
             raise
 
-    def _show_in_schema_rows(
-        self, connection: Connection, show_sql_prefix: str
-    ) -> tuple[dict[str, int], list[Any]]:
-        """Run an object-listing ``SHOW`` command with pagination and return
-        ``(name_to_index_map, all_rows)``.
+    def _iter_show_in_schema_pages(
+        self,
+        connection: Connection,
+        show_sql_prefix: str,
+        columns: Sequence[str] | None = None,
+    ) -> Iterator[tuple[dict[str, int], Sequence[Any]]]:
+        """Run an object-listing ``SHOW`` command with pagination, yielding
+        ``(name_to_index_map, rows)`` one page at a time.
 
         Snowflake ``SHOW`` commands cap their output at 10,000 rows, so larger
         object sets are paged past the previous page's last ``name`` using
@@ -1722,23 +2211,41 @@ class SnowflakeDialect(default.DefaultDialect):
         that expose a ``name`` column and support ``LIMIT ... FROM`` (e.g.
         TABLES, VIEWS, SCHEMAS, SEQUENCES). ``show_sql_prefix`` is the full
         command up to but excluding ``LIMIT``.
+
+        ``columns`` lists the (lowercase) ``SHOW`` output columns the caller
+        reads. When ``enable_show_column_projection`` is on, each page is
+        piped through ``->> SELECT <columns> FROM $1`` so only those columns
+        are transferred; ``name`` is always included since paging relies on it.
+        Pages are yielded as they are fetched, so callers that consume them
+        incrementally never hold more than one page in memory.
         """
         # Snowflake caps SHOW output at 10,000 rows and rejects a larger LIMIT,
         # so clamp any override into the valid 1..10,000 range.
         page_size = max(1, min(10000, int(self._SHOW_TABLES_PAGE_SIZE)))
         from_name: str | None = None
         prev_from_name: str | None = None
-        all_rows: list[Any] = []
-        name_to_index_map: dict[str, int] = {}
+        projection = self._show_projection_suffix(columns)
 
         while True:
             paging = "" if from_name is None else f" FROM '{from_name}'"
-            result = connection.execute(
-                text(f"{show_sql_prefix} LIMIT {page_size}{paging}")
-            )
+            page_sql = f"{show_sql_prefix} LIMIT {page_size}{paging}"
+            if projection:
+                try:
+                    result = connection.execute(text(f"{page_sql}{projection}"))
+                except sa_exc.ProgrammingError as pe:
+                    errno = getattr(pe.orig, "errno", None)
+                    if errno not in SHOW_PROJECTION_UNSUPPORTED_ERROR_CODES:
+                        raise
+                    # The pipe operator is unavailable on this account or
+                    # server: stop projecting and fetch the full SHOW output.
+                    self._enable_show_column_projection = False
+                    projection = ""
+                    result = connection.execute(text(page_sql))
+            else:
+                result = connection.execute(text(page_sql))
             name_to_index_map = self._map_name_to_idx(result)
             rows = result.cursor.fetchall()
-            all_rows.extend(rows)
+            yield name_to_index_map, rows
 
             # A short page means we've reached the end.
             if len(rows) < page_size:
@@ -1755,8 +2262,56 @@ class SnowflakeDialect(default.DefaultDialect):
                 break
             prev_from_name = from_name
 
+    def _show_projection_suffix(self, columns: Sequence[str] | None) -> str:
+        """Return the ``->> SELECT ...`` pipe projecting ``columns`` out of a
+        ``SHOW`` page, or ``""`` when projection is disabled or not requested.
+
+        ``ORDER BY "name"`` keeps the page in ``SHOW`` order so the last row
+        remains a valid ``FROM`` cursor.
+        """
+        if not columns or not self._enable_show_column_projection:
+            return ""
+        wanted = ["name", *(c for c in columns if c != "name")]
+        select_list = ", ".join(
+            self.identifier_preparer.quote_identifier(c) for c in wanted
+        )
+        return f' ->> SELECT {select_list} FROM $1 ORDER BY "name"'
+
+    def _show_in_schema_rows(
+        self,
+        connection: Connection,
+        show_sql_prefix: str,
+        columns: Sequence[str] | None = None,
+    ) -> tuple[dict[str, int], list[Any]]:
+        """Collect every page of ``_iter_show_in_schema_pages`` and return
+        ``(name_to_index_map, all_rows)``.
+
+        Kept for callers that need the whole listing at once; reflection
+        methods in this module consume the pages incrementally instead.
+        """
+        name_to_index_map: dict[str, int] = {}
+        all_rows: list[Any] = []
+        for page_index_map, rows in self._iter_show_in_schema_pages(
+            connection, show_sql_prefix, columns
+        ):
+            name_to_index_map = page_index_map
+            all_rows.extend(rows)
         return name_to_index_map, all_rows
 
+    def _show_object_names(
+        self, connection: Connection, show_sql_prefix: str
+    ) -> list[str]:
+        """Return the normalized ``name`` column of a paged ``SHOW`` listing."""
+        names: list[str] = []
+        for name_to_index_map, rows in self._iter_show_in_schema_pages(
+            connection, show_sql_prefix, columns=("name",)
+        ):
+            if not rows:
+                continue
+            name_idx = name_to_index_map["name"]
+            names.extend(self.normalize_name(row[name_idx]) for row in rows)  # type: ignore[misc]
+        return names
+
     @reflection.cache
     def _get_schema_tables_info(
         self, connection: Connection, schema: str | None = None, **kw: Any
@@ -1768,18 +2323,35 @@ class SnowflakeDialect(default.DefaultDialect):
         row shape consumed by ``get_prefixes_from_data`` — and the ``SHOW``
         privilege semantics — stay unchanged; the 10,000-row cap is handled by
         ``_show_in_schema_rows`` (SNOW-796954).
+
+        Each entry also keeps the raw ``kind``, ``rows``, ``bytes``,
+        ``cluster_by`` and ``automatic_clustering`` values, which back
+        ``get_table_stats`` and clustering key reflection.
         """
         full_schema_name = self._get_full_schema_name(connection, schema, **kw)
-        name_to_index_map, rows = self._show_in_schema_rows(
+        tables = {}
+        for name_to_index_map, rows in self._iter_show_in_schema_pages(
             connection,
             "SHOW /* sqlalchemy:get_schema_tables_info */ "
             f"TABLES IN SCHEMA {full_schema_name}",
-        )
-        tables = {}
-        for row in rows:
-            table_name = self.normalize_name(str(row[name_to_index_map["name"]]))
-            table_prefixes = self.get_prefixes_from_data(name_to_index_map, row)
-            tables[table_name] = {"prefixes": table_prefixes}
+            columns=_SHOW_TABLES_INFO_COLUMNS,
+        ):
+            if not rows:
+                continue
+            name_idx = name_to_index_map["name"]
+            for row in rows:
+                table_name = self.normalize_name(str(row[name_idx]))
+                tables[table_name] = {
+                    "prefixes": self.get_prefixes_from_data(name_to_index_map, row),
+                    **{
+                        column: (
+                            row[name_to_index_map[column]]
+                            if column in name_to_index_map
+                            else None
+                        )
+                        for column in _SHOW_TABLES_STATS_COLUMNS
+                    },
+                }
         return tables
 
     def get_table_names(
@@ -1801,11 +2373,10 @@ class SnowflakeDialect(default.DefaultDialect):
         Gets all view names
         """
         full_schema_name = self._get_full_schema_name(connection, schema, **kw)
-        _, rows = self._show_in_schema_rows(
+        return self._show_object_names(
             connection,
             f"SHOW /* sqlalchemy:get_view_names */ VIEWS IN {full_schema_name}",
         )
-        return [self.normalize_name(row[1]) for row in rows]  # type: ignore[misc]
 
     @reflection.cache
     def get_view_definition(
@@ -1839,6 +2410,8 @@ class SnowflakeDialect(default.DefaultDialect):
                 )
             )
 
+        from snowflake.connector import errors as sf_errors
+
         name_to_index_map = self.__class__._map_name_to_idx(cursor)
         try:
             ret = cursor.fetchone()
@@ -1852,16 +2425,20 @@ class SnowflakeDialect(default.DefaultDialect):
         self, connection: Connection, schema: str | None = None, **kw: Any
     ) -> list[str]:
         full_schema_name = self._get_full_schema_name(connection, schema, **kw)
-        name_to_index_map, rows = self._show_in_schema_rows(
+        ret = []
+        for name_to_index_map, rows in self._iter_show_in_schema_pages(
             connection,
             "SHOW /* sqlalchemy:get_temp_table_names */ "
             f"TABLES IN SCHEMA {full_schema_name}",
-        )
-
-        ret = []
-        for row in rows:
-            if row[name_to_index_map["kind"]] == "TEMPORARY":
-                ret.append(self.normalize_name(row[name_to_index_map["name"]]))
+            columns=("name", "kind"),
+        ):
+            if not rows:
+                continue
+            name_idx = name_to_index_map["name"]
+            kind_idx = name_to_index_map["kind"]
+            for row in rows:
+                if row[kind_idx] == "TEMPORARY":
+                    ret.append(self.normalize_name(row[name_idx]))
 
         return ret  # type: ignore[return-value]
 
@@ -1869,10 +2446,9 @@ class SnowflakeDialect(default.DefaultDialect):
         """
         Gets all schema names.
         """
-        _, rows = self._show_in_schema_rows(
+        return self._show_object_names(
             connection, "SHOW /* sqlalchemy:get_schema_names */ SCHEMAS"
         )
-        return [self.normalize_name(row[1]) for row in rows]  # type: ignore[misc]
 
     @reflection.cache
     def get_sequence_names(
@@ -1880,25 +2456,28 @@ class SnowflakeDialect(default.DefaultDialect):
     ) -> list[str]:
         full_schema_name = self._get_full_schema_name(connection, schema, **kw)
         try:
-            _, rows = self._show_in_schema_rows(
+            return self._show_object_names(
                 connection, f"SHOW SEQUENCES IN SCHEMA {full_schema_name}"
             )
-            return [self.normalize_name(row[0]) for row in rows]  # type: ignore[misc]
         except sa_exc.ProgrammingError as pe:
             if getattr(pe.orig, "errno", None) == 2003:
                 # Schema does not exist
                 return []
             raise
 
-    def _get_table_comment(
+    @reflection.cache
+    def _get_table_show_row(
         self,
         connection: Connection,
         table_name: str,
         schema: str | None = None,
         **kw: Any,
-    ) -> ReflectedTableComment:
-        """
-        Returns comment of table in a dictionary as described by SQLAlchemy spec.
+    ) -> Row[Any] | None:
+        """``SHOW TABLES LIKE`` row of a single table, or None if there is no
+        such table (e.g. it is a view).
+
+        Cached so table comment and table option reflection of the same table
+        share one round trip.
         """
         full_schema_name = self._get_full_schema_name(connection, schema, **kw)
         # table_name is embedded in a single-quoted SHOW ... LIKE literal, so escape
@@ -1909,7 +2488,21 @@ class SnowflakeDialect(default.DefaultDialect):
             f"TABLES LIKE '{like_value}' IN SCHEMA {full_schema_name}"
         )
         cursor = connection.execute(text(sql_command))
-        return cursor.fetchone()  # type: ignore[return-value]
+        return cursor.fetchone()
+
+    def _get_table_comment(
+        self,
+        connection: Connection,
+        table_name: str,
+        schema: str | None = None,
+        **kw: Any,
+    ) -> ReflectedTableComment:
+        """
+        Returns comment of table in a dictionary as described by SQLAlchemy spec.
+        """
+        return self._get_table_show_row(  # type: ignore[return-value]
+            connection, table_name, schema, info_cache=kw.get("info_cache")
+        )
 
     def _get_view_comment(
         self,
@@ -1958,6 +2551,144 @@ class SnowflakeDialect(default.DefaultDialect):
             )
         }
 
+    @staticmethod
+    def _split_cluster_by(cluster_by: str) -> list[str]:
+        """Split a ``SHOW TABLES`` ``cluster_by`` value such as
+        ``LINEAR(ID, TO_DATE(TS))`` into its top-level key expressions."""
+        body = cluster_by.strip()
+        if body.upper().startswith("LINEAR(") and body.endswith(")"):
+            body = body[len("LINEAR(") : -1]
+        expressions = []
+        depth = 0
+        quote: str | None = None
+        current: list[str] = []
+        for char in body:
+            if quote is not None:
+                if char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == "," and depth == 0:
+                expressions.append("".join(current).strip())
+                current = []
+                continue
+            current.append(char)
+        expressions.append("".join(current).strip())
+        return [expression for expression in expressions if expression]
+
+    def _reflect_cluster_by(self, cluster_by: str | None) -> list[str | TextClause]:
+        """Clustering key as ``snowflake_clusterby`` / ``ClusterByOption``
+        expressions: bare column names are normalized like reflected column
+        names, anything else is kept verbatim as a ``text()`` expression."""
+        if not cluster_by:
+            return []
+        keys: list[str | TextClause] = []
+        for expression in self._split_cluster_by(cluster_by):
+            if _SIMPLE_IDENTIFIER_RE.match(expression):
+                keys.append(self.normalize_name(expression))  # type: ignore[arg-type]
+            else:
+                keys.append(text(expression))
+        return keys
+
+    def _table_stats_from_info(self, table_info: dict[str, Any]) -> ReflectedTableStats:
+        rows = table_info.get("rows")
+        size = table_info.get("bytes")
+        automatic_clustering = table_info.get("automatic_clustering")
+        return {
+            "kind": table_info.get("kind"),
+            "rows": int(rows) if rows is not None else None,
+            "bytes": int(size) if size is not None else None,
+            "cluster_by": [
+                str(key) for key in self._reflect_cluster_by(table_info["cluster_by"])
+            ],
+            "automatic_clustering": (
+                None
+                if automatic_clustering is None
+                else str(automatic_clustering).upper() == "ON"
+            ),
+        }
+
+    def get_table_stats(
+        self,
+        connection: Connection,
+        table_name: str,
+        schema: str | None = None,
+        **kw: Any,
+    ) -> ReflectedTableStats:
+        """Row count, size and clustering information of a table, served from
+        the cached ``SHOW TABLES`` pass behind ``get_table_names``."""
+        tables = self._get_schema_tables_info(
+            connection, schema, info_cache=kw.get("info_cache", None)
+        )
+        if table_name not in tables:
+            raise sa_exc.NoSuchTableError(table_name)
+        return self._table_stats_from_info(tables[table_name])
+
+    def get_multi_table_stats(
+        self,
+        connection: Connection,
+        *,
+        schema: str | None = None,
+        filter_names: Collection[str] | None = None,
+        **kw: Any,
+    ) -> list[tuple[tuple[str | None, str], ReflectedTableStats]]:
+        """``get_table_stats`` for every table of a schema from one cached
+        ``SHOW TABLES`` pass, keyed like the other ``get_multi_*`` hooks."""
+        tables = self._get_schema_tables_info(
+            connection, schema, info_cache=kw.get("info_cache", None)
+        )
+        names = filter_names if filter_names is not None else list(tables)
+        return [
+            ((schema, name), self._table_stats_from_info(tables[name]))
+            for name in names
+            if name in tables
+        ]
+
+    def get_multi_table_options(
+        self,
+        connection: Connection,
+        *,
+        schema: str | None = None,
+        filter_names: Collection[str] | None = None,
+        **kw: Any,
+    ) -> list[tuple[tuple[str | None, str], dict[str, Any]]]:
+        """Reflect the clustering key as ``snowflake_clusterby``.
+
+        Bulk reflection reuses the cached schema-wide ``SHOW TABLES`` pass that
+        ``get_table_names`` already ran.  A single-table reflection instead
+        reads the ``SHOW TABLES LIKE`` row it shares with comment reflection,
+        so neither path adds a round trip.
+        """
+        info_cache = kw.get("info_cache", None)
+        if filter_names is not None and len(filter_names) == 1:
+            (table_name,) = filter_names
+            row = self._get_table_show_row(
+                connection, table_name, schema, info_cache=info_cache
+            )
+            cluster_by = {
+                table_name: row._mapping.get("cluster_by") if row is not None else None
+            }
+        else:
+            tables = self._get_schema_tables_info(
+                connection, schema, info_cache=info_cache
+            )
+            names = filter_names if filter_names is not None else list(tables)
+            cluster_by = {
+                name: tables[name]["cluster_by"] for name in names if name in tables
+            }
+        options = []
+        for table_name, value in cluster_by.items():
+            keys = self._reflect_cluster_by(value)
+            if keys:
+                options.append(
+                    ((schema, table_name), {f"{DIALECT_NAME}_clusterby": keys})
+                )
+        return options
+
     def get_table_names_with_prefix(
         self,
         connection,
@@ -2102,7 +2833,14 @@ class SnowflakeDialect(default.DefaultDialect):
         if self._enable_decfloat:
             decimal.getcontext().prec = DECFLOAT_PRECISION
 
+        if self._initialization_cache_ttl:
+            self._initialization_cache_key = _initialization_cache.cache_key(cparams)
+
         connection = super().connect(*cargs, **cparams)
+        if self._elide_empty_transactions:
+            _set_connection_transaction_dirty(connection, False)
+        if self._ping_window is not None:
+            _mark_connection_used(connection)
         self._log_new_connection_event(connection, cparams)  # type: ignore[arg-type]
 
         return connection  # type: ignore[return-value]
@@ -2115,6 +2853,8 @@ class SnowflakeDialect(default.DefaultDialect):
 
             record_new_connection(self, connection, cparams)
         except Exception as e:
+            from ._telemetry import TelemetryEvents
+
             logger.debug(
                 "Failed to send telemetry data for %s event: %s: %s",
                 TelemetryEvents.NEW_CONNECTION.value,
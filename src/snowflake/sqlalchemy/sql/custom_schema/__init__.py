@@ -1,9 +1,36 @@
 #
 # Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
 #
-from .dynamic_table import DynamicTable
-from .hybrid_table import HybridTable
-from .iceberg_table import IcebergTable
-from .snowflake_table import SnowflakeTable
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .dynamic_table import DynamicTable
+    from .hybrid_table import HybridTable
+    from .iceberg_table import IcebergTable
+    from .snowflake_table import SnowflakeTable
 
 __all__ = ["DynamicTable", "HybridTable", "IcebergTable", "SnowflakeTable"]
+
+# The table classes are imported on first access so that the dialect, which
+# only needs the shared base classes and options, does not load all of them.
+_LAZY_ATTRIBUTES = {
+    "DynamicTable": ".dynamic_table",
+    "HybridTable": ".hybrid_table",
+    "IcebergTable": ".iceberg_table",
+    "SnowflakeTable": ".snowflake_table",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
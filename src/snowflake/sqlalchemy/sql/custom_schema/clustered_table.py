@@ -7,6 +7,7 @@ from typing import Any
 
 from sqlalchemy.sql.schema import MetaData, SchemaItem
 
+from ..._constants import DIALECT_NAME
 from .custom_table_base import CustomTableBase
 from .options.cluster_by_option import ClusterByOption, ClusterByOptionType
 from .options.table_option import TableOptionKey
@@ -34,3 +35,18 @@ class ClusteredTableBase(CustomTableBase):
 
         kw.update(self._as_dialect_options(options))
         super().__init__(name, metadata, *args, **kw)
+        self._adopt_reflected_cluster_by()
+
+    def _adopt_reflected_cluster_by(self) -> None:
+        """Move a clustering key reflected as ``snowflake_clusterby`` into the
+        ``cluster_by`` option, so reflected tables expose it the same way as
+        declared ones and DDL renders a single ``CLUSTER BY`` clause."""
+        dialect_options = self.dialect_options[DIALECT_NAME]
+        reflected = dialect_options.get("clusterby")
+        if not reflected:
+            return
+        if self.cluster_by is None:
+            dialect_options[TableOptionKey.CLUSTER_BY.value] = ClusterByOption(
+                *reflected
+            )
+        del dialect_options["clusterby"]
@@ -4,14 +4,15 @@
 from __future__ import annotations
 
 import re
+import threading
+import time
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
 from itertools import chain
 from typing import Any
 from urllib.parse import quote as _url_quote
 from urllib.parse import quote_plus, urlsplit, urlunsplit
 
-from snowflake.connector.compat import IS_STR
-
 from sqlalchemy import create_engine as _sa_create_engine
 from sqlalchemy import exc, inspection, sql
 from sqlalchemy.engine import Engine
@@ -141,7 +142,7 @@ def _url(**db_parameters: Any) -> str:
     for p in sorted(db_parameters.keys()):
         v = db_parameters[p]
         if p not in specified_parameters:
-            encoded_value = quote_plus(v) if IS_STR(v) else str(v)
+            encoded_value = quote_plus(v) if isinstance(v, str) else str(v)
             ret += sep(is_first_parameter) + p + "=" + encoded_value
             is_first_parameter = False
     return ret
@@ -159,6 +160,46 @@ def _set_connection_interpolate_empty_sequences(
         dbapi_connection._interpolate_empty_sequences = flag
 
 
+def _set_connection_transaction_dirty(dbapi_connection: Any, flag: bool) -> None:
+    """Record whether a statement ran since the last COMMIT / ROLLBACK."""
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    driver_connection._sqlalchemy_transaction_dirty = flag
+
+
+def _connection_transaction_dirty(dbapi_connection: Any) -> bool:
+    """Whether a statement may have run since the last COMMIT / ROLLBACK.
+
+    Connections whose state was never recorded count as dirty.
+    """
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    return getattr(driver_connection, "_sqlalchemy_transaction_dirty", True)
+
+
+def _set_connection_autocommit(dbapi_connection: Any, flag: bool) -> None:
+    """Record whether the connection is in autocommit mode."""
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    driver_connection._sqlalchemy_autocommit = flag
+
+
+def _connection_autocommit(dbapi_connection: Any) -> bool:
+    """Whether the connection is in autocommit mode, as far as it was recorded."""
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    return getattr(driver_connection, "_sqlalchemy_autocommit", False)
+
+
+def _mark_connection_used(dbapi_connection: Any) -> None:
+    """Record that a round trip on the connection just succeeded."""
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    driver_connection._sqlalchemy_last_used = time.monotonic()
+
+
+def _connection_idle_seconds(dbapi_connection: Any) -> float | None:
+    """Seconds since the last recorded successful round trip, if any."""
+    driver_connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    last_used = getattr(driver_connection, "_sqlalchemy_last_used", None)
+    return None if last_used is None else time.monotonic() - last_used
+
+
 def _update_connection_application_name(**conn_kwargs: Any) -> dict[str, Any]:
     if PARAM_APPLICATION not in conn_kwargs:
         conn_kwargs[PARAM_APPLICATION] = APPLICATION_NAME
@@ -332,6 +373,7 @@ def create_snowflake_engine(
     base_url: str,
     schema: str | None = None,
     case_sensitive_schema: bool = False,
+    prewarm: bool = False,
     **kwargs: Any,
 ) -> Engine:
     """
@@ -354,6 +396,9 @@ def create_snowflake_engine(
     case_sensitive_schema:
         When *True* the schema name is enclosed in ``%22...%22`` to preserve
         case in Snowflake.  Defaults to *False*.
+    prewarm:
+        When *True* the pool is filled with :func:`prewarm_pool` before the
+        engine is returned.  Defaults to *False*.
     **kwargs:
         Additional keyword arguments forwarded verbatim to
         :func:`sqlalchemy.create_engine`.
@@ -382,7 +427,108 @@ def create_snowflake_engine(
         )
     else:
         url = base_url
-    return _sa_create_engine(url, **kwargs)
+    engine = _sa_create_engine(url, **kwargs)
+    if prewarm:
+        prewarm_pool(engine)
+    return engine
+
+
+def prewarm_pool(
+    engine: Engine, size: int | None = None, timeout: float | None = None
+) -> int:
+    """
+    Open ``size`` pooled connections in parallel and leave them idle in the pool.
+
+    Authentication takes hundreds of milliseconds, so a freshly started
+    process would otherwise serve its first concurrent requests with one
+    serial connect each.  Connecting from worker threads makes warm-up take
+    about one connect time; the dialect is still initialized only once.
+
+    Parameters
+    ----------
+    engine:
+        A synchronous engine.
+    size:
+        Number of connections to open.  Defaults to the pool's ``pool_size``
+        (1 for pools without one).
+    timeout:
+        Seconds to wait for all connections to open.  Defaults to the pool's
+        ``timeout`` (30 for pools without one).
+
+    Returns
+    -------
+    int
+        The number of connections opened within ``timeout``; these are back
+        in the pool when the call returns.  When a connect is still running
+        at the timeout (a login that hangs), it is left to finish in the
+        background and its connection, if any, is returned to the pool then.
+        The first connect error, if any, is raised instead.
+    """
+    if size is None:
+        pool_size = getattr(engine.pool, "size", None)
+        size = pool_size() if pool_size is not None else 1
+    if size <= 0:
+        return 0
+    if timeout is None:
+        pool_timeout = getattr(engine.pool, "timeout", None)
+        timeout = pool_timeout() if pool_timeout is not None else 30.0
+    deadline = time.monotonic() + timeout
+    # Every worker holds its connection until all have connected, so each one
+    # opens a new connection instead of reusing one another just returned.
+    barrier = threading.Barrier(size)
+    lock = threading.Lock()
+    opened: list[threading.Event] = []
+
+    def connect() -> None:
+        try:
+            connection = engine.raw_connection()
+        except BaseException:
+            barrier.abort()
+            raise
+        returned = threading.Event()
+        with lock:
+            opened.append(returned)
+        try:
+            barrier.wait(max(deadline - time.monotonic(), 0.0))
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            connection.close()
+            returned.set()
+
+    executor = ThreadPoolExecutor(
+        max_workers=size, thread_name_prefix="snowflake-sqlalchemy-prewarm"
+    )
+    futures = [executor.submit(connect) for _ in range(size)]
+    executor.shutdown(wait=False)
+    wait(futures, max(deadline - time.monotonic(), 0.0))
+    # Workers that connected are past the barrier by the deadline; wait for
+    # them to return their connections so the count matches the pool.
+    with lock:
+        returned_events = list(opened)
+    for returned in returned_events:
+        returned.wait()
+    errors = [f.exception() for f in futures if f.done() and f.exception()]
+    if errors:
+        raise errors[0]  # type: ignore[misc]
+    return len(returned_events)
+
+
+def get_query_id(result: Any) -> str | None:
+    """
+    Return the Snowflake query id of the query that produced ``result``.
+
+    ``result`` is what ``Connection.execute`` or ``Session.execute`` returned
+    (ORM results are traced back to their cursor result).  The id can be
+    passed to ``result_scan`` to page, filter or aggregate the same rows on
+    the server without running the query again.  ``None`` when the dialect
+    did not execute a query, e.g. for a deferred batched statement.
+    """
+    raw = getattr(result, "raw", None)
+    if raw is not None:
+        result = raw
+    context = getattr(result, "context", None)
+    return getattr(context, "query_id", None)
 
 
 def escape_backslashes(value: str) -> str:
@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Per-warehouse connection pools for one engine.
+
+The ``warehouse`` execution option switches a pooled connection to the
+requested warehouse, which costs a ``USE WAREHOUSE`` round trip whenever the
+connection was last used with another one.  :class:`WarehouseRouter` gives
+each warehouse a pool of its own, so every connection checked out for a
+warehouse is already bound to it, and a workload that holds all the
+connections of its warehouse cannot starve the others::
+
+    router = WarehouseRouter(engine, pool_sizes={"REPORTING_WH": 2})
+    with router.connect("LOOKUP_WH") as conn:
+        conn.execute(point_lookup)
+    router.metrics()
+
+The per-warehouse pools are copies of the engine's pool (same class, settings
+and pool events) and share its dialect, events and statement cache; they are
+disposed with the engine.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.base import OptionEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+from .session_state import WAREHOUSE_OPTION
+
+
+class WarehouseRoute:
+    """The pool of one warehouse, with its checkout statistics."""
+
+    def __init__(self, warehouse: str, pool: Pool) -> None:
+        self.warehouse = warehouse
+        self.pool = pool
+        self._lock = threading.Lock()
+        #: Connections checked out for this warehouse.
+        self.checkouts = 0
+        #: Total and longest time spent waiting for a connection, in seconds.
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def checked_out(self) -> int | None:
+        """Connections of this warehouse in use, when the pool reports it."""
+        checkedout = getattr(self.pool, "checkedout", None)
+        return checkedout() if checkedout is not None else None
+
+    def _record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "warehouse": self.warehouse,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class _WarehouseEngine(OptionEngine):
+    """``engine.execution_options(warehouse=...)`` checking out from its own pool."""
+
+    def __init__(self, proxied: Engine, route: WarehouseRoute) -> None:
+        self._route = route
+        super().__init__(proxied, {WAREHOUSE_OPTION: route.warehouse})
+
+    @property
+    def pool(self) -> Pool:
+        return self._route.pool
+
+    @pool.setter
+    def pool(self, pool: Pool) -> None:
+        # ``dispose`` replaces the pool with a fresh copy.
+        self._route.pool = pool
+
+    def raw_connection(self) -> Any:
+        start = time.perf_counter()
+        connection = super().raw_connection()
+        self._route._record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class WarehouseRouter:
+    """Route connections of ``engine`` to per-warehouse pools.
+
+    ``pool_sizes`` maps warehouse names to the ``pool_size`` of their pool
+    (the engine's own size otherwise); it needs a ``QueuePool`` engine.
+    Warehouse names are used as given: spell each one the same way.
+    """
+
+    def __init__(
+        self, engine: Engine, pool_sizes: Mapping[str, int] | None = None
+    ) -> None:
+        if engine.dialect.is_async:
+            raise sa_exc.ArgumentError(
+                "WarehouseRouter needs a synchronous engine; pass "
+                "AsyncEngine.sync_engine and wrap the per-warehouse engines"
+            )
+        if pool_sizes and not isinstance(engine.pool, QueuePool):
+            raise sa_exc.ArgumentError(
+                f"pool_sizes needs a QueuePool; the engine uses "
+                f"{type(engine.pool).__name__}"
+            )
+        self.engine = engine
+        self._pool_sizes = dict(pool_sizes or {})
+        self._lock = threading.Lock()
+        self._engines: dict[str, _WarehouseEngine] = {}
+        event.listen(engine, "engine_disposed", self._on_engine_disposed)
+
+    def engine_for(self, warehouse: str) -> Engine:
+        """The engine whose connections run on ``warehouse``."""
+        routed = self._engines.get(warehouse)
+        if routed is not None:
+            return routed
+        with self._lock:
+            routed = self._engines.get(warehouse)
+            if routed is None:
+                route = WarehouseRoute(warehouse, self._new_pool(warehouse))
+                routed = self._engines[warehouse] = _WarehouseEngine(self.engine, route)
+        return routed
+
+    def connect(self, warehouse: str) -> Connection:
+        """Check out a connection bound to ``warehouse``."""
+        return self.engine_for(warehouse).connect()
+
+    @property
+    def routes(self) -> dict[str, WarehouseRoute]:
+        return {name: routed._route for name, routed in self._engines.items()}
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Checkout statistics of each warehouse routed to so far."""
+        return {name: route.as_dict() for name, route in self.routes.items()}
+
+    def dispose(self) -> None:
+        """Close the checked-in connections of every per-warehouse pool."""
+        for routed in list(self._engines.values()):
+            routed.pool.dispose()
+            routed.pool = routed.pool.recreate()
+
+    def _new_pool(self, warehouse: str) -> Pool:
+        pool = self.engine.pool
+        size = self._pool_sizes.get(warehouse)
+        if size is None:
+            return pool.recreate()
+        assert isinstance(pool, QueuePool)
+        # ``QueuePool.recreate`` with another ``pool_size``.
+        return type(pool)(
+            pool._creator,
+            pool_size=size,
+            max_overflow=pool._max_overflow,
+            pre_ping=pool._pre_ping,
+            use_lifo=pool._pool.use_lifo,
+            timeout=pool._timeout,
+            recycle=pool._recycle,
+            echo=pool.echo,
+            logging_name=pool._orig_logging_name,
+            reset_on_return=pool._reset_on_return,
+            _dispatch=pool.dispatch,
+            dialect=pool._dialect,
+        )
+
+    def _on_engine_disposed(self, engine: Engine) -> None:
+        # Per-warehouse engines share the engine's events; disposing one of
+        # them replaces only its own pool.
+        if not isinstance(engine, _WarehouseEngine):
+            self.dispose()
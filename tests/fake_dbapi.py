@@ -0,0 +1,301 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""A scriptable, in-memory stand-in for ``snowflake.connector``.
+
+Pass an instance as ``module=`` to ``create_engine`` to run the real dialect,
+pool and execution machinery without an account::
+
+    dbapi = FakeDBAPI()
+    engine = create_engine("snowflake://u:p@acct/db/public", module=dbapi)
+
+Every statement is appended to ``dbapi.log``.  ``responder`` maps a statement
+to ``(column_names, rows)`` or raises; the default answers the dialect's
+initialization probe and returns an empty result for everything else.
+
+``execute(sql, num_statements=n)`` runs a multi-statement request: each
+statement goes through ``responder`` (which may raise to fail it, stopping
+the request there) and is appended to ``dbapi.statements``; the child query
+ids are left in ``cursor.multi_statement_savedIds``, the cursor is left on the
+first child's result and ``nextset()`` moves to each following one, raising
+the error of a failed one.  ``cursor.sfqid``
+is set once a response arrives, as the connector does.
+
+``execute_async`` records the statement and defers the response until
+``get_results_from_sfqid``; ``dbapi.query_status`` maps a query id to the
+status ``get_query_status`` reports (``"SUCCESS"`` when absent).
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+from collections.abc import Callable, Sequence
+from typing import Any
+
+Response = tuple[Sequence[str], Sequence[Sequence[Any]]]
+
+
+class Error(Exception):
+    def __init__(self, msg: str = "", errno: int | None = None, sqlstate=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+        self.sqlstate = sqlstate
+
+
+class Warning(Exception):  # noqa: A001 - PEP 249 name
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+def default_responder(sql: str) -> Response:
+    if "CURRENT_VERSION()" in sql.upper():
+        return ["version", "database", "schema"], [["9.30.0", "DB", "PUBLIC"]]
+    return ["x"], []
+
+
+class FakeConverter:
+    """The connector's client-side binding steps, for plain values."""
+
+    @staticmethod
+    def to_snowflake(value: Any) -> Any:
+        return value
+
+    @staticmethod
+    def escape(value: Any) -> Any:
+        return value.replace("'", "''") if isinstance(value, str) else value
+
+    @staticmethod
+    def quote(value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, str):
+            return f"'{value}'"
+        return str(value)
+
+
+class FakeCursor:
+    def __init__(self, connection: FakeConnection) -> None:
+        self.connection = connection
+        self.description: list[tuple] | None = None
+        self.rowcount = -1
+        self.sfqid: str | None = None
+        self._rows: list[Any] = []
+        self._children: collections.deque[tuple[str, Any]] = collections.deque()
+
+    def execute(self, sql: str, params: Any = None, **kwargs: Any) -> FakeCursor:
+        dbapi = self.connection.dbapi
+        dbapi.log.append(sql)
+        dbapi.calls.append((sql, params, kwargs))
+        query_id = f"01-{next(dbapi.query_ids):06d}"
+        if kwargs.get("num_statements"):
+            return self._execute_multi(sql, kwargs["num_statements"], query_id)
+        try:
+            names, rows = dbapi.responder(sql)
+        except Exception:
+            # The server answered with an error for this query.
+            self.sfqid = query_id
+            raise
+        # Like the connector, the query id is only known once the response
+        # arrives: an interrupted execute leaves the previous one.
+        self.sfqid = query_id
+        self.description = [(n, None, None, None, None, None, True) for n in names]
+        self._rows = [tuple(r) for r in rows]
+        self.rowcount = len(self._rows)
+        return self
+
+    def _execute_multi(
+        self, sql: str, num_statements: int, query_id: str
+    ) -> FakeCursor:
+        dbapi = self.connection.dbapi
+        self.sfqid = query_id
+        statements = sql.split(";\n")
+        if len(statements) != num_statements:
+            raise ProgrammingError(
+                f"Actual statement count {len(statements)} did not match the "
+                f"desired statement count {num_statements}.",
+                errno=8,
+            )
+        self.multi_statement_savedIds = []
+        self._children: collections.deque[tuple[str, Any]] = collections.deque()
+        for statement in statements:
+            child_id = f"01-{next(dbapi.query_ids):06d}"
+            self.multi_statement_savedIds.append(child_id)
+            try:
+                response = dbapi.responder(statement)
+            except Exception as e:
+                # Snowflake stops at the failing statement.
+                self._children.append((child_id, e))
+                break
+            dbapi.statements.append(statement)
+            self._children.append((child_id, response))
+        # Like the connector, leave the cursor on the first statement's result.
+        self.nextset()
+        return self
+
+    def nextset(self) -> FakeCursor | None:
+        # What the connector's ``reset()`` leaves behind.
+        self.description = None
+        self._rows = []
+        self.rowcount = None
+        if not self._children:
+            return None
+        child_id, response = self._children.popleft()
+        self.sfqid = child_id
+        if isinstance(response, Exception):
+            raise response
+        names, rows = response
+        self.description = [(n, None, None, None, None, None, True) for n in names]
+        self._rows = [tuple(r) for r in rows]
+        self.rowcount = len(self._rows)
+        return self
+
+    def execute_async(self, sql: str, params: Any = None, **kwargs: Any) -> FakeCursor:
+        dbapi = self.connection.dbapi
+        dbapi.log.append(sql)
+        dbapi.calls.append((sql, params, {**kwargs, "_exec_async": True}))
+        self.sfqid = f"01-{next(dbapi.query_ids):06d}"
+        self.description = None
+        self._rows = []
+        try:
+            dbapi.async_results[self.sfqid] = dbapi.responder(sql)
+        except Exception as e:
+            dbapi.async_results[self.sfqid] = e
+        return self
+
+    def get_results_from_sfqid(self, sfqid: str) -> None:
+        dbapi = self.connection.dbapi
+        dbapi.query_status[sfqid] = "SUCCESS"
+        response = dbapi.async_results[sfqid]
+        if isinstance(response, Exception):
+            raise response
+        names, rows = response
+        self.sfqid = sfqid
+        self.description = [(n, None, None, None, None, None, True) for n in names]
+        self._rows = [tuple(r) for r in rows]
+        self.rowcount = len(self._rows)
+
+    def executemany(self, sql: str, seq_of_params: Any, **kwargs: Any) -> FakeCursor:
+        for params in seq_of_params:
+            self.execute(sql, params, **kwargs)
+        return self
+
+    def fetchall(self) -> list[Any]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self) -> Any:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        size = size or 1
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self, dbapi: FakeDBAPI, kwargs: dict[str, Any]) -> None:
+        self.dbapi = dbapi
+        self.kwargs = kwargs
+        self.closed = False
+        self.rollbacks = 0
+        self.commits = 0
+        self.session_id = 1000 + len(dbapi.connections)
+        self.converter = FakeConverter()
+        for name in ("account", "user", "role", "warehouse", "database", "schema"):
+            setattr(self, name, kwargs.get(name))
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def autocommit(self, mode: bool) -> None:
+        pass
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def get_query_status(self, sfqid: str) -> str:
+        return self.dbapi.query_status.get(sfqid, "SUCCESS")
+
+    @staticmethod
+    def is_still_running(status: str) -> bool:
+        return status in ("RUNNING", "QUEUED", "RESUMING_WAREHOUSE")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeDBAPI:
+    paramstyle = "pyformat"
+    apilevel = "2.0"
+    threadsafety = 2
+
+    Error = Error
+    Warning = Warning
+    InterfaceError = InterfaceError
+    DatabaseError = DatabaseError
+    DataError = DataError
+    OperationalError = OperationalError
+    IntegrityError = IntegrityError
+    InternalError = InternalError
+    ProgrammingError = ProgrammingError
+    NotSupportedError = NotSupportedError
+
+    def __init__(self, responder: Callable[[str], Response] | None = None) -> None:
+        self.responder = responder or default_responder
+        self.log: list[str] = []
+        self.calls: list[tuple[str, Any, dict[str, Any]]] = []
+        self.connections: list[FakeConnection] = []
+        self.query_ids = itertools.count(1)
+        self.async_results: dict[str, Any] = {}
+        self.query_status: dict[str, str] = {}
+        #: Statements run as part of a multi-statement request, in order.
+        self.statements: list[str] = []
+
+    def connect(self, *args: Any, **kwargs: Any) -> FakeConnection:
+        connection = FakeConnection(self, kwargs)
+        self.connections.append(connection)
+        return connection
@@ -15,6 +15,7 @@ from sqlalchemy.engine.url import URL as SAUrl
 
 from snowflake.sqlalchemy import URL
 from snowflake.sqlalchemy._constants import DISCONNECT_ERROR_CODES
+from snowflake.sqlalchemy._telemetry import get_sender
 from snowflake.sqlalchemy.snowdialect import (
     SnowflakeDialect,
     TelemetryEvents,
@@ -32,6 +33,12 @@ _DEFAULT_FLAG_PAYLOAD = {
 }
 
 
+@pytest.fixture(autouse=True)
+def _drain_telemetry_queue():
+    """Send events queued by earlier tests before this test patches telemetry."""
+    get_sender().flush(timeout=5)
+
+
 @pytest.fixture
 def fake_connection():
     return SimpleNamespace(
@@ -52,6 +59,7 @@ def test_connect_sends_telemetry(mock_telemetry_client, mock_connect, fake_conne
         fake_connection.rest = mock.MagicMock()
         dialect = SnowflakeDialect()
         result = dialect.connect()
+        get_sender().flush(timeout=5)
 
     assert result is fake_connection
 
@@ -91,6 +99,7 @@ def test_connect_telemetry_includes_pandas_when_available(
         fake_connection.rest = mock.MagicMock()
         dialect = SnowflakeDialect()
         dialect.connect()
+        get_sender().flush(timeout=5)
 
     telemetry_instance = mock_telemetry_client.return_value
     payload = telemetry_instance.add_log_to_batch.call_args_list[0].args[0]
@@ -118,6 +127,7 @@ def test_connect_telemetry_excludes_pandas_when_not_available(
         fake_connection.rest = mock.MagicMock()
         dialect = SnowflakeDialect()
         dialect.connect()
+        get_sender().flush(timeout=5)
 
     telemetry_instance = mock_telemetry_client.return_value
     payload = telemetry_instance.add_log_to_batch.call_args_list[0].args[0]
@@ -137,11 +147,13 @@ def test_connect_logs_when_telemetry_fails(
     mock_connect.return_value = fake_connection
     mock_telemetry_client.side_effect = RuntimeError("boom")
 
-    caplog.set_level("DEBUG", logger="snowflake.sqlalchemy.snowdialect")
+    # The events are sent, and the failure logged, by the background sender.
+    caplog.set_level("DEBUG", logger="snowflake.sqlalchemy._telemetry.sender")
 
     fake_connection.rest = mock.MagicMock()
     dialect = SnowflakeDialect()
     result = dialect.connect()
+    get_sender().flush(timeout=5)
 
     assert result is fake_connection
     assert any(
@@ -162,6 +174,7 @@ def _telemetry_payload(dialect, telemetry_client_mock, fake_connection):
     """
     fake_connection.rest = mock.MagicMock()
     dialect.connect()
+    get_sender().flush(timeout=5)
     payload = telemetry_client_mock.return_value.add_log_to_batch.call_args_list[
         0
     ].args[0]
@@ -392,6 +405,7 @@ def _structured_message(telemetry_client_mock):
 
     It is the *second* log added to the batch (after the legacy event).
     """
+    get_sender().flush(timeout=5)
     payload = telemetry_client_mock.return_value.add_log_to_batch.call_args_list[
         1
     ].args[0]
@@ -409,6 +423,7 @@ def test_structured_event_is_emitted_alongside_legacy(
     with mock.patch.dict(modules, {"pandas": None}):
         fake_connection.rest = mock.MagicMock()
         SnowflakeDialect().connect()
+        get_sender().flush(timeout=5)
 
     telemetry_instance = mock_telemetry_client.return_value
     assert telemetry_instance.add_log_to_batch.call_count == 2
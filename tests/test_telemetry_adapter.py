@@ -11,6 +11,7 @@ from snowflake.sqlalchemy._telemetry import (
     build_connection_parameters_payload,
     build_new_connection_payload,
     dispatch,
+    get_sender,
     record_new_connection,
 )
 from snowflake.sqlalchemy._telemetry.legacy import Connector4Adapter
@@ -83,7 +84,7 @@ def test_get_adapter_returns_fresh_instance_per_call():
 
 
 # ---------------------------------------------------------------------------
-# record_new_connection: gating, ordering, flush-on-connect
+# record_new_connection: gating, ordering, one flush per connect
 # ---------------------------------------------------------------------------
 
 
@@ -93,6 +94,7 @@ def test_record_registers_both_events_then_flushes_once():
         "snowflake.sqlalchemy._telemetry.get_adapter", return_value=adapter
     ):
         record_new_connection(_fake_dialect(), mock.MagicMock(), {"numpy": True})
+    get_sender().flush(timeout=5)
 
     assert [e for e, _ in adapter.registered] == [
         TelemetryEvents.NEW_CONNECTION.value,
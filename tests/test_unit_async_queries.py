@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``async_submit`` execution and ``gather_async``."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    select,
+    text,
+)
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import AsyncQueryHandle, gather_async, submit_async
+
+from .fake_dbapi import FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+users = Table("users", MetaData(), Column("id", Integer), Column("name", String))
+
+
+def _responder(sql):
+    if "FROM users" in sql:
+        return ["id", "name"], [[1, "a"], [2, "b"]]
+    if sql.startswith("select count"):
+        return ["n"], [[42]]
+    if sql.startswith("select broken"):
+        raise ProgrammingError("SQL compilation error", errno=2003, sqlstate="42S02")
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def conn(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def test_async_submit_returns_handle_then_typed_result(conn, dbapi):
+    handle = conn.execution_options(async_submit=True).execute(select(users))
+    assert isinstance(handle, AsyncQueryHandle)
+    assert handle.query_id.startswith("01-")
+    assert dbapi.calls[-1][2] == {"_exec_async": True}
+    assert handle.done()
+
+    result = handle.result()
+    assert result.keys() == ["id", "name"]
+    assert [tuple(r) for r in result] == [(1, "a"), (2, "b")]
+    # The result is built once.
+    assert handle.result() is result
+
+
+def test_done_reflects_query_status(conn, dbapi):
+    handle = submit_async(conn, "select count(*) from t")
+    dbapi.query_status[handle.query_id] = "RUNNING"
+    assert not handle.done()
+    dbapi.query_status[handle.query_id] = "SUCCESS"
+    assert handle.done()
+    assert handle.result().scalar() == 42
+
+
+def test_result_timeout_leaves_query_running(conn, dbapi):
+    handle = submit_async(conn, "select count(*) from t")
+    dbapi.query_status[handle.query_id] = "QUEUED"
+    with pytest.raises(TimeoutError, match=handle.query_id):
+        handle.result(timeout=0.1)
+    dbapi.query_status[handle.query_id] = "SUCCESS"
+    assert handle.result(timeout=1).scalar() == 42
+
+
+def test_failed_query_raises_wrapped_dbapi_error(conn):
+    handle = submit_async(conn, "select broken")
+    with pytest.raises(sa_exc.ProgrammingError) as info:
+        handle.result()
+    assert info.value.orig.errno == 2003
+    assert "select broken" in str(info.value)
+
+
+def test_gather_submits_everything_before_waiting(conn, dbapi):
+    statements = [select(users), text("select count(*) from t")]
+    start = len(dbapi.calls)
+    results = gather_async(conn, statements)
+
+    submitted = dbapi.calls[start:]
+    assert [kwargs for _, _, kwargs in submitted] == [{"_exec_async": True}] * 2
+    assert [r.all() for r in results] == [[(1, "a"), (2, "b")], [(42,)]]
+
+
+def test_async_submit_rejects_executemany(conn):
+    with pytest.raises(sa_exc.ArgumentError, match="executemany"):
+        conn.execution_options(async_submit=True).execute(
+            text("insert into t values (:x)"), [{"x": 1}, {"x": 2}]
+        )
+
+
+def test_blocking_execution_is_unchanged(conn, dbapi):
+    assert conn.execute(text("select count(*) from t")).scalar() == 42
+    assert dbapi.calls[-1][2] == {}
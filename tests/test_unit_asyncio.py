@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the ``snowflake+asyncio`` dialect against a fake connector."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.dialects import registry
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from snowflake.sqlalchemy.aio import (
+    AsyncAdapt_snowflake_dbapi,
+    SnowflakeDialect_asyncio,
+)
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+registry.register("snowflake.asyncio", "snowflake.sqlalchemy.aio", "dialect")
+
+_URL = "snowflake+asyncio://u:p@acct/db/public"
+
+
+class _FakeAioCursor:
+    """Native-style cursor: the connector's asyncio API awaits every call."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    async def __aenter__(self):
+        return self
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def sfqid(self):
+        return self._cursor.sfqid
+
+    async def execute(self, sql, params=None):
+        self._cursor.execute(sql, params)
+        return self
+
+    async def fetchall(self):
+        return self._cursor.fetchall()
+
+    async def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size)
+
+    async def close(self):
+        pass
+
+
+class _FakeAioConnection:
+    def __init__(self, connection):
+        self.sync = connection
+
+    def cursor(self):
+        return _FakeAioCursor(self.sync.cursor())
+
+    async def autocommit(self, mode):
+        self.sync.autocommit(mode)
+
+    async def commit(self):
+        self.sync.commit()
+
+    async def rollback(self):
+        self.sync.rollback()
+
+    async def close(self):
+        self.sync.close()
+
+    def is_closed(self):
+        return self.sync.is_closed()
+
+
+class _FakeAio:
+    def __init__(self, dbapi):
+        self.dbapi = dbapi
+
+    async def connect(self, **kwargs):
+        return _FakeAioConnection(self.dbapi.connect(**kwargs))
+
+
+def _rows_responder(sql):
+    if sql.startswith("select x"):
+        return ["x"], [[i] for i in range(5)]
+    return default_responder(sql)
+
+
+@pytest.fixture(params=["native", "threaded"])
+def engine_and_dbapi(request):
+    dbapi = FakeDBAPI(_rows_responder)
+    aio = _FakeAio(dbapi) if request.param == "native" else None
+    engine = create_async_engine(
+        _URL, module=AsyncAdapt_snowflake_dbapi(dbapi, aio), redact_log_secrets=False
+    )
+    yield engine, dbapi
+    asyncio.run(engine.dispose())
+
+
+def test_url_selects_async_dialect():
+    engine = create_async_engine(_URL)
+    assert isinstance(engine.dialect, SnowflakeDialect_asyncio)
+    assert engine.dialect.is_async
+    assert engine.dialect.driver == "asyncio"
+    # Same compiler as the synchronous dialect, same caching.
+    assert engine.dialect.supports_statement_cache is False
+
+
+def test_import_dbapi_without_connector_aio_uses_threads(monkeypatch):
+    import sys
+
+    monkeypatch.setitem(sys.modules, "snowflake.connector.aio", None)
+    assert not SnowflakeDialect_asyncio.import_dbapi().is_native
+
+
+def test_execute_and_fetch(engine_and_dbapi):
+    engine, dbapi = engine_and_dbapi
+
+    async def go():
+        async with engine.connect() as conn:
+            result = await conn.execute(text("select x from t"))
+            return result.scalars().all()
+
+    assert asyncio.run(go()) == [0, 1, 2, 3, 4]
+    assert "select x from t" in dbapi.log
+
+
+def test_stream_results(engine_and_dbapi):
+    engine, _ = engine_and_dbapi
+
+    async def go():
+        async with engine.connect() as conn:
+            result = await conn.stream(text("select x from t"))
+            return [row.x async for row in result]
+
+    assert asyncio.run(go()) == [0, 1, 2, 3, 4]
+
+
+def test_session_commit_and_rollback(engine_and_dbapi):
+    engine, dbapi = engine_and_dbapi
+
+    async def go():
+        async with AsyncSession(engine) as session:
+            await session.execute(text("insert into t values (1)"))
+            await session.commit()
+            await session.execute(text("insert into t values (2)"))
+            await session.rollback()
+
+    asyncio.run(go())
+    connection = dbapi.connections[0]
+    assert connection.commits == 1
+    assert connection.rollbacks >= 1
+
+
+def test_reflection_through_run_sync(engine_and_dbapi):
+    engine, _ = engine_and_dbapi
+
+    async def go():
+        async with engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).default_schema_name
+            )
+
+    assert asyncio.run(go()) == "public"
+
+
+def test_ddl_through_run_sync(engine_and_dbapi):
+    engine, dbapi = engine_and_dbapi
+    metadata = MetaData()
+    Table("t", metadata, Column("id", Integer, primary_key=True), Column("s", String))
+
+    async def go():
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all, checkfirst=False)
+
+    asyncio.run(go())
+    assert any(sql.startswith("\nCREATE TABLE t") for sql in dbapi.log)
+
+
+def test_concurrent_connections(engine_and_dbapi):
+    engine, dbapi = engine_and_dbapi
+
+    async def one():
+        async with engine.connect() as conn:
+            return (await conn.execute(text("select x from t"))).scalars().all()
+
+    async def go():
+        return await asyncio.gather(*(one() for _ in range(4)))
+
+    assert asyncio.run(go()) == [[0, 1, 2, 3, 4]] * 4
+
+
+def test_operator_stats_threshold_is_rejected():
+    with pytest.raises(sa_exc.ArgumentError, match="operator_stats_threshold"):
+        create_async_engine(_URL, operator_stats_threshold=1)
@@ -0,0 +1,240 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``batch_statements`` multi-statement batching."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import batch_statements
+
+from .fake_dbapi import FakeCursor, FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+metadata = MetaData()
+users = Table("users", metadata, Column("id", Integer), Column("name", String))
+orders = Table("orders", metadata, Column("id", Integer), Column("user_id", Integer))
+
+
+def _responder(sql):
+    if sql.startswith("INSERT INTO broken"):
+        raise ProgrammingError("Object 'BROKEN' does not exist", errno=2003)
+    if sql.startswith("create table"):
+        return ["status"], [["Table successfully created."]]
+    if sql.startswith("insert into orders values (1, 1), (2, 1)"):
+        # The fake reports as many affected rows as it returns.
+        return ["number of rows inserted"], [[2]] * 2
+    if "FROM users" in sql:
+        return ["id", "name"], [[1, "a"]]
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def conn(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def _multi_requests(dbapi, start=0):
+    return [
+        (sql, kwargs["num_statements"])
+        for sql, _, kwargs in dbapi.calls[start:]
+        if kwargs.get("num_statements")
+    ]
+
+
+def test_create_all_is_sent_as_one_request(conn, dbapi):
+    with batch_statements(conn) as batch:
+        metadata.create_all(conn, checkfirst=False)
+        assert batch.pending == 2
+
+    [(sql, count)] = _multi_requests(dbapi)
+    assert count == 2
+    assert [s.startswith("\nCREATE TABLE") for s in sql.split(";\n")] == [True] * 2
+    assert batch.requests == 1
+    query_ids = [s.query_id for s in batch.statements]
+    assert all(query_ids) and len(set(query_ids)) == 2
+
+
+def test_query_flushes_pending_statements_first(conn, dbapi):
+    with batch_statements(conn) as batch:
+        conn.execute(insert(users), {"id": 1, "name": "a"})
+        conn.execute(text("insert into orders values (1, 1)"))
+        assert batch.pending == 2
+        rows = conn.execute(select(users)).all()
+        assert batch.pending == 0
+
+    assert rows == [(1, "a")]
+    assert dbapi.statements == [
+        "INSERT INTO users (id, name) VALUES (1, 'a')",
+        "insert into orders values (1, 1)",
+    ]
+    # The multi-statement request precedes the query.
+    assert dbapi.calls[-1][0].startswith("SELECT")
+    assert dbapi.calls[-2][2] == {"num_statements": 2}
+
+
+def test_row_count_checked_statements_run_alone(conn, dbapi):
+    with batch_statements(conn) as batch:
+        conn.execute(insert(users), {"id": 1, "name": "a"})
+        result = conn.execute(update(users).values(name="b"))
+    assert result.rowcount == 0
+    assert batch.requests == 1
+    assert dbapi.calls[-1][0].startswith("UPDATE users")
+    # One pending statement is sent with a plain execute.
+    assert dbapi.calls[-2][2] == {}
+    assert batch.statements[0].query_id == "01-000002"
+
+
+def test_executemany_flushes_and_runs_alone(conn, dbapi):
+    with batch_statements(conn) as batch:
+        conn.execute(text("create table t (x int)"))
+        conn.execute(text("insert into t values (:x)"), [{"x": 1}, {"x": 2}])
+    assert batch.requests == 1
+    assert [sql for sql, _, _ in dbapi.calls[-3:]] == [
+        "create table t (x int)",
+        "insert into t values (%(x)s)",
+        "insert into t values (%(x)s)",
+    ]
+
+
+def test_max_statements_sends_full_batches(conn, dbapi):
+    with batch_statements(conn, max_statements=2) as batch:
+        for i in range(5):
+            conn.execute(text(f"create table t{i} (x int)"))
+    assert [count for _, count in _multi_requests(dbapi)] == [2, 2]
+    assert batch.requests == 3
+    assert all(s.query_id for s in batch.statements)
+
+
+def test_failed_statement_gets_the_error_and_raises(conn, dbapi):
+    with pytest.raises(sa_exc.ProgrammingError) as info:
+        with batch_statements(conn) as batch:
+            conn.execute(text("create table t (x int)"))
+            conn.execute(text("INSERT INTO broken values (1)"))
+            conn.execute(text("create table u (x int)"))
+    assert info.value.orig.errno == 2003
+    assert info.value.statement == "INSERT INTO broken values (1)"
+    assert [(s.done, s.error) for s in batch.statements] == [
+        (True, None),
+        (False, info.value.orig),
+        (False, None),
+    ]
+    assert batch.statements[0].query_id
+    assert batch.error is info.value.orig
+    assert dbapi.statements == ["create table t (x int)"]
+    assert conn.get_execution_options().get("snowflake_statement_batch") is None
+
+
+def test_failed_request_is_not_blamed_on_a_statement(conn, dbapi):
+    def fail_request(sql, num_statements):
+        raise ProgrammingError("Service unavailable", errno=290503)
+
+    conn.execute(text("select 1"))
+    cursor_cls = type(conn.connection.dbapi_connection.cursor())
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            cursor_cls, "_execute_multi", lambda self, sql, n, q: fail_request(sql, n)
+        )
+        with pytest.raises(sa_exc.ProgrammingError):
+            with batch_statements(conn) as batch:
+                conn.execute(text("create table t (x int)"))
+                conn.execute(text("create table u (x int)"))
+    assert [(s.done, s.error) for s in batch.statements] == [(False, None)] * 2
+    assert batch.error.errno == 290503
+
+
+def test_row_counts_are_mapped_to_statements(conn, dbapi):
+    with batch_statements(conn) as batch:
+        conn.execute(text("create table t (x int)"))
+        conn.execute(text("insert into orders values (1, 1), (2, 1)"))
+    assert [s.rowcount for s in batch.statements] == [1, 2]
+    assert all(s.done for s in batch.statements)
+    query_ids = [s.query_id for s in batch.statements]
+    assert all(query_ids) and len(set(query_ids)) == 2
+
+
+def test_results_are_matched_to_their_statements(conn, dbapi, monkeypatch):
+    cursors = []
+    execute_multi = FakeCursor._execute_multi
+
+    def spy(self, *args):
+        cursors.append(self)
+        return execute_multi(self, *args)
+
+    monkeypatch.setattr(FakeCursor, "_execute_multi", spy)
+    with batch_statements(conn) as batch:
+        conn.execute(text("insert into orders values (1, 1), (2, 1)"))
+        conn.execute(text("create table t (x int)"))
+        conn.execute(text("create table u (x int)"))
+    [cursor] = cursors
+    assert [s.query_id for s in batch.statements] == cursor.multi_statement_savedIds
+    assert [s.rowcount for s in batch.statements] == [2, 1, 1]
+
+
+def test_failed_first_statement_gets_the_error(conn, dbapi):
+    with pytest.raises(sa_exc.ProgrammingError) as info:
+        with batch_statements(conn) as batch:
+            conn.execute(text("INSERT INTO broken values (1)"))
+            conn.execute(text("create table t (x int)"))
+    assert info.value.statement == "INSERT INTO broken values (1)"
+    assert [(s.done, s.error) for s in batch.statements] == [
+        (False, info.value.orig),
+        (False, None),
+    ]
+
+
+def test_statements_ending_in_a_line_comment_run_alone(conn, dbapi):
+    with batch_statements(conn) as batch:
+        conn.execute(text("create table t (x int);"))
+        conn.execute(text("create table u (x int) -- scratch"))
+        conn.execute(text("create table v (x int)"))
+        conn.execute(text("create table w (x int)"))
+    assert [sql for sql, _, _ in dbapi.calls[-3:]] == [
+        "create table t (x int)",
+        "create table u (x int) -- scratch",
+        "create table v (x int);\ncreate table w (x int)",
+    ]
+    assert batch.requests == 2
+
+
+def test_exception_in_block_discards_pending(conn, dbapi):
+    start = len(dbapi.calls)
+    with pytest.raises(RuntimeError):
+        with batch_statements(conn) as batch:
+            conn.execute(text("create table t (x int)"))
+            raise RuntimeError("boom")
+    assert dbapi.calls[start:] == []
+    assert batch.pending == 0
+    # Statements run normally again after the block.
+    conn.execute(text("create table t (x int)"))
+    assert dbapi.calls[-1][0] == "create table t (x int)"
+
+
+def test_nested_batches_are_rejected(conn):
+    with batch_statements(conn):
+        with pytest.raises(sa_exc.InvalidRequestError, match="already active"):
+            with batch_statements(conn):
+                pass
@@ -0,0 +1,167 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the ``timeout`` option and server-side cancellation."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy.cancellation import _cancel
+
+from .fake_dbapi import FakeCursor, FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+
+class _Responder:
+    def __init__(self):
+        self.raise_on_slow: BaseException | None = None
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, sql):
+        if "slow" in sql:
+            if self.raise_on_slow is not None:
+                raise self.raise_on_slow
+            self.started.set()
+            self.release.wait(5)
+            return ["x"], [[1]]
+        return default_responder(sql)
+
+
+@pytest.fixture
+def responder():
+    return _Responder()
+
+
+@pytest.fixture
+def dbapi(responder):
+    return FakeDBAPI(responder)
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    yield engine
+    engine.dispose()
+
+
+def _cancels(dbapi):
+    return [sql for sql in dbapi.log if "SYSTEM$CANCEL" in sql]
+
+
+def test_timeout_is_passed_to_the_connector(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execute(text("select 1").execution_options(timeout=30))
+        conn.execute(text("select 2"))
+    *_, (_, _, with_timeout), (_, _, without) = dbapi.calls
+    assert with_timeout == {"timeout": 30}
+    assert without == {}
+
+
+@pytest.mark.parametrize("timeout", [0, -1, "5", True])
+def test_invalid_timeout_is_rejected(engine, timeout):
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.ArgumentError, match="timeout"):
+            conn.execution_options(timeout=timeout).execute(text("select 1"))
+
+
+def test_connection_stays_usable_after_timeout(engine, dbapi, responder):
+    # The connector cancels the query itself when the timeout expires.
+    responder.raise_on_slow = ProgrammingError(
+        "SQL execution was cancelled by the client due to a timeout", errno=604
+    )
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.ProgrammingError):
+            conn.execute(text("select slow").execution_options(timeout=1))
+        conn.rollback()
+        assert conn.execute(text("select 1")).all() == []
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    assert len(dbapi.connections) == 1
+    assert not dbapi.connections[0].closed
+    assert _cancels(dbapi) == []
+
+
+@pytest.mark.parametrize("interrupt", [KeyboardInterrupt, asyncio.CancelledError])
+def test_interrupted_statement_is_cancelled(engine, dbapi, responder, interrupt):
+    responder.raise_on_slow = interrupt()
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        with pytest.raises(interrupt):
+            conn.execute(text("select slow"))
+    # The query id never arrived, so the session's queries are cancelled.
+    session_id = dbapi.connections[0].session_id
+    assert _cancels(dbapi) == [f"SELECT SYSTEM$CANCEL_ALL_QUERIES({session_id})"]
+    assert len(engine.dialect._running_statements) == 0
+    # The interrupted connection is replaced; the pool keeps serving.
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    assert dbapi.connections[0].closed
+    assert not dbapi.connections[-1].closed
+
+
+def test_dispose_cancels_running_statements(engine, dbapi, responder):
+    errors = []
+
+    def run():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("select slow")).all()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    assert responder.started.wait(5)
+    assert len(engine.dialect._running_statements) == 1
+    engine.dispose()
+    responder.release.set()
+    worker.join(5)
+    assert errors == []
+    session_id = dbapi.connections[0].session_id
+    assert _cancels(dbapi) == [f"SELECT SYSTEM$CANCEL_ALL_QUERIES({session_id})"]
+    assert len(engine.dialect._running_statements) == 0
+
+
+def test_stale_query_id_of_reused_cursor_is_not_cancelled(engine, dbapi, responder):
+    # The session parameters are sent on the statement's own cursor first.
+    responder.raise_on_slow = KeyboardInterrupt()
+    with engine.connect() as conn:
+        with pytest.raises(KeyboardInterrupt):
+            conn.execution_options(session_parameters={"QUERY_TAG": "x"}).execute(
+                text("select slow")
+            )
+    session_id = dbapi.connections[0].session_id
+    assert _cancels(dbapi) == [f"SELECT SYSTEM$CANCEL_ALL_QUERIES({session_id})"]
+
+
+def test_dispose_without_running_statements_sends_nothing(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    engine.dispose()
+    assert _cancels(dbapi) == []
+
+
+def test_cancel_before_query_id_is_known_cancels_the_session(dbapi):
+    connection = dbapi.connect()
+    assert _cancel(connection, FakeCursor(connection))
+    assert dbapi.log == [f"SELECT SYSTEM$CANCEL_ALL_QUERIES({connection.session_id})"]
+
+
+def test_cancel_by_query_id_once_it_changed(dbapi):
+    connection = dbapi.connect()
+    cursor = FakeCursor(connection)
+    cursor.sfqid = "01-000042"
+    assert _cancel(connection, cursor, "01-000041")
+    assert _cancel(connection, cursor, "01-000042")
+    assert dbapi.log == [
+        "SELECT SYSTEM$CANCEL_QUERY('01-000042')",
+        f"SELECT SYSTEM$CANCEL_ALL_QUERIES({connection.session_id})",
+    ]
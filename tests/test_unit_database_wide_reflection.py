@@ -0,0 +1,294 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for opt-in database-wide reflection.
+
+With ``enable_database_wide_reflection`` the schema-wide constraint helpers are
+served from one ``SHOW ... IN DATABASE`` per constraint kind, and column
+reflection from one database-level ``information_schema.columns`` query, both
+partitioned client-side by schema.  The mock connection below answers those
+commands from a small in-memory catalog and records every statement so the
+tests can assert how many round trips a multi-schema reflection needs.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy.snowdialect import SnowflakeDialect
+
+_DB = "MYDB"
+
+
+class _Row(tuple):
+    """Tuple row that also exposes ``_mapping`` like a SQLAlchemy ``Row``."""
+
+    def __new__(cls, mapping):
+        row = super().__new__(cls, mapping.values())
+        row._mapping = mapping
+        return row
+
+
+def _pk(schema, table, column, seq=1):
+    return _Row(
+        {
+            "database_name": _DB,
+            "schema_name": schema,
+            "table_name": table,
+            "column_name": column,
+            "key_sequence": seq,
+            "constraint_name": f"PK_{table}",
+        }
+    )
+
+
+def _uk(schema, table, column, seq=1):
+    return _Row(
+        {
+            "database_name": _DB,
+            "schema_name": schema,
+            "table_name": table,
+            "column_name": column,
+            "key_sequence": seq,
+            "constraint_name": f"UK_{table}",
+        }
+    )
+
+
+def _fk(fk_schema, fk_table, pk_schema, pk_table):
+    return _Row(
+        {
+            "pk_database_name": _DB,
+            "pk_schema_name": pk_schema,
+            "pk_table_name": pk_table,
+            "pk_column_name": "ID",
+            "fk_database_name": _DB,
+            "fk_schema_name": fk_schema,
+            "fk_table_name": fk_table,
+            "fk_column_name": f"{pk_table}_ID",
+            "key_sequence": 1,
+            "update_rule": "NO ACTION",
+            "delete_rule": "NO ACTION",
+            "fk_name": f"FK_{fk_table}_{pk_table}",
+        }
+    )
+
+
+def _column(schema, table, column):
+    return (schema, table, column, "NUMBER", None, 38, 0, "YES", None, "NO")
+
+
+_CATALOG = {
+    "PRIMARY KEYS": [_pk("S1", "A", "ID"), _pk("S2", "B", "ID")],
+    "UNIQUE KEYS": [_uk("S1", "A", "CODE")],
+    "IMPORTED KEYS": [
+        _fk("S1", "C", "S1", "A"),
+        _fk("S2", "B", "S1", "A"),
+    ],
+}
+
+
+def _mock_conn(columns_error=None, show_error=None):
+    conn = MagicMock()
+    log: list[str] = []
+
+    def _execute(stmt, params=None):
+        sql = str(stmt)
+        log.append(sql)
+        result = MagicMock()
+        if "current_database" in sql.lower():
+            result.fetchone.return_value = (_DB, "PUBLIC")
+            return result
+        if show_error is not None and "IN DATABASE" in sql:
+            raise show_error
+        for kind, rows in _CATALOG.items():
+            if f"{kind} IN DATABASE" in sql:
+                result.__iter__ = lambda s, rows=rows: iter(rows)
+                return result
+        if "information_schema.columns" in sql:
+            if columns_error is not None:
+                raise columns_error
+            rows = [
+                _column("S1", "A", "ID") + (None,) * 7,
+                _column("S2", "B", "ID") + (None,) * 7,
+            ]
+            result.__iter__ = lambda s: iter(rows)
+            return result
+        result.__iter__ = lambda s: iter([])
+        return result
+
+    conn.execute.side_effect = _execute
+    return conn, log
+
+
+@pytest.fixture
+def dialect():
+    d = SnowflakeDialect(enable_database_wide_reflection=True)
+    d.default_schema_name = "public"
+    return d
+
+
+def test_constraints_for_many_schemas_use_one_show_per_kind(dialect):
+    conn, log = _mock_conn()
+    info_cache: dict = {}
+    for schema in ("s1", "s2", "s3"):
+        dialect.get_multi_pk_constraint(conn, schema=schema, info_cache=info_cache)
+        dialect.get_multi_unique_constraints(conn, schema=schema, info_cache=info_cache)
+        dialect.get_multi_foreign_keys(conn, schema=schema, info_cache=info_cache)
+
+    show_statements = [sql for sql in log if sql.startswith("SHOW")]
+    assert show_statements == [
+        'SHOW /* sqlalchemy:_get_database_constraint_rows */ PRIMARY KEYS IN DATABASE "MYDB"',
+        'SHOW /* sqlalchemy:_get_database_constraint_rows */ UNIQUE KEYS IN DATABASE "MYDB"',
+        'SHOW /* sqlalchemy:_get_database_constraint_rows */ IMPORTED KEYS IN DATABASE "MYDB"',
+    ]
+
+
+def test_constraints_are_partitioned_by_schema(dialect):
+    conn, _ = _mock_conn()
+    info_cache: dict = {}
+    s1_pks = dict(
+        dialect.get_multi_pk_constraint(conn, schema="s1", info_cache=info_cache)
+    )
+    s2_pks = dict(
+        dialect.get_multi_pk_constraint(conn, schema="s2", info_cache=info_cache)
+    )
+    s3_pks = dict(
+        dialect.get_multi_pk_constraint(conn, schema="s3", info_cache=info_cache)
+    )
+    assert s1_pks == {("s1", "a"): {"constrained_columns": ["id"], "name": "pk_a"}}
+    assert s2_pks == {("s2", "b"): {"constrained_columns": ["id"], "name": "pk_b"}}
+    assert s3_pks == {}
+
+    s1_uks = dict(
+        dialect.get_multi_unique_constraints(conn, schema="s1", info_cache=info_cache)
+    )
+    assert s1_uks == {("s1", "a"): [{"column_names": ["code"], "name": "uk_a"}]}
+
+
+def test_foreign_keys_keep_per_schema_referred_schema_semantics(dialect):
+    """FKs are parsed per schema, so _get_same_schemas_for_fk_reflection applies."""
+    dialect.default_schema_name = "s1"
+    conn, _ = _mock_conn()
+    info_cache: dict = {}
+    s1_fks = dict(
+        dialect.get_multi_foreign_keys(conn, schema="s1", info_cache=info_cache)
+    )
+    s2_fks = dict(
+        dialect.get_multi_foreign_keys(conn, schema="s2", info_cache=info_cache)
+    )
+    # Reflecting the default schema: same-schema target reported as None.
+    assert s1_fks[("s1", "c")][0]["referred_schema"] is None
+    # Reflecting a non-default schema: the actual target schema is kept.
+    assert s2_fks[("s2", "b")][0]["referred_schema"] == "s1"
+
+
+def test_per_schema_results_are_cached_under_per_schema_keys(dialect):
+    conn, _ = _mock_conn()
+    info_cache: dict = {}
+    dialect._get_schema_primary_keys(conn, '"MYDB"."S1"', info_cache=info_cache)
+    dialect._get_schema_primary_keys(conn, '"MYDB"."S2"', info_cache=info_cache)
+
+    assert ("_get_schema_primary_keys", ('"MYDB"."S1"',), ()) in info_cache
+    assert ("_get_schema_primary_keys", ('"MYDB"."S2"',), ()) in info_cache
+    assert (
+        "_get_database_constraint_rows",
+        ("PRIMARY KEYS", "MYDB"),
+        (),
+    ) in info_cache
+    assert conn.execute.call_count == 1
+
+
+def test_columns_for_many_schemas_use_one_information_schema_query(dialect):
+    conn, log = _mock_conn()
+    info_cache: dict = {}
+    s1 = dict(dialect.get_multi_columns(conn, schema="s1", info_cache=info_cache))
+    s2 = dict(dialect.get_multi_columns(conn, schema="s2", info_cache=info_cache))
+
+    assert [c["name"] for c in s1[("s1", "a")]] == ["id"]
+    assert [c["name"] for c in s2[("s2", "b")]] == ["id"]
+    assert s1[("s1", "a")][0]["primary_key"] is True
+
+    column_queries = [sql for sql in log if "information_schema.columns" in sql]
+    assert len(column_queries) == 1
+    assert "table_schema=" not in column_queries[0]
+
+
+def test_columns_fall_back_to_per_schema_query_on_result_size_error(dialect):
+    class _Orig(Exception):
+        errno = 90030
+
+    error = sa_exc.ProgrammingError("SELECT", {}, _Orig())
+    conn, log = _mock_conn(columns_error=error)
+    info_cache: dict = {}
+    assert (
+        dialect._query_all_columns_info(conn, '"MYDB"."S1"', info_cache=info_cache)
+        is None
+    )
+    column_queries = [sql for sql in log if "information_schema.columns" in sql]
+    # The database-wide query failed, then the per-schema query was tried.
+    assert len(column_queries) == 2
+    assert "table_schema=:table_schema" in column_queries[1]
+
+
+def test_failed_database_column_query_runs_once(dialect):
+    class _Orig(Exception):
+        errno = 90030
+
+    error = sa_exc.ProgrammingError("SELECT", {}, _Orig())
+    conn, log = _mock_conn(columns_error=error)
+    info_cache: dict = {}
+    for schema in ('"MYDB"."S1"', '"MYDB"."S2"', '"MYDB"."S3"'):
+        dialect._query_all_columns_info(conn, schema, info_cache=info_cache)
+    column_queries = [sql for sql in log if "information_schema.columns" in sql]
+    assert len([sql for sql in column_queries if "table_schema=" not in sql]) == 1
+    assert len(column_queries) == 4
+
+
+def test_failed_database_show_falls_back_to_schema_show(dialect):
+    conn = MagicMock()
+    results = MagicMock()
+    results.__iter__ = lambda s: iter([_pk("S1", "A", "ID")])
+    conn.execute.side_effect = [
+        sa_exc.ProgrammingError("SHOW", {}, Exception("insufficient privileges")),
+        results,
+    ]
+    pks = dialect._get_schema_primary_keys(conn, '"MYDB"."S1"', info_cache={})
+    assert pks == {"a": {"constrained_columns": ["id"], "name": "pk_a"}}
+    assert "PRIMARY KEYS IN SCHEMA" in str(conn.execute.call_args_list[1][0][0])
+
+
+def test_failed_database_show_runs_once(dialect):
+    error = sa_exc.ProgrammingError("SHOW", {}, Exception("insufficient privileges"))
+    conn, log = _mock_conn(show_error=error)
+    info_cache: dict = {}
+    for schema in ("s1", "s2", "s3"):
+        dialect.get_multi_pk_constraint(conn, schema=schema, info_cache=info_cache)
+    assert len([sql for sql in log if "IN DATABASE" in sql]) == 1
+    assert len([sql for sql in log if "PRIMARY KEYS IN SCHEMA" in sql]) == 3
+
+
+@pytest.mark.parametrize("info_cache", [None, {}])
+def test_disabled_or_uncached_uses_schema_commands(info_cache):
+    dialect = SnowflakeDialect(
+        enable_database_wide_reflection=info_cache is None,
+    )
+    conn, log = _mock_conn()
+    dialect._get_schema_primary_keys(conn, '"MYDB"."S1"', info_cache=info_cache)
+    assert log == [
+        'SHOW /* sqlalchemy:_get_schema_primary_keys */ PRIMARY KEYS IN SCHEMA "MYDB"."S1"'
+    ]
+
+
+def test_database_wide_reflection_url_parameter():
+    from sqlalchemy.engine.url import make_url
+
+    dialect = SnowflakeDialect()
+    _, opts = dialect.create_connect_args(
+        make_url("snowflake://u:p@acct/db?enable_database_wide_reflection=true")
+    )
+    assert dialect._enable_database_wide_reflection is True
+    assert "enable_database_wide_reflection" not in opts
@@ -0,0 +1,148 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for statement fingerprints and the ``fingerprint_tag`` option."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import RingBufferSink, statement_fingerprint
+
+from .fake_dbapi import FakeDBAPI
+
+_URL = "snowflake://u:p@acct/db/public"
+
+_table = Table("t", MetaData(), Column("id", Integer), Column("name", String))
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI()
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("select * from t where id = 1", "SELECT *\n  FROM t WHERE id = 42"),
+        ("select * from t where name = 'a'", "select * from t where name = 'it''s'"),
+        ("select * from t where id in (1, 2)", "select * from t where id in (1, 2, 3)"),
+        ("insert into t values (1, 'a')", "insert into t values (2, 'b'), (3, 'c')"),
+        ("select x from anon_1", "select x from anon_2 -- trailing comment"),
+        ("select %(id_1)s", "select /* hint */ %(id_2)s"),
+    ],
+)
+def test_same_shape_same_fingerprint(first, second):
+    assert statement_fingerprint(first) == statement_fingerprint(second)
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("select * from t", "select * from u"),
+        ('select "Name" from t', 'select "NAME" from t'),
+        ("select a::int from t", "select a::varchar from t"),
+        ("select t1 from t", "select t2 from t"),
+    ],
+)
+def test_different_shape_different_fingerprint(first, second):
+    assert statement_fingerprint(first) != statement_fingerprint(second)
+
+
+def test_context_fingerprint_ignores_bound_values_and_in_list_length(engine):
+    with engine.connect() as conn:
+        fingerprints = {
+            conn.execute(
+                select(_table.c.name).where(_table.c.id.in_(ids))
+            ).context.statement_fingerprint
+            for ids in ([1], [1, 2, 3], list(range(50)))
+        }
+        other = conn.execute(select(_table.c.id)).context.statement_fingerprint
+    assert len(fingerprints) == 1
+    assert other not in fingerprints
+
+
+def test_compiled_fingerprint_is_reused_from_statement_cache(engine):
+    engine.dialect._supports_statement_cache = True
+    stmt = select(_table.c.name).where(_table.c.id == 5)
+    with engine.connect() as conn:
+        first = conn.execute(stmt).context
+        second = conn.execute(select(_table.c.name).where(_table.c.id == 7)).context
+    assert second.compiled is first.compiled
+    assert second.statement_fingerprint == first.compiled._snowflake_fingerprint
+
+
+def test_query_tag_is_sent_with_the_statement(engine, dbapi):
+    with engine.connect() as conn:
+        start = len(dbapi.calls)
+        context = (
+            conn.execution_options(
+                fingerprint_tag="query_tag", fingerprint_label="orders-api"
+            )
+            .execute(select(_table.c.id))
+            .context
+        )
+    calls = dbapi.calls[start:]
+    [(sql, _, kwargs)] = [call for call in calls if call[0].startswith("SELECT")]
+    assert sql == "SELECT t.id \nFROM t"
+    tag = json.loads(kwargs["_statement_params"]["QUERY_TAG"])
+    assert tag == {"fingerprint": context.statement_fingerprint, "label": "orders-api"}
+    assert not any(sql.startswith("ALTER SESSION") for sql, _, _ in calls)
+
+
+def test_comment_is_appended_to_the_statement(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(fingerprint_tag="comment").execute(
+            select(_table.c.id).where(_table.c.name == literal("100%"))
+        )
+        conn.execution_options(fingerprint_tag="comment").execute(
+            text("select 1 from t")
+        )
+    *_, (select_sql, params, kwargs), (text_sql, _, _) = dbapi.calls
+    assert select_sql.endswith(
+        f' /* {{"fingerprint":"{statement_fingerprint(select_sql)}"}} */'
+    )
+    assert params == {"param_1": "100%"}
+    assert kwargs == {}
+    assert text_sql.startswith("select 1 from t /* {")
+
+
+def test_invalid_mode_and_label_are_rejected(engine):
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.ArgumentError, match="fingerprint_tag"):
+            conn.execution_options(fingerprint_tag="header").execute(text("select 1"))
+        with pytest.raises(sa_exc.ArgumentError, match="fingerprint_label"):
+            conn.execution_options(
+                fingerprint_tag="comment", fingerprint_label="x */ drop table t"
+            ).execute(text("select 1"))
+
+
+def test_timings_carry_fingerprint(dbapi):
+    sink = RingBufferSink()
+    engine = create_engine(_URL, module=dbapi, statement_sink=sink)
+    with engine.connect() as conn:
+        conn.execute(text("select 1 from t where id = 3")).all()
+    assert sink.records[-1].fingerprint == statement_fingerprint(
+        "select 1 from t where id = 4"
+    )
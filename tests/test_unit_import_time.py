@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Import-time budget for ``import snowflake.sqlalchemy``.
+
+The package resolves its public names lazily (PEP 562), so importing it, or
+building a URL, must not load the dialect, ``snowflake.connector``, the custom
+table classes, telemetry or the Alembic helpers.  Each check runs in a fresh
+interpreter so modules imported by other tests do not leak in.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Budget for the package's own import time, measured with ``-X importtime``
+# after SQLAlchemy is already imported.  The lazy package takes ~2ms locally;
+# the budget leaves room for slow CI machines while still catching a
+# regression back to eager imports (which cost hundreds of milliseconds).
+IMPORT_BUDGET_US = 50_000
+
+_HEAVY_MODULES = (
+    "snowflake.connector",
+    "snowflake.sqlalchemy.snowdialect",
+    "snowflake.sqlalchemy.base",
+    "snowflake.sqlalchemy._telemetry",
+    "snowflake.sqlalchemy.alembic_util",
+    "snowflake.sqlalchemy.sql.custom_schema",
+)
+
+
+def _loaded_modules(code: str) -> set[str]:
+    script = f"import sys, json\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(out.splitlines()[-1]))
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import snowflake.sqlalchemy",
+        "from snowflake.sqlalchemy import URL, VARCHAR\n"
+        "URL(account='acct', user='me', database='db')",
+    ],
+    ids=["import", "build_url"],
+)
+def test_heavy_modules_are_not_imported_eagerly(code):
+    loaded = _loaded_modules(code)
+    assert not [m for m in _HEAVY_MODULES if m in loaded]
+
+
+def test_public_names_resolve_on_first_access():
+    loaded = _loaded_modules(
+        "import snowflake.sqlalchemy as sf\n"
+        "assert sf.SnowflakeTable.__name__ == 'SnowflakeTable'\n"
+        "assert sf.dialect.name == 'snowflake'\n"
+        "assert sf.base.dialect is sf.dialect\n"
+        "assert sf.__version__"
+    )
+    assert "snowflake.sqlalchemy.sql.custom_schema.snowflake_table" in loaded
+    assert "snowflake.sqlalchemy.snowdialect" in loaded
+    # The DBAPI is only loaded by create_engine, through import_dbapi.
+    assert "snowflake.connector" not in loaded
+
+
+def test_unknown_attribute_raises_attribute_error():
+    import snowflake.sqlalchemy as sf
+
+    with pytest.raises(AttributeError):
+        sf.NoSuchThing  # noqa: B018
+    assert "SnowflakeTable" in dir(sf)
+
+
+def test_import_time_within_budget():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sqlalchemy, sqlalchemy.types\nimport snowflake.sqlalchemy",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | module".
+    cumulative = {
+        fields[2].strip(): int(fields[1])
+        for fields in (
+            line.split(":", 1)[1].split("|")
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "self [us]" not in line
+        )
+    }
+    assert cumulative["snowflake.sqlalchemy"] < IMPORT_BUDGET_US
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the single-query dialect initialization and its cache."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from snowflake.sqlalchemy import _initialization_cache
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+
+@pytest.fixture(autouse=True)
+def _clear_process_cache():
+    _initialization_cache.clear()
+    yield
+    _initialization_cache.clear()
+
+
+def _first_connect(url=_URL, **kwargs):
+    dbapi = FakeDBAPI()
+    engine = create_engine(url, module=dbapi, **kwargs)
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    engine.dispose()
+    return engine, dbapi.log
+
+
+def test_initialize_uses_one_probe_query():
+    engine, log = _first_connect()
+    assert log == [
+        "SELECT CURRENT_VERSION(), CURRENT_DATABASE(), CURRENT_SCHEMA()",
+        "select 1",
+    ]
+    assert engine.dialect.server_version_info == (9, 30, 0)
+    assert engine.dialect.default_schema_name == "public"
+
+
+def test_current_database_and_schema_come_from_the_probe():
+    def responder(sql):
+        if sql.startswith("select current_database()"):
+            return ["database", "schema"], [["OTHER", "S"]]
+        return default_responder(sql)
+
+    dbapi = FakeDBAPI(responder)
+    engine = create_engine(_URL, module=dbapi)
+    dialect = engine.dialect
+    with engine.connect() as conn:
+        dialect._initialization_probe = ["9.30.0", "DB", "PUBLIC"]
+        try:
+            assert dialect._current_database_schema(conn) == ("db", "public")
+        finally:
+            dialect._initialization_probe = None
+        assert not any("current_database()" in sql for sql in dbapi.log)
+        assert dialect._current_database_schema(conn) == ("other", "s")
+    assert dbapi.log[-1] == "select current_database(), current_schema();"
+
+
+def test_probe_not_reused_without_ttl():
+    _first_connect()
+    _, log = _first_connect()
+    assert len([sql for sql in log if "CURRENT_VERSION" in sql]) == 1
+
+
+def test_probe_reused_across_engines_with_ttl():
+    _first_connect(initialization_cache_ttl=60)
+    engine, log = _first_connect(initialization_cache_ttl=60)
+    assert log == ["select 1"]
+    assert engine.dialect.server_version_info == (9, 30, 0)
+    assert engine.dialect.default_schema_name == "public"
+
+
+@pytest.mark.parametrize(
+    "other_url",
+    [
+        "snowflake://u:p@acct/db/other",
+        "snowflake://u:p@acct/db/public?role=analyst",
+        "snowflake://v:p@acct/db/public",
+    ],
+)
+def test_cache_is_keyed_by_identity_and_role(other_url):
+    _first_connect(initialization_cache_ttl=60)
+    _, log = _first_connect(other_url, initialization_cache_ttl=60)
+    assert any("CURRENT_VERSION" in sql for sql in log)
+
+
+def test_expired_entries_are_probed_again(monkeypatch):
+    _first_connect(initialization_cache_ttl=60)
+    now = _initialization_cache.time.time()
+    monkeypatch.setattr(_initialization_cache.time, "time", lambda: now + 61)
+    _, log = _first_connect(initialization_cache_ttl=60)
+    assert any("CURRENT_VERSION" in sql for sql in log)
+
+
+def test_disk_cache_survives_process_cache(tmp_path):
+    path = tmp_path / "init.json"
+    url = f"{_URL}?initialization_cache_ttl=60&initialization_cache_path={path}"
+    _first_connect(url)
+    stored = json.loads(path.read_text())
+    assert [entry[1] for entry in stored.values()] == [["9.30.0", "DB", "PUBLIC"]]
+    assert all(len(key) == 64 for key in stored)  # digests, not URLs
+
+    _initialization_cache.clear()  # a fresh process
+    engine, log = _first_connect(url)
+    assert log == ["select 1"]
+    assert engine.dialect.default_schema_name == "public"
+
+
+def test_unreadable_disk_cache_is_ignored(tmp_path):
+    path = tmp_path / "init.json"
+    path.write_text("not json")
+    engine, log = _first_connect(
+        initialization_cache_ttl=60, initialization_cache_path=str(path)
+    )
+    assert engine.dialect.server_version_info == (9, 30, 0)
+    assert json.loads(path.read_text())
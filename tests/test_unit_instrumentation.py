@@ -0,0 +1,226 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``statement_sink`` per-statement timings."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import LoggingSink, RingBufferSink, StatementTiming
+from snowflake.sqlalchemy.instrumentation import _result_bytes
+
+from .fake_dbapi import FakeCursor, FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+_table = Table("t", MetaData(), Column("id", Integer))
+
+
+def _responder(sql):
+    if "missing" in sql:
+        raise ProgrammingError("Object 'MISSING' does not exist", errno=2003)
+    if sql.startswith("SELECT t.id"):
+        return ["id"], [[1], [2], [3]]
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def sink():
+    return RingBufferSink()
+
+
+@pytest.fixture
+def engine(dbapi, sink):
+    engine = create_engine(_URL, module=dbapi, statement_sink=sink)
+    yield engine
+    engine.dispose()
+
+
+def _user_records(sink):
+    return [t for t in sink if "CURRENT_VERSION()" not in t.statement]
+
+
+def test_select_is_reported_once_consumed(engine, dbapi, sink):
+    with engine.connect() as conn:
+        sink.clear()
+        result = conn.execute(select(_table.c.id))
+        assert len(sink) == 0
+        assert result.fetchall() == [(1,), (2,), (3,)]
+
+    [timing] = _user_records(sink)
+    assert timing.statement.startswith("SELECT t.id")
+    assert timing.query_id.startswith("01-")
+    assert timing.rowcount == 3
+    assert timing.error is None
+    assert not timing.cache_hit
+    assert timing.compile > 0
+    assert timing.total >= timing.compile + timing.bind + timing.execute
+    assert timing.fetch > 0
+
+
+def test_cached_statement_has_no_compile_phase(engine, sink):
+    # The sync dialect does not opt in to the statement cache.
+    engine.dialect._supports_statement_cache = True
+    with engine.connect() as conn:
+        for _ in range(2):
+            conn.execute(select(_table.c.id)).all()
+
+    first, second = _user_records(sink)
+    assert not first.cache_hit and first.compile > 0
+    assert second.cache_hit and second.compile == 0
+
+
+def test_statement_without_rows_is_reported_at_execution(engine, sink):
+    with engine.connect() as conn:
+        sink.clear()
+        conn.execute(_table.insert(), {"id": 1})
+        assert [t.statement for t in sink] == ["INSERT INTO t (id) VALUES (%(id)s)"]
+
+
+def test_partially_read_result_is_reported_on_close(engine, sink):
+    with engine.connect() as conn:
+        sink.clear()
+        result = conn.execute(select(_table.c.id))
+        assert result.fetchone() == (1,)
+        assert len(sink) == 0
+        result.close()
+        assert len(sink) == 1
+
+
+def test_yield_per_keeps_timing(engine, sink):
+    with engine.connect() as conn:
+        sink.clear()
+        result = conn.execution_options(yield_per=1).execute(select(_table.c.id))
+        assert [row.id for row in result] == [1, 2, 3]
+    [timing] = sink
+    assert timing.fetch > 0
+
+
+def test_failed_statement_is_reported_with_error(engine, sink):
+    with engine.connect() as conn:
+        sink.clear()
+        with pytest.raises(sa_exc.ProgrammingError):
+            conn.execute(text("select * from missing"))
+    [timing] = sink
+    assert isinstance(timing.error, ProgrammingError)
+    assert timing.as_dict()["error"].startswith("ProgrammingError")
+
+
+def test_failing_sink_does_not_break_execution(dbapi):
+    def sink(timing):
+        raise RuntimeError("sink down")
+
+    engine = create_engine(_URL, module=dbapi, statement_sink=sink)
+    with engine.connect() as conn:
+        assert conn.execute(select(_table.c.id)).all() == [(1,), (2,), (3,)]
+
+
+def test_without_sink_nothing_is_recorded(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        result = conn.execute(select(_table.c.id))
+        assert type(result.cursor_strategy).__name__ != "_TimedFetchStrategy"
+        result.all()
+
+
+def test_ring_buffer_keeps_last_records():
+    sink = RingBufferSink(maxlen=2)
+    for statement in ("a", "b", "c"):
+        sink(StatementTiming(statement))
+    assert [t.statement for t in sink] == ["b", "c"]
+
+
+def test_logging_sink_threshold(caplog):
+    sink = LoggingSink(min_total=1.0)
+    fast, slow = StatementTiming("fast"), StatementTiming("slow")
+    slow.total = 2.0
+    with caplog.at_level(logging.INFO, logger="snowflake.sqlalchemy.instrumentation"):
+        sink(fast)
+        sink(slow)
+    assert [r.getMessage().endswith("statement=slow") for r in caplog.records] == [True]
+
+
+def test_result_bytes_sums_known_batch_sizes():
+    class Batch:
+        def __init__(self, size):
+            self.uncompressed_size = size
+
+    class Cursor:
+        def get_result_batches(self):
+            return [Batch(10), Batch(None), Batch(5)]
+
+    assert _result_bytes(Cursor()) == 15
+    assert _result_bytes(object()) is None
+
+
+def test_cached_rows_report_the_originating_query(engine, dbapi, sink):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        sink.clear()
+        for _ in range(2):
+            cached.execute(select(_table.c.id)).all()
+
+    first, second = _user_records(sink)
+    assert sum(sql.startswith("SELECT t.id") for sql in dbapi.log) == 1
+    assert second.query_id == first.query_id is not None
+    assert second.rowcount == first.rowcount == 3
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_bytes_fetched_is_opt_in(dbapi, sink, monkeypatch, enabled):
+    class Batch:
+        uncompressed_size = 7
+
+    calls = []
+
+    def get_result_batches(self):
+        calls.append(self)
+        return [Batch()]
+
+    monkeypatch.setattr(
+        FakeCursor, "get_result_batches", get_result_batches, raising=False
+    )
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, statement_bytes_fetched=enabled
+    )
+    with engine.connect() as conn:
+        sink.clear()
+        conn.execute(select(_table.c.id)).fetchall()
+    engine.dispose()
+
+    [timing] = _user_records(sink)
+    assert timing.bytes_fetched == (7 if enabled else None)
+    assert bool(calls) is enabled
+
+
+def test_opentelemetry_sink_records_span():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from snowflake.sqlalchemy import OpenTelemetrySink
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    timing = StatementTiming("select 1")
+    timing.query_id = "01-000001"
+    timing.total = 0.5
+    OpenTelemetrySink(provider.get_tracer("test"))(timing)
+
+    [span] = exporter.get_finished_spans()
+    assert span.attributes["snowflake.query_id"] == "01-000001"
+    assert span.end_time - span.start_time == 500_000_000
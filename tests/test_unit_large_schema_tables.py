@@ -52,6 +52,12 @@ def _row(name, *, hybrid=False, iceberg=False, dynamic=False, kind="TABLE"):
     return row
 
 
+def _error(message, errno):
+    error = Exception(message)
+    error.errno = errno
+    return error
+
+
 def _result_with(rows, description):
     """Mock CursorResult with an arbitrary column description."""
     result = MagicMock()
@@ -381,3 +387,135 @@ def test_get_temp_table_names_paginates_and_filters():
     names = dialect.get_temp_table_names(conn, schema="myschema")
     assert names == ["tmp1", "tmp2"]
     assert conn.execute.call_count == 2
+
+
+# --- Incremental pages and column projection ----------------------------------
+
+
+def test_iter_show_pages_yields_each_page_lazily():
+    """Pages are yielded as fetched; the next SHOW runs only when requested."""
+    pages = [[_row("ALPHA"), _row("BRAVO")], [_row("CHARLIE")]]
+    dialect, conn = _dialect_with_pages(pages, page_size=2)
+    page_iter = dialect._iter_show_in_schema_pages(conn, "SHOW TABLES IN SCHEMA x")
+
+    name_to_index_map, rows = next(page_iter)
+    assert [r[name_to_index_map["name"]] for r in rows] == ["ALPHA", "BRAVO"]
+    assert conn.execute.call_count == 1
+
+    _, rows = next(page_iter)
+    assert [r[_IDX["name"]] for r in rows] == ["CHARLIE"]
+    assert conn.execute.call_count == 2
+    assert list(page_iter) == []
+
+
+def test_show_in_schema_rows_still_collects_all_pages():
+    pages = [[_row("ALPHA"), _row("BRAVO")], [_row("CHARLIE")]]
+    dialect, conn = _dialect_with_pages(pages, page_size=2)
+    name_to_index_map, rows = dialect._show_in_schema_rows(
+        conn, "SHOW TABLES IN SCHEMA x"
+    )
+    assert name_to_index_map["name"] == _IDX["name"]
+    assert len(rows) == 3
+
+
+def test_projection_is_off_by_default():
+    dialect, conn = _dialect_with_pages([[_row("ALPHA")]], page_size=2)
+    dialect._get_schema_tables_info(conn, schema="myschema")
+    assert "->>" not in str(conn.execute.call_args_list[0][0][0])
+
+
+def test_projection_pipes_only_required_columns():
+    """With projection on, each page selects just the columns the caller reads."""
+    projected = [("name",), ("is_external",), ("is_event",), ("is_hybrid",)]
+    projected += [("is_iceberg",), ("is_dynamic",), ("kind",), ("rows",)]
+    projected += [("bytes",), ("cluster_by",), ("automatic_clustering",)]
+    stats = ["TABLE", 10, 2048, "", "OFF"]
+    results = [
+        _result_with(
+            [
+                ["A", "N", "N", "Y", "N", "N", *stats],
+                ["B", "N", "N", "N", "N", "N", *stats],
+            ],
+            projected,
+        ),
+        _result_with([["C", "N", "N", "N", "N", "Y", *stats]], projected),
+    ]
+    dialect, conn = _dialect_with_results(results, page_size=2)
+    dialect._enable_show_column_projection = True
+    tables = dialect._get_schema_tables_info(conn, schema="myschema")
+
+    assert {name: info["prefixes"] for name, info in tables.items()} == {
+        "a": ["HYBRID"],
+        "b": [],
+        "c": ["DYNAMIC"],
+    }
+    assert tables["a"]["rows"] == 10
+    sql_page1 = str(conn.execute.call_args_list[0][0][0])
+    sql_page2 = str(conn.execute.call_args_list[1][0][0])
+    assert sql_page1.endswith(
+        'LIMIT 2 ->> SELECT "name", "is_external", "is_event", "is_hybrid", '
+        '"is_iceberg", "is_dynamic", "kind", "rows", "bytes", "cluster_by", '
+        '"automatic_clustering" FROM $1 ORDER BY "name"'
+    )
+    # The paging cursor still precedes the pipe.
+    assert "LIMIT 2 FROM 'B' ->> SELECT" in sql_page2
+
+
+def test_projection_keeps_name_for_paging():
+    results = [
+        _result_with([["V1"], ["V2"]], [("name",)]),
+        _result_with([["V3"]], [("name",)]),
+    ]
+    dialect, conn = _dialect_with_results(results, page_size=2)
+    dialect._enable_show_column_projection = True
+    assert dialect.get_view_names(conn, schema="myschema") == ["v1", "v2", "v3"]
+    assert '->> SELECT "name" FROM $1' in str(conn.execute.call_args_list[0][0][0])
+    assert "FROM 'V2'" in str(conn.execute.call_args_list[1][0][0])
+
+
+def test_projection_falls_back_when_pipe_is_rejected():
+    """A server that rejects ``->>`` gets the plain SHOW and projection turns off."""
+    from sqlalchemy import exc as sa_exc
+
+    dialect = SnowflakeDialect(enable_show_column_projection=True)
+    dialect._get_full_schema_name = MagicMock(return_value='"D"."S"')
+    conn = MagicMock()
+    conn.execute.side_effect = [
+        sa_exc.ProgrammingError("SHOW", {}, _error("syntax error", 1003)),
+        _result_for([_row("ALPHA")]),
+    ]
+    assert dialect.get_temp_table_names(conn, schema="s") == []
+    assert "->>" in str(conn.execute.call_args_list[0][0][0])
+    assert "->>" not in str(conn.execute.call_args_list[1][0][0])
+    assert dialect._enable_show_column_projection is False
+
+
+@pytest.mark.parametrize(
+    "message, errno",
+    [("does not exist or not authorized", 2003), ("insufficient privileges", 3001)],
+)
+def test_projection_stays_on_for_unrelated_errors(message, errno):
+    """Errors the plain SHOW would hit too are raised, not taken as no pipe."""
+    from sqlalchemy import exc as sa_exc
+
+    dialect = SnowflakeDialect(enable_show_column_projection=True)
+    dialect._get_full_schema_name = MagicMock(return_value='"D"."S"')
+    conn = MagicMock()
+    conn.execute.side_effect = sa_exc.ProgrammingError(
+        "SHOW", {}, _error(message, errno)
+    )
+    with pytest.raises(sa_exc.ProgrammingError):
+        dialect.get_temp_table_names(conn, schema="s")
+    assert conn.execute.call_count == 1
+    assert dialect._enable_show_column_projection is True
+
+
+def test_projection_url_parameter():
+    from sqlalchemy.engine.url import make_url
+
+    dialect = SnowflakeDialect()
+    _, opts = dialect.create_connect_args(
+        make_url("snowflake://u:p@acct/db?enable_show_column_projection=true")
+    )
+    assert dialect._enable_show_column_projection is True
+    assert "enable_show_column_projection" not in opts
@@ -0,0 +1,266 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``get_query_operator_stats`` and ``operator_stats_threshold``."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import (
+    QueryOperatorStats,
+    RingBufferSink,
+    get_query_operator_stats,
+)
+
+from .fake_dbapi import FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+_COLUMNS = [
+    "QUERY_ID",
+    "STEP_ID",
+    "OPERATOR_ID",
+    "PARENT_OPERATORS",
+    "OPERATOR_TYPE",
+    "OPERATOR_STATISTICS",
+    "EXECUTION_TIME_BREAKDOWN",
+    "OPERATOR_ATTRIBUTES",
+]
+
+
+def _row(operator_id, parents, operator_type, statistics, percentage, attributes):
+    return [
+        "01-000001",
+        1,
+        operator_id,
+        json.dumps(parents),
+        operator_type,
+        json.dumps(statistics),
+        json.dumps({"overall_percentage": percentage}),
+        json.dumps(attributes),
+    ]
+
+
+_ROWS = [
+    _row(0, [], "Result", {"input_rows": 9000, "output_rows": 9000}, 0.01, {}),
+    _row(
+        1,
+        [0],
+        "Join",
+        {
+            "input_rows": 1500,
+            "output_rows": 9000,
+            "spilling": {"bytes_spilled_local_storage": 4096},
+        },
+        0.6,
+        {"equality_join_condition": "(O.ID = L.ORDER_ID)"},
+    ),
+    _row(
+        2,
+        [1],
+        "TableScan",
+        {
+            "output_rows": 500,
+            "pruning": {"partitions_scanned": 4, "partitions_total": 40},
+        },
+        0.1,
+        {"table_name": "DB.PUBLIC.ORDERS"},
+    ),
+    _row(
+        3,
+        [1],
+        "TableScan",
+        {
+            "output_rows": 1000,
+            "pruning": {"partitions_scanned": 90, "partitions_total": 100},
+            "spilling": {
+                "bytes_spilled_local_storage": 1024,
+                "bytes_spilled_remote_storage": 2048,
+            },
+        },
+        0.29,
+        {"table_name": "DB.PUBLIC.LINEITEM"},
+    ),
+]
+
+
+class _Responder:
+    def __init__(self):
+        self.fail_stats = False
+        self.release_stats = threading.Event()
+        self.release_stats.set()
+
+    def __call__(self, sql):
+        if "GET_QUERY_OPERATOR_STATS" in sql:
+            self.release_stats.wait(5)
+            if self.fail_stats:
+                raise ProgrammingError("Statement not found", 2003)
+            return _COLUMNS, _ROWS
+        if "report" in sql:
+            return ["id"], [[1]]
+        return default_responder(sql)
+
+
+@pytest.fixture
+def responder():
+    return _Responder()
+
+
+@pytest.fixture
+def dbapi(responder):
+    return FakeDBAPI(responder)
+
+
+def _stats():
+    return QueryOperatorStats(
+        "01-000001", [dict(zip(_COLUMNS, row, strict=True)) for row in _ROWS]
+    )
+
+
+def test_summary():
+    stats = _stats()
+    assert (stats.bytes_spilled_local, stats.bytes_spilled_remote) == (5120, 2048)
+    assert stats.bytes_spilled == 7168
+    assert (stats.partitions_scanned, stats.partitions_total) == (94, 140)
+    assert [(op.operator_type, op.output_rows) for op in stats] == [
+        ("Result", 9000),
+        ("Join", 9000),
+        ("TableScan", 500),
+        ("TableScan", 1000),
+    ]
+    [join] = stats.exploding_joins()
+    assert join.join_explosion == 6.0
+    assert join.parent_operators == [0]
+    assert join.attributes == {"equality_join_condition": "(O.ID = L.ORDER_ID)"}
+    assert join.time_percentage == 0.6
+    assert stats.exploding_joins(factor=10) == []
+    assert stats.as_dict()["operators"][3]["partitions_scanned"] == 90
+
+
+def test_lower_case_columns_are_accepted():
+    rows = [dict(zip([c.lower() for c in _COLUMNS], _ROWS[1], strict=True))]
+    [join] = QueryOperatorStats("01-000001", rows)
+    assert join.operator_type == "Join"
+    assert join.bytes_spilled_local == 4096
+
+
+def test_fetch_for_a_result(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        result = conn.execute(text("select * from report"))
+        stats = get_query_operator_stats(conn, result)
+        query_id = result.context.query_id
+        assert get_query_operator_stats(conn, query_id).query_id == query_id
+    assert dbapi.log[-1] == (
+        f"SELECT * FROM TABLE(GET_QUERY_OPERATOR_STATS('{query_id}'))"
+    )
+    assert stats.query_id == query_id
+    assert stats.bytes_spilled == 7168
+
+
+def test_invalid_query_is_rejected(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.ArgumentError, match="Invalid query id"):
+            get_query_operator_stats(conn, "x'); drop table t; --")
+        with pytest.raises(sa_exc.ArgumentError, match="No Snowflake query id"):
+            get_query_operator_stats(conn, object())
+
+
+def _wait_for_stats(engine):
+    engine.dialect._operator_stats_executor.submit(lambda: None).result(5)
+
+
+def test_slow_statements_reach_the_sink_with_stats(dbapi):
+    sink = RingBufferSink()
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, operator_stats_threshold=0
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select * from report")).all()
+    _wait_for_stats(engine)
+    timing = sink.records[-1]
+    assert timing.statement == "select * from report"
+    assert timing.operator_stats.query_id == timing.query_id
+    assert timing.operator_stats.bytes_spilled == 7168
+    assert timing.as_dict()["operator_stats"]["partitions_total"] == 140
+    assert not any("GET_QUERY_OPERATOR_STATS" in t.statement for t in sink.records)
+
+
+def test_fast_statements_are_not_profiled(dbapi):
+    sink = RingBufferSink()
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, operator_stats_threshold=3600
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select * from report")).all()
+    assert sink.records[-1].operator_stats is None
+    assert not any("GET_QUERY_OPERATOR_STATS" in sql for sql in dbapi.log)
+
+
+def test_failed_fetch_still_emits_the_timing(dbapi, responder):
+    responder.fail_stats = True
+    sink = RingBufferSink()
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, operator_stats_threshold=0
+    )
+    with engine.connect() as conn:
+        assert conn.execute(text("select * from report")).all() == [(1,)]
+    _wait_for_stats(engine)
+    assert sink.records[-1].statement == "select * from report"
+    assert sink.records[-1].operator_stats is None
+
+
+def test_stats_are_fetched_in_the_background_on_another_connection(dbapi, responder):
+    responder.release_stats.clear()
+    sink = RingBufferSink()
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, operator_stats_threshold=0
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select * from report")).all()
+        # The statement's session is free while the statistics are fetched.
+        conn.execute(text("select 1")).all()
+        statement_connection = conn.connection.driver_connection
+    assert "select 1" in dbapi.log
+    assert not any(t.statement == "select * from report" for t in sink.records)
+    responder.release_stats.set()
+    _wait_for_stats(engine)
+
+    [timing] = [t for t in sink.records if t.statement == "select * from report"]
+    assert timing.operator_stats is not None
+    assert len(dbapi.connections) == 2
+    assert dbapi.connections[-1] is not statement_connection
+
+
+def test_no_executor_without_a_threshold(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    assert engine.dialect._operator_stats_executor is None
+    engine.dispose()
+
+
+def test_dispose_shuts_the_executor_down(dbapi):
+    sink = RingBufferSink()
+    engine = create_engine(
+        _URL, module=dbapi, statement_sink=sink, operator_stats_threshold=0
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select * from report")).all()
+    executor = engine.dialect._operator_stats_executor
+    engine.dispose()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    executor.shutdown(wait=True)
+    assert sink.records[-1].operator_stats is not None
+
+    # The engine stays usable after dispose().
+    with engine.connect() as conn:
+        conn.execute(text("select * from report")).all()
+    _wait_for_stats(engine)
+    assert sink.records[-1].operator_stats is not None
@@ -0,0 +1,208 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``ping_window`` and ``TokenExpiryRecycler``."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from snowflake.sqlalchemy import TokenExpiryRecycler
+
+from .fake_dbapi import FakeDBAPI
+
+_URL = "snowflake://u:p@acct/db/public"
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI()
+
+
+def _pings(dbapi):
+    return [sql for sql in dbapi.log if sql == "SELECT 1"]
+
+
+class TestPingWindow:
+    @pytest.fixture
+    def engine(self, dbapi):
+        engine = create_engine(_URL, module=dbapi, pool_pre_ping=True, ping_window=60)
+        yield engine
+        engine.dispose()
+
+    def test_recently_used_connection_is_not_pinged(self, engine, dbapi):
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("select 1 from t"))
+        assert _pings(dbapi) == []
+        assert engine.dialect.skipped_pings >= 2
+        assert len(dbapi.connections) == 1
+
+    def test_stale_connection_is_pinged(self, engine, dbapi):
+        with engine.connect():
+            pass
+        dbapi.connections[0]._sqlalchemy_last_used = time.monotonic() - 120
+        with engine.connect():
+            pass
+        assert _pings(dbapi) == ["SELECT 1"]
+        # The ping counts as use.
+        with engine.connect():
+            pass
+        assert _pings(dbapi) == ["SELECT 1"]
+
+    def test_closed_connection_is_replaced_without_round_trip(self, engine, dbapi):
+        with engine.connect():
+            pass
+        dbapi.connections[0].closed = True
+        with engine.connect():
+            pass
+        assert len(dbapi.connections) == 2
+        assert _pings(dbapi) == []
+
+    def test_default_pings_every_checkout(self, dbapi):
+        engine = create_engine(_URL, module=dbapi, pool_pre_ping=True)
+        for _ in range(2):
+            with engine.connect():
+                pass
+        assert _pings(dbapi) == ["SELECT 1"]
+        assert engine.dialect.skipped_pings == 0
+
+    def test_url_parameter(self, dbapi):
+        engine = create_engine(f"{_URL}?ping_window=30", module=dbapi)
+        assert engine.dialect._ping_window == 30.0
+        with engine.connect():
+            pass
+        assert "ping_window" not in dbapi.connections[0].kwargs
+
+
+class TestTokenExpiryRecycler:
+    @pytest.fixture
+    def engine(self, dbapi):
+        engine = create_engine(_URL, module=dbapi)
+        yield engine
+        engine.dispose()
+
+    def _expire_soon(self, connection, seconds=1.0):
+        connection._sqlalchemy_expires_at = time.monotonic() + seconds
+
+    def test_expiry_is_recorded_at_connect(self, engine, dbapi):
+        TokenExpiryRecycler(engine, margin=300)
+        with engine.connect():
+            pass
+        remaining = dbapi.connections[0]._sqlalchemy_expires_at - time.monotonic()
+        assert 4 * 3600 - 301 < remaining <= 4 * 3600 - 300
+
+    def test_refresh_retires_idle_connection_expiring_before_next_pass(
+        self, engine, dbapi
+    ):
+        recycler = TokenExpiryRecycler(engine, interval=60)
+        with engine.connect():
+            pass
+        old = dbapi.connections[0]
+        self._expire_soon(old, seconds=30)
+
+        assert recycler.refresh() == 1
+        # Nothing is opened or closed by the pass itself.
+        assert not old.closed
+        assert len(dbapi.connections) == 1
+        with engine.connect():
+            pass
+        assert old.closed
+        assert len(dbapi.connections) == 2
+        assert recycler.recycled == 1
+        assert recycler.refresh() == 0
+
+    def test_refresh_without_expiring_connections_touches_nothing(self, engine, dbapi):
+        recycler = TokenExpiryRecycler(engine, interval=60)
+        with engine.connect():
+            pass
+        rollbacks = dbapi.connections[0].rollbacks
+        assert recycler.refresh() == 0
+        assert dbapi.connections[0].rollbacks == rollbacks
+
+    def test_refresh_retires_every_idle_connection_under_lifo(self, dbapi):
+        engine = create_engine(_URL, module=dbapi, pool_use_lifo=True)
+        recycler = TokenExpiryRecycler(engine, interval=60)
+        with engine.connect(), engine.connect(), engine.connect():
+            pass
+        old = list(dbapi.connections)
+        for connection in old:
+            self._expire_soon(connection, seconds=30)
+
+        assert recycler.refresh() == 3
+        assert len(dbapi.connections) == 3
+        with engine.connect(), engine.connect(), engine.connect():
+            pass
+        assert all(connection.closed for connection in old)
+        assert len(dbapi.connections) == 6
+        engine.dispose()
+
+    def test_refresh_leaves_other_idle_connections_untouched(self, dbapi):
+        engine = create_engine(_URL, module=dbapi, pool_pre_ping=True)
+        recycler = TokenExpiryRecycler(engine, interval=60)
+        with engine.connect(), engine.connect():
+            pass
+        expiring, other = dbapi.connections
+        self._expire_soon(expiring, seconds=30)
+        rollbacks = other.rollbacks
+        log = len(dbapi.log)
+
+        assert recycler.refresh() == 1
+        assert dbapi.log[log:] == []
+        assert other.rollbacks == rollbacks
+        assert not other.closed
+        assert engine.pool.checkedin() == 2
+        engine.dispose()
+
+    def test_connection_in_use_is_retired_at_checkin(self, engine, dbapi):
+        recycler = TokenExpiryRecycler(engine, interval=60)
+        with engine.connect():
+            self._expire_soon(dbapi.connections[0], seconds=30)
+        assert recycler.recycled == 1
+        with engine.connect():
+            pass
+        assert len(dbapi.connections) == 2
+        assert dbapi.connections[0].closed
+
+    def test_checkout_replaces_expired_connection(self, engine, dbapi):
+        recycler = TokenExpiryRecycler(engine)
+        with engine.connect():
+            pass
+        self._expire_soon(dbapi.connections[0], seconds=-1)
+        with engine.connect() as conn:
+            conn.execute(text("select 1 from t"))
+        assert len(dbapi.connections) == 2
+        assert dbapi.connections[0].closed
+        assert recycler.recycled == 1
+
+    def test_stopped_recycler_leaves_the_pool_alone(self, engine, dbapi):
+        recycler = TokenExpiryRecycler(engine).start()
+        recycler.stop(timeout=5)
+        with engine.connect():
+            pass
+        assert not hasattr(dbapi.connections[0], "_sqlalchemy_expires_at")
+        dbapi.connections[0]._sqlalchemy_expires_at = time.monotonic() - 1
+        with engine.connect():
+            pass
+        assert len(dbapi.connections) == 1
+        assert recycler.recycled == 0
+
+    def test_background_thread(self, engine, dbapi):
+        recycler = TokenExpiryRecycler(engine, interval=0.05)
+        with engine.connect():
+            pass
+        self._expire_soon(dbapi.connections[0], seconds=0.01)
+        recycler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while recycler.recycled == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            recycler.stop(timeout=5)
+        assert recycler.recycled == 1
+        with engine.connect():
+            pass
+        assert len(dbapi.connections) == 2
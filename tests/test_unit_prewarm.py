@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``prewarm_pool``."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from snowflake.sqlalchemy import create_snowflake_engine, prewarm_pool
+
+from .fake_dbapi import FakeDBAPI, OperationalError
+
+_URL = "snowflake://u:p@acct/db/public"
+_CONNECT_SECONDS = 0.2
+
+
+@pytest.fixture
+def dbapi():
+    dbapi = FakeDBAPI()
+    connect = dbapi.connect
+
+    def slow_connect(*args, **kwargs):
+        time.sleep(_CONNECT_SECONDS)
+        return connect(*args, **kwargs)
+
+    dbapi.connect = slow_connect
+    return dbapi
+
+
+def test_connects_in_parallel_and_initializes_once(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=4)
+    start = time.monotonic()
+    assert prewarm_pool(engine) == 4
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 3 * _CONNECT_SECONDS
+    assert len(dbapi.connections) == 4
+    assert engine.pool.checkedin() == 4
+    assert sum("CURRENT_VERSION()" in sql for sql in dbapi.log) == 1
+
+
+def test_warm_pool_serves_concurrent_checkouts_without_connecting(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=3)
+    prewarm_pool(engine)
+    barrier = threading.Barrier(3)
+
+    def checkout():
+        with engine.connect():
+            barrier.wait(5)
+
+    threads = [threading.Thread(target=checkout) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(dbapi.connections) == 3
+
+
+def test_connect_error_is_raised_after_returning_opened_connections(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=3)
+    slow_connect = dbapi.connect
+    calls = itertools.count()
+
+    def flaky_connect(*args, **kwargs):
+        if next(calls) == 1:
+            raise OperationalError("Failed to connect", errno=250001)
+        return slow_connect(*args, **kwargs)
+
+    dbapi.connect = flaky_connect
+    with pytest.raises(Exception, match="Failed to connect"):
+        prewarm_pool(engine, timeout=5)
+    assert engine.pool.checkedin() == len(dbapi.connections) == 2
+
+
+@pytest.mark.parametrize("timeout", [0.5, None])
+def test_hanging_connect_does_not_block_past_the_timeout(dbapi, timeout):
+    engine = create_engine(_URL, module=dbapi, pool_size=3, pool_timeout=0.5)
+    slow_connect = dbapi.connect
+    calls = itertools.count()
+    release = threading.Event()
+
+    def hanging_connect(*args, **kwargs):
+        if next(calls) == 1:
+            release.wait(10)
+        return slow_connect(*args, **kwargs)
+
+    dbapi.connect = hanging_connect
+    start = time.monotonic()
+    try:
+        assert prewarm_pool(engine, timeout=timeout) == 2
+        assert time.monotonic() - start < 0.5 + 2 * _CONNECT_SECONDS
+        assert engine.pool.checkedin() == 2
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while engine.pool.checkedin() < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.pool.checkedin() == 3
+
+
+def test_explicit_size(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=5)
+    assert prewarm_pool(engine, size=2) == 2
+    assert engine.pool.checkedin() == 2
+    assert prewarm_pool(engine, size=0) == 0
+
+
+def test_create_snowflake_engine_prewarm(dbapi):
+    engine = create_snowflake_engine(_URL, prewarm=True, module=dbapi, pool_size=2)
+    assert engine.pool.checkedin() == 2
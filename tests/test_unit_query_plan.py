@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``explain`` and ``assert_pruning``."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from sqlalchemy import Column, Date, Integer, MetaData, Table, create_engine, select
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import QueryPlan, assert_pruning, explain
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+
+with open(os.path.join(THIS_DIR, "data", "explain_orders_join.json")) as f:
+    _PLAN_JSON = f.read()
+
+_URL = "snowflake://u:p@acct/db/public"
+
+_orders = Table(
+    "orders", MetaData(), Column("o_orderkey", Integer), Column("o_orderdate", Date)
+)
+
+
+def _responder(sql):
+    if sql.startswith("EXPLAIN USING JSON"):
+        return ["content"], [[_PLAN_JSON]]
+    if sql.startswith("EXPLAIN USING TEXT"):
+        return ["content"], [["GlobalStats:\n    partitionsTotal=1200"]]
+    if sql.startswith("EXPLAIN USING TABULAR"):
+        return ["step", "id", "operation"], [[1, 0, "Result"], [1, 1, "TableScan"]]
+    return default_responder(sql)
+
+
+@pytest.fixture
+def plan():
+    return QueryPlan.from_json(_PLAN_JSON)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    yield engine
+    engine.dispose()
+
+
+def test_global_stats_and_operations(plan):
+    assert (plan.partitions_assigned, plan.partitions_total) == (37, 1200)
+    assert plan.bytes_assigned == 48234496
+    assert [op.operation for op in plan][:3] == ["Result", "Aggregate", "InnerJoin"]
+    [scan_filter] = [op for op in plan if op.operation == "Filter"]
+    assert scan_filter.expressions == ["O.O_ORDERDATE >= '1995-03-01'"]
+    assert scan_filter.parents == [2]
+    assert plan.tables == [
+        "SNOWFLAKE_SAMPLE_DATA.TPCH_SF1.ORDERS",
+        "SNOWFLAKE_SAMPLE_DATA.TPCH_SF1.LINEITEM",
+    ]
+
+
+def test_partition_ratio_per_table(plan):
+    assert plan.partition_ratio() == pytest.approx(37 / 1200)
+    assert plan.partition_ratio("orders") == pytest.approx(0.3)
+    assert plan.partition_ratio("tpch_sf1.lineitem") == pytest.approx(34 / 1190)
+    assert plan.scans("other_db.tpch_sf1.orders") == []
+    with pytest.raises(LookupError, match="customer"):
+        plan.partition_ratio("customer")
+
+
+def test_assert_pruning(plan):
+    assert_pruning(plan, 0.05)
+    assert_pruning(plan, 0.3, table="ORDERS")
+    with pytest.raises(AssertionError, match=r"30.0% of the partitions of orders"):
+        assert_pruning(plan, 0.1, table="orders")
+    with pytest.raises(AssertionError, match="does not scan"):
+        assert_pruning(plan, 1.0, table="customer")
+
+
+def test_plan_without_partitions():
+    plan = QueryPlan.from_json(
+        '{"GlobalStats": {"partitionsTotal": 0, "partitionsAssigned": 0,'
+        ' "bytesAssigned": 0}, "Operations": [[{"id": 0, "operation": "Result",'
+        ' "expressions": ["1"]}]]}'
+    )
+    assert plan.partition_ratio() == 0.0
+    assert plan.tables == []
+    assert_pruning(plan, 0.0)
+
+
+def test_explain_compiles_with_inline_values(engine, dbapi):
+    stmt = select(_orders.c.o_orderkey).where(_orders.c.o_orderkey == 42)
+    with engine.connect() as conn:
+        plan = explain(conn, stmt)
+    assert dbapi.log[-1] == (
+        "EXPLAIN USING JSON SELECT orders.o_orderkey \n"
+        "FROM orders \nWHERE orders.o_orderkey = 42"
+    )
+    assert plan.partitions_assigned == 37
+
+
+def test_explain_formats(engine, dbapi):
+    with engine.connect() as conn:
+        assert explain(conn, "select 1", format="TEXT").startswith("GlobalStats")
+        assert explain(conn, "select 1", format="tabular") == [
+            {"step": 1, "id": 0, "operation": "Result"},
+            {"step": 1, "id": 1, "operation": "TableScan"},
+        ]
+        with pytest.raises(sa_exc.ArgumentError, match="format"):
+            explain(conn, "select 1", format="xml")
+    assert dbapi.log[-2:] == [
+        "EXPLAIN USING TEXT select 1",
+        "EXPLAIN USING TABULAR select 1",
+    ]
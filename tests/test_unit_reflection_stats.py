@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for opt-in reflection instrumentation.
+
+A real engine is built on top of a scripted fake DBAPI so cursor events
+fire exactly as they would against Snowflake, and the tests assert on the
+counters ``SnowflakeInspector.collect_stats`` records.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import MetaData, create_engine, inspect
+
+from snowflake.sqlalchemy.inspector import SnowflakeInspector
+from snowflake.sqlalchemy.reflection_stats import (
+    ReflectionStats,
+    _InstrumentedInfoCache,
+)
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+_SHOW_TABLES = (
+    ["created_on", "name", "kind", "cluster_by", "rows", "bytes", "comment"],
+    [[None, "A", "TABLE", "", 1, 10, None], [None, "B", "TABLE", "", 2, 20, None]],
+)
+_COLUMNS = (
+    [
+        "table_name",
+        "column_name",
+        "data_type",
+        "character_maximum_length",
+        "numeric_precision",
+        "numeric_scale",
+        "is_nullable",
+        "column_default",
+        "is_identity",
+        "comment",
+        "identity_start",
+        "identity_increment",
+        "identity_generation",
+        "identity_cycle",
+        "is_hidden",
+        "schema_evolution_record",
+    ],
+    [
+        ["A", "ID", "NUMBER", None, 38, 0, "NO", None, "NO"] + [None] * 7,
+        ["B", "ID", "NUMBER", None, 38, 0, "NO", None, "NO"] + [None] * 7,
+    ],
+)
+_EMPTY_SHOW = (["created_on", "name"], [])
+
+
+def _respond(sql):
+    upper = sql.upper()
+    if "TABLES IN SCHEMA" in upper:
+        return _SHOW_TABLES
+    if "INFORMATION_SCHEMA.COLUMNS" in upper:
+        return _COLUMNS
+    if "CURRENT_DATABASE()" in upper and "CURRENT_VERSION()" not in upper:
+        return ["db", "schema"], [["DB", "PUBLIC"]]
+    if upper.lstrip().startswith("SHOW"):
+        return _EMPTY_SHOW
+    return default_responder(sql)
+
+
+@pytest.fixture
+def engine_and_log():
+    dbapi = FakeDBAPI(_respond)
+    engine = create_engine("snowflake://u:p@acct/db/public", module=dbapi)
+    yield engine, dbapi.log
+    engine.dispose()
+
+
+def test_stats_record_round_trips_rows_and_cache_hits(engine_and_log):
+    engine, log = engine_and_log
+    insp = inspect(engine)
+    assert isinstance(insp, SnowflakeInspector)
+
+    with insp.collect_stats() as stats:
+        insp.get_table_names(schema="s")
+        insp.get_table_names(schema="s")
+        insp.get_multi_table_stats(schema="s")
+
+    assert insp.reflection_stats is stats
+    phase = stats.phases["get_schema_tables_info"]
+    assert (phase.round_trips, phase.rows) == (1, 2)
+    assert stats.show_pages == 1
+    method = stats.methods["_get_schema_tables_info"]
+    assert (method.hits, method.misses) == (2, 1)
+    assert stats.cache_hit_rate > 0
+
+
+def test_metadata_reflect_through_instrumented_inspector(engine_and_log):
+    engine, log = engine_and_log
+    insp = inspect(engine)
+    metadata = MetaData()
+    issued_before = len(log)
+    with insp.collect_stats() as stats:
+        metadata.reflect(bind=insp, schema="s")
+
+    assert set(metadata.tables) == {"s.a", "s.b"}
+    assert stats.phases["_get_schema_columns"].rows == 2
+    assert stats.desc_fallbacks == 0
+    # Every statement issued during reflection is accounted for.
+    assert stats.round_trips == len(log) - issued_before
+    as_dict = stats.as_dict()
+    assert json.loads(json.dumps(as_dict)) == as_dict
+    assert "get_schema_tables_info" in stats.report()
+
+
+def test_collection_is_scoped_to_the_block(engine_and_log):
+    engine, _ = engine_and_log
+    insp = inspect(engine)
+    with insp.collect_stats() as stats:
+        pass
+    insp.get_table_names(schema="s")
+
+    assert stats.round_trips == 0
+    assert type(insp.info_cache) is dict
+    # Entries cached inside the block stay cached afterwards.
+    with insp.collect_stats() as stats:
+        insp.get_table_names(schema="s")
+    insp.get_table_names(schema="s")
+    assert stats.methods["_get_schema_tables_info"].hits == 1
+    assert stats.round_trips == 0
+
+
+def test_statement_classification():
+    stats = ReflectionStats()
+    stats._record_statement(
+        "DESC /* sqlalchemy:_get_schema_columns */ TABLE t TYPE = COLUMNS", 3, 0.5
+    )
+    stats._record_statement('DESC TABLE /* sqlalchemy:_has_object */ "T"', 1, 0.1)
+    stats._record_statement(
+        "SHOW /* sqlalchemy:get_view_names */ VIEWS IN s LIMIT 10", 10, 0.2
+    )
+    stats._record_statement("SELECT 1", 1, 0.1)  # not reflection
+
+    assert stats.desc_fallbacks == 1
+    assert stats.show_pages == 1
+    assert stats.round_trips == 3
+    assert stats.rows == 14
+    assert stats.elapsed == pytest.approx(0.8)
+
+
+def test_untagged_sql_is_attributed_to_running_cached_method():
+    stats = ReflectionStats()
+    cache = _InstrumentedInfoCache({}, stats)
+    key = ("_current_database_schema", (), ())
+    assert cache.get(key) is None
+    stats._record_statement("select current_database(), current_schema()", 1, 0.0)
+    cache[key] = ("DB", "PUBLIC")
+    assert cache.get(key) == ("DB", "PUBLIC")
+
+    assert stats.phases["_current_database_schema"].round_trips == 1
+    method = stats.methods["_current_database_schema"]
+    assert (method.hits, method.misses) == (1, 1)
+    assert stats._running == []
@@ -0,0 +1,261 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the ``result_cache_ttl`` execution option."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+
+from snowflake.sqlalchemy import (
+    CachedResult,
+    DiskResultCache,
+    MemoryResultCache,
+    ResultCache,
+    invalidate_result_cache,
+)
+from snowflake.sqlalchemy.result_cache import _read_tables, _written_tables
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+_URL = "snowflake://u:p@acct/db/public?warehouse=wh&role=analyst"
+
+_orders = Table("orders", MetaData(), Column("id", Integer), Column("total", Integer))
+
+
+def _responder(sql):
+    if "FROM orders" in sql or "from orders" in sql:
+        return ["id", "total"], [[1, 10], [2, 20]]
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    yield engine
+    engine.dispose()
+
+
+def _reads(dbapi):
+    return [sql for sql in dbapi.log if "orders" in sql.lower()]
+
+
+def _query(value=10):
+    return select(_orders).where(_orders.c.total >= value)
+
+
+def test_repeated_read_is_served_from_cache(engine, dbapi):
+    for _ in range(3):
+        with engine.connect() as conn:
+            result = conn.execution_options(result_cache_ttl=60).execute(_query())
+            assert result.all() == [(1, 10), (2, 20)]
+            assert result.keys() == ["id", "total"]
+    assert len(_reads(dbapi)) == 1
+    assert engine.dialect._result_cache.hits == 2
+
+
+def test_without_ttl_nothing_is_cached(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execute(_query()).all()
+        conn.execute(_query()).all()
+    assert len(_reads(dbapi)) == 2
+    assert len(engine.dialect._result_cache) == 0
+
+
+def test_key_includes_parameters_and_session(engine, dbapi):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        cached.execute(_query(10)).all()
+        cached.execute(_query(20)).all()
+        cached.execution_options(warehouse="other_wh").execute(_query(10)).all()
+        cached.execute(_query(10)).all()
+        conn.connection.driver_connection.role = "admin"
+        cached.execute(_query(10)).all()
+    assert len(_reads(dbapi)) == 4
+
+
+def test_entry_expires(engine, dbapi):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=0.05)
+        cached.execute(_query()).all()
+        time.sleep(0.1)
+        cached.execute(_query()).all()
+    assert len(_reads(dbapi)) == 2
+
+
+def test_writes_are_not_cached(engine, dbapi):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        for _ in range(2):
+            cached.execute(_orders.insert(), {"id": 3, "total": 30})
+            cached.execute(text("select * from orders for update")).all()
+    assert len(_reads(dbapi)) == 4
+
+
+def test_dml_through_engine_invalidates_reads_of_its_table(engine, dbapi):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        cached.execute(_query()).all()
+        cached.execute(text("select count(*) from customers")).all()
+        conn.execute(_orders.update().values(total=0))
+        conn.commit()
+        cached.execute(_query()).all()
+        cached.execute(text("select count(*) from customers")).all()
+    assert len(_reads(dbapi)) == 3
+    assert sum("customers" in sql for sql in dbapi.log) == 1
+
+
+def test_reads_cached_before_commit_are_dropped_at_commit(engine, dbapi):
+    with engine.connect() as writer, engine.connect() as reader:
+        writer.execute(text("delete from orders where id = 1"))
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+        writer.commit()
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+    assert len(_reads(dbapi)) == 3
+
+
+def test_uncommitted_reads_are_not_shared(engine, dbapi):
+    with engine.connect() as writer, engine.connect() as reader:
+        writer.execute(text("delete from orders where id = 1"))
+        writer.execution_options(result_cache_ttl=60).execute(_query()).all()
+        writer.rollback()
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+    assert len(_reads(dbapi)) == 3
+    assert engine.dialect._result_cache.hits == 0
+
+
+def test_rollback_drops_reads_of_written_tables(engine, dbapi):
+    with engine.connect() as writer, engine.connect() as reader:
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+        writer.execute(text("delete from orders where id = 1"))
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+        writer.rollback()
+        reader.execution_options(result_cache_ttl=60).execute(_query()).all()
+    assert len(_reads(dbapi)) == 4
+
+
+def test_autocommit_writes_do_not_disable_caching(engine, dbapi):
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text("delete from orders where id = 1"))
+        for _ in range(2):
+            conn.execution_options(result_cache_ttl=60).execute(_query()).all()
+    assert len(_reads(dbapi)) == 2
+
+
+def test_write_to_any_table_of_a_comma_join_invalidates(engine, dbapi):
+    customers = Table("customers", MetaData(), Column("id", Integer))
+    query = select(_orders.c.id, customers.c.id.label("customer_id"))
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        cached.execute(query).all()
+        conn.execute(text("delete from customers"))
+        conn.commit()
+        cached.execute(query).all()
+    assert "FROM orders, customers" in _reads(dbapi)[0]
+    assert sum("FROM orders, customers" in sql for sql in dbapi.log) == 2
+
+
+def test_statement_with_unknown_tables_is_not_cached(engine, dbapi):
+    query = text("select * from orders, table(flatten(input => orders.tags))")
+    with engine.connect() as conn:
+        for _ in range(2):
+            conn.execution_options(result_cache_ttl=60).execute(query).all()
+    assert sum("flatten" in sql for sql in dbapi.log) == 2
+    assert len(engine.dialect._result_cache) == 0
+
+
+def test_explicit_invalidation(engine, dbapi):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        cached.execute(_query()).all()
+        invalidate_result_cache(engine, "ORDERS")
+        cached.execute(_query()).all()
+        invalidate_result_cache(conn)
+        cached.execute(_query()).all()
+    assert len(_reads(dbapi)) == 3
+
+
+def test_table_extraction():
+    assert _read_tables(
+        'select * from db.s.orders o join "Mixed" m on 1=1 join s.items using (id)'
+    ) == {"ORDERS", "Mixed", "ITEMS"}
+    assert _read_tables("select * from (select x from a) s, b as bb, c") == {
+        "A",
+        "B",
+        "C",
+    }
+    assert _read_tables("select * from a, table(flatten(input => a.v))") is None
+    assert _read_tables("select * from @stage") is None
+    assert _written_tables("INSERT INTO s.orders (id) VALUES (1)") == {"ORDERS"}
+    assert _written_tables("merge into orders using x on 1=1") == {"ORDERS"}
+    assert _written_tables(
+        "create or replace transient table if not exists t (a int)"
+    ) == {"T"}
+    assert _written_tables("call refresh()") == set()
+
+
+def test_memory_cache_evicts_least_recently_used():
+    entries = [CachedResult([("x",)], [(i,)] * 10, frozenset(), 60) for i in range(3)]
+    cache = MemoryResultCache(max_bytes=2 * entries[0].size + 1)
+    cache.set("a", entries[0])
+    cache.set("b", entries[1])
+    assert cache.get("a") is entries[0]
+    cache.set("c", entries[2])
+    assert cache.get("b") is None
+    assert cache.get("a") is entries[0]
+    assert cache.get("c") is entries[2]
+    assert len(cache) == 2
+
+
+def test_disk_cache_is_shared_and_invalidated(tmp_path, dbapi):
+    first = create_engine(
+        _URL, module=dbapi, result_cache=DiskResultCache(str(tmp_path))
+    )
+    second = create_engine(
+        _URL, module=dbapi, result_cache=DiskResultCache(str(tmp_path))
+    )
+    with first.connect() as conn:
+        assert conn.execution_options(result_cache_ttl=60).execute(_query()).all() == [
+            (1, 10),
+            (2, 20),
+        ]
+    with second.connect() as conn:
+        assert conn.execution_options(result_cache_ttl=60).execute(_query()).all() == [
+            (1, 10),
+            (2, 20),
+        ]
+    assert len(_reads(dbapi)) == 1
+
+    with first.connect() as conn:
+        conn.execute(text("truncate table orders"))
+    with second.connect() as conn:
+        conn.execution_options(result_cache_ttl=60).execute(_query()).all()
+    assert len(_reads(dbapi)) == 3
+
+
+def test_disk_cache_size_limit(tmp_path):
+    entry = CachedResult([("x",)], [(1,)] * 10, frozenset(), 60)
+    cache = DiskResultCache(str(tmp_path), max_bytes=2 * entry.size + 300)
+    for key in ("a", "b", "c"):
+        cache.set(key, entry)
+        time.sleep(0.01)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_backend_must_implement_the_interface():
+    class Incomplete(ResultCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete(1024)
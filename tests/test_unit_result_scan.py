@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``result_scan``, ``last_query_id`` and ``get_query_id``."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    Numeric,
+    String,
+    column,
+    create_engine,
+    func,
+    select,
+)
+from sqlalchemy.orm import Session, aliased, declarative_base
+
+from snowflake.sqlalchemy import get_query_id, last_query_id, result_scan
+
+from .fake_dbapi import FakeDBAPI, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+Base = declarative_base()
+
+
+class Order(Base):
+    __tablename__ = "orders"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(Numeric)
+
+
+def _responder(sql):
+    if "orders" in sql.lower() or "RESULT_SCAN" in sql:
+        return ["id", "total"], [[1, 10], [2, 20]]
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    yield engine
+    engine.dispose()
+
+
+def _compile(stmt, dialect):
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def test_result_scan_is_a_typed_from_clause(engine):
+    scan = result_scan("01b2-0000").table_valued(
+        column("id", Integer), column("total", Numeric)
+    )
+    stmt = select(scan.c.id, func.sum(scan.c.total)).where(scan.c.total > 5)
+    assert _compile(stmt.group_by(scan.c.id), engine.dialect) == (
+        "SELECT anon_1.id, sum(anon_1.total) AS sum_1 \n"
+        "FROM TABLE(RESULT_SCAN('01b2-0000')) AS anon_1 \n"
+        "WHERE anon_1.total > 5 GROUP BY anon_1.id"
+    )
+    assert isinstance(scan.c.total.type, Numeric)
+
+
+def test_last_query_id(engine):
+    scan = result_scan(last_query_id(-2)).table_valued("id")
+    assert _compile(select(scan), engine.dialect) == (
+        "SELECT anon_1.id \nFROM TABLE(RESULT_SCAN(last_query_id(-2))) AS anon_1"
+    )
+    assert _compile(
+        select(func.result_scan(last_query_id()).table_valued("id").alias("r")),
+        engine.dialect,
+    ) == ("SELECT r.id \nFROM TABLE(RESULT_SCAN(last_query_id())) AS r")
+    assert isinstance(last_query_id().type, String)
+
+
+def test_query_id_of_core_result_scanned_again(engine, dbapi):
+    with engine.connect() as conn:
+        result = conn.execute(select(Order.__table__))
+        result.all()
+        query_id = get_query_id(result)
+        assert query_id == f"01-{len(dbapi.log):06d}"
+        assert result.context.query_id == query_id
+
+        scan = result_scan(query_id).table_valued(*Order.__table__.c)
+        rows = conn.execute(select(scan).where(scan.c.total > 15)).all()
+    assert rows == [(1, 10), (2, 20)]
+    assert dbapi.log[-1] == (
+        "SELECT anon_1.id, anon_1.total \n"
+        "FROM TABLE(RESULT_SCAN(%(result_scan_1)s)) AS anon_1 \n"
+        "WHERE anon_1.total > %(total_1)s"
+    )
+    assert dbapi.calls[-1][1]["result_scan_1"] == query_id
+
+
+def test_query_id_of_orm_result_and_aliased_entity(engine, dbapi):
+    with Session(engine) as session:
+        result = session.execute(select(Order))
+        result.all()
+        query_id = get_query_id(result)
+        assert query_id == f"01-{len(dbapi.log):06d}"
+
+        previous = aliased(
+            Order, result_scan(query_id).table_valued(*Order.__table__.c)
+        )
+        orders = session.scalars(select(previous).order_by(previous.id)).all()
+    assert [order.id for order in orders] == [1, 2]
+
+
+def test_cached_result_keeps_the_original_query_id(engine):
+    with engine.connect() as conn:
+        cached = conn.execution_options(result_cache_ttl=60)
+        first = cached.execute(select(Order.__table__))
+        second = cached.execute(select(Order.__table__))
+    assert get_query_id(second) == get_query_id(first) is not None
+
+
+def test_no_query_id_without_execution():
+    assert get_query_id(object()) is None
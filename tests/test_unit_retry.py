@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``RetryPolicy``."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, text
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import RetryPolicy
+
+from .fake_dbapi import FakeDBAPI, OperationalError, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+_orders = Table("orders", MetaData(), Column("id", Integer))
+
+
+class _Flaky:
+    """Fail statements on ``orders`` ``failures`` times with ``error``."""
+
+    def __init__(self, failures, error=None):
+        self.failures = failures
+        self.error = error or OperationalError("Failed to get the response", 250003)
+
+    def __call__(self, sql):
+        if "orders" in sql and self.failures:
+            self.failures -= 1
+            raise self.error
+        if "orders" in sql:
+            return ["id"], [[1]]
+        return default_responder(sql)
+
+
+def _engine(responder, **policy):
+    dbapi = FakeDBAPI(responder)
+    policy = RetryPolicy(base_delay=0, **policy)
+    return create_engine(_URL, module=dbapi, retry_policy=policy), dbapi, policy
+
+
+def _attempts(dbapi):
+    return sum("orders" in sql for sql in dbapi.log)
+
+
+def test_read_is_retried_until_it_succeeds():
+    engine, dbapi, policy = _engine(_Flaky(2))
+    with engine.connect() as conn:
+        assert conn.execute(select(_orders)).all() == [(1,)]
+    assert _attempts(dbapi) == 3
+    assert (policy.retries, policy.recovered, policy.exhausted) == (2, 1, 0)
+    assert policy.errors == {250003: 2}
+    assert len(dbapi.connections) == 1
+
+
+def test_attempts_are_bounded():
+    engine, dbapi, policy = _engine(_Flaky(5), max_attempts=3)
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.OperationalError):
+            conn.execute(text("select * from orders"))
+    assert _attempts(dbapi) == 3
+    assert (policy.retries, policy.recovered, policy.exhausted) == (2, 0, 1)
+
+
+def test_writes_are_retried_only_when_marked_idempotent():
+    engine, dbapi, policy = _engine(_Flaky(2))
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.OperationalError):
+            conn.execute(_orders.delete())
+        conn.execute(_orders.delete().execution_options(idempotent=True))
+    assert _attempts(dbapi) == 3
+    assert policy.recovered == 1
+
+
+def test_read_marked_not_idempotent_is_not_retried():
+    engine, dbapi, policy = _engine(_Flaky(1))
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.OperationalError):
+            conn.execute(select(_orders).execution_options(idempotent=False))
+    assert _attempts(dbapi) == 1
+    assert policy.retries == 0
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (OperationalError("HTTP 503", 290503), True),
+        (OperationalError("link failure", sqlstate="08S01"), True),
+        (ProgrammingError("SQL compilation error", 2003, "42S02"), False),
+        (ProgrammingError("Session no longer exists", 390111), False),
+        (ProgrammingError("SQL execution canceled", 604, "57014"), False),
+    ],
+)
+def test_classification(error, retried):
+    engine, dbapi, policy = _engine(_Flaky(1, error))
+    with engine.connect() as conn:
+        if retried:
+            conn.execute(select(_orders))
+        else:
+            with pytest.raises(sa_exc.DBAPIError):
+                conn.execute(select(_orders))
+    assert _attempts(dbapi) == (2 if retried else 1)
+    assert policy.is_retryable(error) is retried
+
+
+def test_backoff_is_exponential_with_jitter():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+    for attempt, ceiling in [(1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (10, 0.5)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_without_policy_nothing_is_retried():
+    dbapi = FakeDBAPI(_Flaky(1))
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        with pytest.raises(sa_exc.OperationalError):
+            conn.execute(select(_orders))
+    assert _attempts(dbapi) == 1
+
+
+def test_max_attempts_must_be_positive():
+    with pytest.raises(ValueError, match="max_attempts"):
+        RetryPolicy(max_attempts=0)
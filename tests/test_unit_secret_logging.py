@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the engine-log secret redaction and its fast path."""
+
+from __future__ import annotations
+
+import logging
+from unittest import mock
+
+import pytest
+
+from snowflake.sqlalchemy import SnowflakeSecretRedactionFilter, redact_secrets
+from snowflake.sqlalchemy.secret_logging import _SECRET_LITERAL_RE
+
+_COPY = (
+    "COPY INTO 's3://bucket/path' FROM t "
+    "CREDENTIALS=(AWS_KEY_ID='AKIAEXAMPLE' AWS_SECRET_KEY='wJalr''XUtSECRET') "
+    "FILE_FORMAT=(TYPE=csv)"
+)
+
+
+def _large_merge(columns: int = 100_000) -> str:
+    values = ", ".join(f"'value_{i}' AS c{i}" for i in range(columns))
+    return f"MERGE INTO t USING (SELECT {values}) s ON t.id = s.id"
+
+
+def _record(msg, args=None):
+    return logging.LogRecord("sqlalchemy.engine.Engine", 20, "", 1, msg, args, None)
+
+
+def test_text_without_secret_keys_is_returned_as_is():
+    sql = _large_merge(100)
+    assert redact_secrets(sql) is sql
+
+
+def test_max_length_truncates_and_reports_the_cut():
+    sql = _large_merge(100)
+    out = redact_secrets(sql, max_length=50)
+    assert out == f"{sql[:50]}... [{len(sql) - 50} characters truncated]"
+    assert redact_secrets(sql, max_length=len(sql)) == sql
+
+
+@pytest.mark.parametrize(
+    "cut", [_COPY.index("wJalr") + n for n in range(0, 16)], ids=lambda n: str(n)
+)
+def test_secret_cut_open_by_truncation_is_masked(cut):
+    out = redact_secrets(_COPY, max_length=cut)
+    for fragment in ("wJ", "XUt", "SECRET'"):
+        assert fragment not in out
+    assert "AKIAEXAMPLE" not in out
+    assert out.startswith("COPY INTO 's3://bucket/path' FROM t CREDENTIALS=(")
+
+
+def test_filter_leaves_non_string_parameter_sets_untouched():
+    params = object()
+    args = (params, "no secrets here")
+    record = _record("[generated in %s] %r", args)
+    SnowflakeSecretRedactionFilter().filter(record)
+    assert record.args is args
+
+
+def test_filter_caps_message_and_string_arguments():
+    record = _record(_COPY, ("x" * 100,))
+    SnowflakeSecretRedactionFilter(max_length=40).filter(record)
+    assert record.msg.startswith(_COPY[:40])
+    assert "AKIAEXAMPLE" not in record.msg
+    assert record.args[0].endswith("... [60 characters truncated]")
+
+
+@pytest.fixture
+def secret_regex():
+    """The secret literal regex, with its calls recorded."""
+    from snowflake.sqlalchemy import secret_logging
+
+    with mock.patch.object(
+        secret_logging, "_SECRET_LITERAL_RE", mock.Mock(wraps=_SECRET_LITERAL_RE)
+    ) as regex:
+        yield regex
+
+
+def test_large_statement_without_secrets_skips_the_regex(secret_regex):
+    """A multi-megabyte statement without secret keys is not scanned by it."""
+    sql = _large_merge()
+    assert len(sql) > 2_000_000
+    record = _record(sql)
+    SnowflakeSecretRedactionFilter().filter(record)
+    assert record.msg is sql
+    assert secret_regex.sub.call_count == 0
+
+    SnowflakeSecretRedactionFilter().filter(_record(_COPY))
+    assert secret_regex.sub.call_count == 1
+
+
+def test_large_statement_with_length_cap_scans_only_the_kept_text(secret_regex):
+    """With a cap, the regex only sees the kept text, secrets or not."""
+    sql = _COPY + " " + _large_merge()
+    record = _record(sql)
+    SnowflakeSecretRedactionFilter(max_length=10_000).filter(record)
+
+    [call] = secret_regex.sub.call_args_list
+    assert len(call.args[1]) == 10_000
+    assert "AKIAEXAMPLE" not in record.msg
+    assert record.msg.endswith(f"... [{len(sql) - 10_000} characters truncated]")
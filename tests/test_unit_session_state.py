@@ -0,0 +1,209 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the ``session_parameters`` / ``warehouse`` execution options."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+
+from snowflake.sqlalchemy import get_session_state, reset_session_state
+
+from .fake_dbapi import FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+
+
+def _responder(sql):
+    if "BROKEN" in sql:
+        raise ProgrammingError("invalid parameter 'BROKEN'", errno=1006)
+    return default_responder(sql)
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI(_responder)
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=1)
+    yield engine
+    engine.dispose()
+
+
+def _session_calls(dbapi, start=0):
+    return [
+        (sql, kwargs)
+        for sql, _, kwargs in dbapi.calls[start:]
+        if sql.startswith(("ALTER SESSION", "USE"))
+    ]
+
+
+def test_parameters_are_sent_once_per_connection(engine, dbapi):
+    options = {"session_parameters": {"QUERY_TAG": "tenant-a", "TIMEZONE": "UTC"}}
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execution_options(**options).execute(text("select 1"))
+
+    assert _session_calls(dbapi) == [
+        ("ALTER SESSION SET QUERY_TAG = 'tenant-a', TIMEZONE = 'UTC'", {})
+    ]
+
+
+def test_only_changed_values_are_sent(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(
+            session_parameters={"query_tag": "a", "week_start": 1}
+        ).execute(text("select 1"))
+        start = len(dbapi.calls)
+        conn.execution_options(
+            session_parameters={"QUERY_TAG": "b", "WEEK_START": 1}
+        ).execute(text("select 1"))
+
+    assert _session_calls(dbapi, start) == [("ALTER SESSION SET QUERY_TAG = 'b'", {})]
+    with engine.connect() as conn:
+        assert get_session_state(conn.connection) == {
+            "QUERY_TAG": "'b'",
+            "WEEK_START": "1",
+        }
+
+
+def test_warehouse_and_parameters_share_one_request(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(
+            session_parameters={"QUERY_TAG": "x", "USE_CACHED_RESULT": False},
+            warehouse="reporting_wh",
+        ).execute(text("select 1"))
+        conn.execution_options(warehouse="reporting_wh").execute(text("select 1"))
+
+    assert _session_calls(dbapi) == [
+        (
+            "ALTER SESSION SET QUERY_TAG = 'x', USE_CACHED_RESULT = FALSE;\n"
+            "USE WAREHOUSE reporting_wh",
+            {"num_statements": 2},
+        )
+    ]
+
+
+def test_none_unsets_parameter(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(session_parameters={"QUERY_TAG": "x"}).execute(
+            text("select 1")
+        )
+        for _ in range(2):
+            conn.execution_options(session_parameters={"QUERY_TAG": None}).execute(
+                text("select 1")
+            )
+    assert [sql for sql, _ in _session_calls(dbapi)] == [
+        "ALTER SESSION SET QUERY_TAG = 'x'",
+        "ALTER SESSION UNSET QUERY_TAG",
+    ]
+
+
+def test_values_are_escaped_and_names_validated(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(
+            session_parameters={"QUERY_TAG": "it's 100%"}, warehouse='wh"; drop'
+        ).execute(text("select 1"))
+        with pytest.raises(sa_exc.ArgumentError, match="session parameter name"):
+            conn.execution_options(
+                session_parameters={"QUERY_TAG = 1; DROP TABLE t; --": 1}
+            ).execute(text("select 1"))
+    [(sql, _)] = _session_calls(dbapi)
+    assert "QUERY_TAG = 'it''s 100%'" in sql
+    assert sql.endswith('USE WAREHOUSE "wh""; drop"')
+
+
+def test_state_survives_rollback(engine, dbapi):
+    options = {"session_parameters": {"QUERY_TAG": "x"}}
+    with engine.connect() as conn:
+        conn.execution_options(**options).execute(text("select 1"))
+        conn.rollback()
+        conn.execution_options(**options).execute(text("select 1"))
+    assert len(_session_calls(dbapi)) == 1
+
+
+def test_state_is_dropped_with_invalidated_connection(engine, dbapi):
+    options = {"session_parameters": {"QUERY_TAG": "x"}}
+    with engine.connect() as conn:
+        conn.execution_options(**options).execute(text("select 1"))
+        conn.invalidate()
+    with engine.connect() as conn:
+        conn.execution_options(**options).execute(text("select 1"))
+    assert len(dbapi.connections) == 2
+    assert len(_session_calls(dbapi)) == 2
+
+
+def test_failure_forgets_state(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(session_parameters={"QUERY_TAG": "x"}).execute(
+            text("select 1")
+        )
+        with pytest.raises(sa_exc.ProgrammingError):
+            conn.execution_options(
+                session_parameters={"QUERY_TAG": "x", "BROKEN": 1}
+            ).execute(text("select 1"))
+        assert get_session_state(conn.connection) == {}
+
+
+def test_own_alter_session_forgets_state(engine, dbapi):
+    options = {"session_parameters": {"QUERY_TAG": "x"}}
+    with engine.connect() as conn:
+        conn.execution_options(**options).execute(text("select 1"))
+        conn.execute(text("alter session set query_tag = 'y'"))
+        conn.execution_options(**options).execute(text("select 1"))
+        reset_session_state(conn.connection)
+        conn.execution_options(**options).execute(text("select 1"))
+    assert [sql for sql, _ in _session_calls(dbapi)] == [
+        "ALTER SESSION SET QUERY_TAG = 'x'",
+        "ALTER SESSION SET QUERY_TAG = 'x'",
+        "ALTER SESSION SET QUERY_TAG = 'x'",
+    ]
+
+
+def test_next_checkout_does_not_inherit_values(dbapi):
+    engine = create_engine(f"{_URL}?warehouse=wh", module=dbapi, pool_size=1)
+    with engine.connect() as conn:
+        conn.execution_options(
+            session_parameters={"QUERY_TAG": "tenant-a", "TIMEZONE": "UTC"},
+            warehouse="tenant_a_wh",
+        ).execute(text("select 1"))
+    start = len(dbapi.calls)
+    with engine.connect() as conn:
+        conn.execution_options(session_parameters={"TIMEZONE": "UTC"}).execute(
+            text("select 1")
+        )
+        conn.execute(text("select 2"))
+        assert get_session_state(conn.connection) == {
+            "QUERY_TAG": None,
+            "TIMEZONE": "'UTC'",
+            "USE WAREHOUSE": "wh",
+        }
+
+    engine.dispose()
+    assert len(dbapi.connections) == 1
+    assert _session_calls(dbapi, start) == [
+        ("ALTER SESSION UNSET QUERY_TAG;\nUSE WAREHOUSE wh", {"num_statements": 2})
+    ]
+
+
+def test_connection_without_warehouse_is_recycled(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(warehouse="tenant_a_wh").execute(text("select 1"))
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    assert len(dbapi.connections) == 2
+
+
+def test_forgotten_state_recycles_connection(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execution_options(session_parameters={"QUERY_TAG": "x"}).execute(
+            text("select 1")
+        )
+        conn.execute(text("alter session set timezone = 'UTC'"))
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+    assert len(dbapi.connections) == 2
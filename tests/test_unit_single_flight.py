@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the ``single_flight`` execution option."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select
+from sqlalchemy import exc as sa_exc
+
+from .fake_dbapi import FakeDBAPI, ProgrammingError, default_responder
+
+_URL = "snowflake://u:p@acct/db/public"
+_THREADS = 5
+
+_report = Table("report", MetaData(), Column("day", Integer), Column("total", Integer))
+
+
+class _SlowReport:
+    """Answers ``report`` reads only once ``release`` is set."""
+
+    def __init__(self, fail_first=False):
+        self.release = threading.Event()
+        self.reads = 0
+        self.fail_first = fail_first
+
+    def __call__(self, sql):
+        if "FROM report" not in sql:
+            return default_responder(sql)
+        self.reads += 1
+        self.release.wait(5)
+        if self.fail_first and self.reads == 1:
+            raise ProgrammingError("Warehouse 'WH' was suspended", errno=606)
+        return ["day", "total"], [[1, 10], [2, 20]]
+
+
+def _run_concurrently(engine, stmt, wait_for_waiters, responder):
+    results, errors = [], []
+
+    def run():
+        try:
+            with engine.connect() as conn:
+                results.append(conn.execute(stmt).all())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(_THREADS)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    registry = engine.dialect._single_flight
+    while time.monotonic() < deadline:
+        waiting = sum(f.waiters for f in registry._flights.values())
+        if waiting == wait_for_waiters and (wait_for_waiters or responder.reads):
+            break
+        time.sleep(0.01)
+    responder.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def _engine(responder):
+    return create_engine(_URL, module=FakeDBAPI(responder), pool_size=_THREADS)
+
+
+def test_identical_reads_share_one_execution():
+    responder = _SlowReport()
+    engine = _engine(responder)
+    stmt = (
+        select(_report).where(_report.c.day > 0).execution_options(single_flight=True)
+    )
+    results, errors = _run_concurrently(engine, stmt, _THREADS - 1, responder)
+
+    assert errors == []
+    assert results == [[(1, 10), (2, 20)]] * _THREADS
+    assert responder.reads == 1
+    assert engine.dialect.coalesced_executions == _THREADS - 1
+    assert engine.dialect._single_flight.in_flight == 0
+
+
+def test_different_parameters_are_not_coalesced():
+    responder = _SlowReport()
+    engine = _engine(responder)
+    responder.release.set()
+    with engine.connect() as a, engine.connect() as b:
+        for day, conn in ((1, a), (2, b)):
+            stmt = select(_report).where(_report.c.day > day)
+            conn.execution_options(single_flight=True).execute(stmt).all()
+    assert responder.reads == 2
+
+
+def test_without_option_every_read_runs():
+    responder = _SlowReport()
+    engine = _engine(responder)
+    results, errors = _run_concurrently(engine, select(_report), 0, responder)
+    assert errors == [] and len(results) == _THREADS
+    assert responder.reads == _THREADS
+
+
+def test_writes_are_never_coalesced():
+    dbapi = FakeDBAPI()
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect() as conn:
+        for _ in range(2):
+            conn.execution_options(single_flight=True).execute(
+                _report.insert(), {"day": 1, "total": 1}
+            )
+    assert sum(sql.startswith("INSERT") for sql in dbapi.log) == 2
+    assert engine.dialect._single_flight.in_flight == 0
+
+
+def test_waiters_run_themselves_when_leader_fails():
+    responder = _SlowReport(fail_first=True)
+    engine = _engine(responder)
+    stmt = select(_report).execution_options(single_flight=True)
+    results, errors = _run_concurrently(engine, stmt, _THREADS - 1, responder)
+
+    assert len(errors) == 1 and isinstance(errors[0], sa_exc.ProgrammingError)
+    assert results == [[(1, 10), (2, 20)]] * (_THREADS - 1)
+    assert responder.reads == _THREADS
+    assert engine.dialect.coalesced_executions == 0
+    assert engine.dialect._single_flight.in_flight == 0
+
+
+def test_uncommitted_writes_neither_lead_nor_join():
+    responder = _SlowReport()
+    engine = _engine(responder)
+    registry = engine.dialect._single_flight
+    stmt = select(_report).execution_options(single_flight=True)
+    results = []
+
+    def read(write):
+        with engine.connect() as conn:
+            if write:
+                conn.execute(_report.update().values(total=0))
+            results.append(conn.execute(stmt).all())
+
+    def start(write, reads):
+        thread = threading.Thread(target=read, args=(write,))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while responder.reads < reads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return thread
+
+    threads = [start(True, 1)]
+    assert registry.in_flight == 0
+    threads.append(start(False, 2))
+    assert registry.in_flight == 1
+    threads.append(start(True, 3))
+    responder.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [[(1, 10), (2, 20)]] * 3
+    assert responder.reads == 3
+    assert engine.dialect.coalesced_executions == 0
+
+
+def test_abandoned_leader_releases_waiters():
+    responder = _SlowReport()
+    responder.release.set()
+    engine = _engine(responder)
+    stmt = select(_report).execution_options(single_flight=True)
+
+    def fail_after_execute(*args):
+        raise RuntimeError("listener failed")
+
+    from sqlalchemy import event
+
+    event.listen(engine, "after_cursor_execute", fail_after_execute)
+    with engine.connect() as conn:
+        with pytest.raises(RuntimeError):
+            conn.execute(stmt)
+    event.remove(engine, "after_cursor_execute", fail_after_execute)
+    assert engine.dialect._single_flight.in_flight == 0
+    with engine.connect() as conn:
+        assert conn.execute(stmt).all() == [(1, 10), (2, 20)]
@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for table statistics and clustering key reflection.
+
+Both are served from ``SHOW TABLES`` output the dialect already fetches for
+``get_table_names`` (or, for a single table, from the ``SHOW TABLES LIKE`` row
+shared with comment reflection), so the tests count round trips as well as
+checking the parsed values.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.schema import CreateTable
+
+from snowflake.sqlalchemy import SnowflakeTable
+from snowflake.sqlalchemy.inspector import SnowflakeInspector
+from snowflake.sqlalchemy.snowdialect import SnowflakeDialect
+from snowflake.sqlalchemy.sql.custom_schema.options import ClusterByOption
+
+SHOW_DESCRIPTION = [
+    ("created_on",),
+    ("name",),
+    ("kind",),
+    ("cluster_by",),
+    ("rows",),
+    ("bytes",),
+    ("automatic_clustering",),
+    ("is_hybrid",),
+]
+
+
+def _row(name, rows=0, size=0, cluster_by="", automatic_clustering="OFF"):
+    return [None, name, "TABLE", cluster_by, rows, size, automatic_clustering, "N"]
+
+
+def _show_tables_conn(rows):
+    conn = MagicMock()
+    result = MagicMock()
+    result.cursor.description = SHOW_DESCRIPTION
+    result.cursor.fetchall.return_value = rows
+    conn.execute.return_value = result
+    return conn
+
+
+@pytest.fixture
+def dialect():
+    d = SnowflakeDialect()
+    d._get_full_schema_name = MagicMock(return_value='"DB"."S"')
+    return d
+
+
+def test_get_table_stats_reads_show_tables_columns(dialect):
+    conn = _show_tables_conn(
+        [_row("EVENTS", 1200, 65536, "LINEAR(EVENT_DATE, ID)", "ON")]
+    )
+    assert dialect.get_table_stats(conn, "events", schema="s", info_cache={}) == {
+        "kind": "TABLE",
+        "rows": 1200,
+        "bytes": 65536,
+        "cluster_by": ["event_date", "id"],
+        "automatic_clustering": True,
+    }
+
+
+def test_get_table_stats_unknown_table_raises(dialect):
+    conn = _show_tables_conn([_row("EVENTS")])
+    with pytest.raises(sa_exc.NoSuchTableError):
+        dialect.get_table_stats(conn, "missing", schema="s", info_cache={})
+
+
+def test_stats_share_the_get_table_names_show_pass(dialect):
+    conn = _show_tables_conn([_row("A", 1), _row("B", 2)])
+    info_cache: dict = {}
+    assert dialect.get_table_names(conn, schema="s", info_cache=info_cache) == [
+        "a",
+        "b",
+    ]
+    stats = dict(dialect.get_multi_table_stats(conn, schema="s", info_cache=info_cache))
+    assert {key: value["rows"] for key, value in stats.items()} == {
+        ("s", "a"): 1,
+        ("s", "b"): 2,
+    }
+    assert conn.execute.call_count == 1
+
+
+def test_get_multi_table_stats_honours_filter_names(dialect):
+    conn = _show_tables_conn([_row("A"), _row("B")])
+    stats = dialect.get_multi_table_stats(
+        conn, schema="s", filter_names=["b", "missing"], info_cache={}
+    )
+    assert [key for key, _ in stats] == [("s", "b")]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("", []),
+        (None, []),
+        ("LINEAR(ID)", ["id"]),
+        ("LINEAR(ID, NAME)", ["id", "name"]),
+        ('LINEAR("MixedCase", ID)', ['"MixedCase"', "id"]),
+        (
+            "LINEAR(TO_DATE(TS), SUBSTRING(CODE, 1, 3))",
+            ["TO_DATE(TS)", "SUBSTRING(CODE, 1, 3)"],
+        ),
+        ("LINEAR(V:a::string, ID)", ["V:a::string", "id"]),
+        ("LINEAR(IFF(X = ',', 1, 2))", ["IFF(X = ',', 1, 2)"]),
+    ],
+)
+def test_reflect_cluster_by_splits_top_level_expressions(dialect, value, expected):
+    assert [str(key) for key in dialect._reflect_cluster_by(value)] == expected
+
+
+def test_cluster_by_keeps_expressions_as_text(dialect):
+    keys = dialect._reflect_cluster_by("LINEAR(ID, TO_DATE(TS))")
+    assert keys[0] == "id"
+    assert str(keys[1]) == "TO_DATE(TS)"
+    assert not isinstance(keys[1], str)
+
+
+def test_table_options_bulk_path_uses_schema_pass(dialect):
+    conn = _show_tables_conn([_row("A", cluster_by="LINEAR(ID)"), _row("B")])
+    options = dialect.get_multi_table_options(conn, schema="s", info_cache={})
+    assert options == [(("s", "a"), {"snowflake_clusterby": ["id"]})]
+    assert "TABLES IN SCHEMA" in str(conn.execute.call_args[0][0])
+
+
+def test_table_options_single_table_shares_comment_query(dialect):
+    conn = MagicMock()
+    row = MagicMock()
+    row._mapping = {"cluster_by": "LINEAR(ID)", "comment": "hello"}
+    conn.execute.return_value.fetchone.return_value = row
+    info_cache: dict = {}
+
+    options = dialect.get_multi_table_options(
+        conn, schema="s", filter_names=["a"], info_cache=info_cache
+    )
+    comment = dialect.get_table_comment(conn, "a", schema="s", info_cache=info_cache)
+
+    assert options == [(("s", "a"), {"snowflake_clusterby": ["id"]})]
+    assert comment == {"text": "hello"}
+    assert conn.execute.call_count == 1
+    assert "TABLES LIKE 'a'" in str(conn.execute.call_args[0][0])
+
+
+def test_dialect_uses_snowflake_inspector(dialect):
+    assert SnowflakeDialect.inspector is SnowflakeInspector
+    conn = _show_tables_conn([_row("A", 5, 10)])
+    conn.dialect = conn.engine.dialect = dialect
+    inspector = SnowflakeInspector._construct(SnowflakeInspector._init_connection, conn)
+
+    assert inspector.get_table_stats("a", schema="s")["bytes"] == 10
+    assert inspector.get_multi_table_stats(schema="s")[("s", "a")]["rows"] == 5
+    assert conn.execute.call_count == 1
+
+
+def test_reflected_clusterby_becomes_cluster_by_option():
+    table = SnowflakeTable(
+        "t", MetaData(), Column("id", Integer, primary_key=True), cluster_by=None
+    )
+    table._validate_dialect_kwargs({"snowflake_clusterby": ["id", text("id > 0")]})
+    table._adopt_reflected_cluster_by()
+
+    assert isinstance(table.cluster_by, ClusterByOption)
+    assert [str(e) for e in table.cluster_by.expressions] == ["id", "id > 0"]
+    ddl = str(CreateTable(table).compile(dialect=SnowflakeDialect()))
+    assert ddl.count("CLUSTER BY") == 1
+    assert "CLUSTER BY (id, id > 0)" in ddl
+
+
+def test_declared_cluster_by_wins_over_reflected():
+    table = SnowflakeTable(
+        "t", MetaData(), Column("id", Integer, primary_key=True), cluster_by=["id"]
+    )
+    table._validate_dialect_kwargs({"snowflake_clusterby": ["other"]})
+    table._adopt_reflected_cluster_by()
+    assert [str(e) for e in table.cluster_by.expressions] == ["id"]
+    assert "clusterby" not in table.dialect_options["snowflake"]._non_defaults
@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for the background telemetry sender."""
+
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from snowflake.sqlalchemy._telemetry import (
+    TelemetryEvents,
+    TelemetrySender,
+    record_new_connection,
+)
+
+
+class _RecordingAdapter:
+    def __init__(self, block: threading.Event | None = None):
+        self.block = block
+        self.registered = []
+        self.flushes = []
+
+    def register(self, event_type, value, *, connection):
+        if self.block is not None:
+            self.block.wait(5)
+        self.registered.append((connection, event_type))
+
+    def flush(self, *, connection):
+        self.flushes.append(connection)
+
+    def is_enabled(self, *, connection):
+        return True
+
+
+def _connection(closed=False):
+    return SimpleNamespace(is_closed=lambda: closed)
+
+
+def test_submit_does_not_wait_for_the_send():
+    release = threading.Event()
+    adapter = _RecordingAdapter(block=release)
+    sender = TelemetrySender(linger=0)
+
+    assert sender.submit(adapter, _connection(), [("t", "v")])
+    assert adapter.registered == []
+
+    release.set()
+    assert sender.flush(timeout=5)
+    assert len(adapter.registered) == 1
+
+
+def test_events_are_dropped_when_the_queue_is_full():
+    release = threading.Event()
+    adapter = _RecordingAdapter(block=release)
+    sender = TelemetrySender(max_queued=2, max_batch=1, linger=0)
+
+    accepted = [
+        sender.submit(adapter, _connection(), [("a", 1), ("b", 2)]) for _ in range(6)
+    ]
+    # One item is being sent, two are queued; the rest are dropped.
+    assert accepted.count(False) >= 3
+    assert sender.dropped == 2 * accepted.count(False)
+
+    release.set()
+    assert sender.flush(timeout=5)
+
+
+def test_connections_opened_together_share_one_send():
+    adapters = [_RecordingAdapter() for _ in range(3)]
+    connections = [_connection(closed=True), _connection(), _connection()]
+    sender = TelemetrySender(linger=0.5)
+
+    for adapter, connection in zip(adapters, connections, strict=True):
+        sender.submit(adapter, connection, [("a", 1), ("b", 2)])
+    assert sender.flush(timeout=5)
+
+    used = [a for a in adapters if a.registered]
+    assert len(used) == 1
+    assert len(used[0].registered) == 6
+    # The send is bound to a connection that is still open.
+    assert used[0].flushes == [connections[1]]
+    assert sender.batches_sent == 1
+
+
+def test_events_are_sent_through_a_session_of_their_own_user():
+    adapters = [_RecordingAdapter() for _ in range(3)]
+    connections = [
+        SimpleNamespace(is_closed=lambda: False, account="a1", user="u1"),
+        SimpleNamespace(is_closed=lambda: False, account="a2", user="u1"),
+        SimpleNamespace(is_closed=lambda: False, account="a1", user="u1"),
+    ]
+    sender = TelemetrySender(linger=0.5)
+
+    for adapter, connection in zip(adapters, connections, strict=True):
+        sender.submit(adapter, connection, [("a", 1)])
+    assert sender.flush(timeout=5)
+
+    assert [c for c, _ in adapters[0].registered] == [connections[0], connections[2]]
+    assert adapters[0].flushes == [connections[0]]
+    assert adapters[1].registered == [(connections[1], "a")]
+    assert adapters[1].flushes == [connections[1]]
+    assert adapters[2].registered == []
+    assert sender.batches_sent == 2
+
+
+def test_a_failing_connection_does_not_lose_the_batch(caplog):
+    class _Failing(_RecordingAdapter):
+        def register(self, event_type, value, *, connection):
+            if connection.bad:
+                raise RuntimeError("boom")
+            super().register(event_type, value, connection=connection)
+
+    adapter = _Failing()
+    bad, good = SimpleNamespace(bad=True), SimpleNamespace(bad=False)
+    sender = TelemetrySender(linger=0.5)
+    caplog.set_level("DEBUG", logger="snowflake.sqlalchemy._telemetry.sender")
+
+    sender.submit(adapter, bad, [("a", 1)])
+    sender.submit(_Failing(), good, [("a", 1)])
+    assert sender.flush(timeout=5)
+
+    assert adapter.registered == [(good, "a")]
+    assert adapter.flushes == [bad]
+    assert any("Failed to send telemetry data" in m for m in caplog.messages)
+
+
+def test_payloads_are_built_once_per_dialect():
+    dialect = SimpleNamespace(
+        _case_sensitive_identifiers=False,
+        _enable_decfloat=False,
+        _enable_structured_type_json=True,
+        force_div_is_floordiv=False,
+        _isolation_level=None,
+    )
+    adapter = _RecordingAdapter()
+    sender = TelemetrySender(linger=0)
+    with (
+        mock.patch("snowflake.sqlalchemy._telemetry.get_adapter", return_value=adapter),
+        mock.patch("snowflake.sqlalchemy._telemetry.get_sender", return_value=sender),
+        mock.patch(
+            "snowflake.sqlalchemy._telemetry.build_new_connection_payload",
+            wraps=lambda d: {"SQLAlchemy": "x"},
+        ) as build,
+    ):
+        for password in ("p1", "p2", "p3"):
+            record_new_connection(
+                dialect, _connection(), {"user": "u", "password": password}
+            )
+        record_new_connection(
+            dialect, _connection(), {"user": "v", "token": "t", "password": "p"}
+        )
+        assert sender.flush(timeout=5)
+
+    assert build.call_count == 2
+    assert dialect._telemetry_events[0] == {"user": "v"}
+    assert [e for _, e in adapter.registered].count(
+        TelemetryEvents.NEW_CONNECTION_PARAMETERS.value
+    ) == 4
+
+
+def test_flush_without_pending_events_returns_immediately():
+    assert TelemetrySender().flush(timeout=0)
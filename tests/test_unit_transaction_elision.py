@@ -0,0 +1,118 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``elide_empty_transactions``."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    create_engine,
+    insert,
+    select,
+    text,
+)
+
+from .fake_dbapi import FakeDBAPI, OperationalError
+
+_URL = "snowflake://u:p@acct/db/public"
+
+t = Table("t", MetaData(), Column("x", Integer))
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI()
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi, elide_empty_transactions=True)
+    yield engine
+    engine.dispose()
+
+
+def _round_trips(dbapi):
+    return sum(c.rollbacks + c.commits for c in dbapi.connections)
+
+
+def test_checkin_without_statements_skips_rollback(engine, dbapi):
+    for _ in range(3):
+        with engine.connect():
+            pass
+    assert _round_trips(dbapi) == 0
+    assert engine.dialect.elided_transaction_round_trips >= 3
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        select(t),
+        text("select 1"),
+        text("SHOW TABLES"),
+    ],
+    ids=["select", "text_select", "show"],
+)
+def test_read_only_statements_leave_connection_clean(engine, dbapi, statement):
+    with engine.connect() as conn:
+        conn.execute(statement)
+    with engine.begin() as conn:
+        conn.execute(statement)
+    assert _round_trips(dbapi) == 0
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        insert(t).values(x=1),
+        select(t).with_for_update(),
+        text("select * from t for update"),
+        text("call refresh_stats()"),
+    ],
+    ids=["insert", "for_update", "text_for_update", "call"],
+)
+def test_statements_that_may_open_a_transaction_are_ended(engine, dbapi, statement):
+    with engine.connect() as conn:
+        conn.execute(statement)
+        conn.commit()
+        # The commit ended the transaction; nothing to roll back on check-in.
+    [connection] = dbapi.connections
+    assert (connection.commits, connection.rollbacks) == (1, 0)
+
+
+def test_failed_rollback_keeps_connection_dirty(engine, dbapi):
+    with engine.connect() as conn:
+        conn.execute(insert(t).values(x=1))
+        connection = dbapi.connections[0]
+
+        def fail():
+            raise OperationalError("network error")
+
+        connection.rollback = fail
+        with pytest.raises(Exception, match="network error"):
+            conn.rollback()
+        del connection.rollback
+        conn.rollback()
+    assert connection.rollbacks == 1
+
+
+def test_disabled_by_default(dbapi):
+    engine = create_engine(_URL, module=dbapi)
+    with engine.connect():
+        pass
+    # The rollbacks after dialect initialization and at check-in.
+    assert _round_trips(dbapi) == 2
+    assert engine.dialect.elided_transaction_round_trips == 0
+
+
+def test_url_parameter(dbapi):
+    engine = create_engine(f"{_URL}?elide_empty_transactions=true", module=dbapi)
+    assert engine.dialect._elide_empty_transactions is True
+    with engine.connect():
+        pass
+    assert _round_trips(dbapi) == 0
+    assert "elide_empty_transactions" not in dbapi.connections[0].kwargs
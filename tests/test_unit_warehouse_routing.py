@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2012-2023 Snowflake Computing Inc. All rights reserved.
+#
+"""Unit tests for ``WarehouseRouter``."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import NullPool
+
+from snowflake.sqlalchemy import WarehouseRouter
+
+from .fake_dbapi import FakeDBAPI
+
+_URL = "snowflake://u:p@acct/db/public?warehouse=default_wh"
+
+
+@pytest.fixture
+def dbapi():
+    return FakeDBAPI()
+
+
+@pytest.fixture
+def engine(dbapi):
+    engine = create_engine(_URL, module=dbapi, pool_size=2, max_overflow=0)
+    yield engine
+    engine.dispose()
+
+
+def _use_warehouse(dbapi):
+    return [sql for sql in dbapi.log if sql.startswith("USE WAREHOUSE")]
+
+
+def test_connections_stay_bound_to_their_warehouse(engine, dbapi):
+    router = WarehouseRouter(engine)
+    for _ in range(3):
+        for warehouse in ("lookup_wh", "reporting_wh"):
+            with router.connect(warehouse) as conn:
+                conn.execute(text("select 1"))
+    assert _use_warehouse(dbapi) == [
+        "USE WAREHOUSE lookup_wh",
+        "USE WAREHOUSE reporting_wh",
+    ]
+    assert engine.dialect.warehouse_switches == 2
+    assert len(dbapi.connections) == 2
+
+
+def test_warehouse_option_on_a_shared_pool_switches_every_time(engine, dbapi):
+    with engine.connect() as conn:
+        for _ in range(3):
+            for warehouse in ("lookup_wh", "reporting_wh"):
+                conn.execute(text("select 1").execution_options(warehouse=warehouse))
+    assert len(_use_warehouse(dbapi)) == 6
+    assert engine.dialect.warehouse_switches == 6
+
+
+def test_busy_warehouse_does_not_starve_the_others(dbapi):
+    engine = create_engine(
+        _URL, module=dbapi, pool_size=2, max_overflow=0, pool_timeout=0.01
+    )
+    router = WarehouseRouter(engine, pool_sizes={"reporting_wh": 1})
+    with router.connect("reporting_wh"):
+        with pytest.raises(sa_exc.TimeoutError):
+            router.connect("reporting_wh")
+        with router.connect("lookup_wh"), router.connect("lookup_wh"):
+            metrics = router.metrics()
+        with engine.connect():
+            pass
+    assert metrics["reporting_wh"]["checked_out"] == 1
+    assert metrics["lookup_wh"]["checked_out"] == 2
+    assert metrics["lookup_wh"]["checkouts"] == 2
+    assert router.metrics()["lookup_wh"]["checked_out"] == 0
+    assert router.routes["reporting_wh"].pool.size() == 1
+    engine.dispose()
+
+
+def test_metrics_record_checkout_waits(engine):
+    router = WarehouseRouter(engine)
+    with router.connect("lookup_wh"):
+        pass
+    [route] = router.routes.values()
+    assert route.as_dict() == {
+        "warehouse": "lookup_wh",
+        "checkouts": 1,
+        "checked_out": 0,
+        "wait_seconds": route.wait_seconds,
+        "max_wait_seconds": route.max_wait_seconds,
+    }
+    assert 0 < route.max_wait_seconds <= route.wait_seconds
+
+
+def test_engine_dispose_closes_the_warehouse_pools(engine, dbapi):
+    router = WarehouseRouter(engine)
+    with router.connect("lookup_wh") as conn:
+        conn.execute(text("select 1"))
+    engine.dispose()
+    assert all(connection.closed for connection in dbapi.connections)
+    with router.connect("lookup_wh") as conn:
+        conn.execute(text("select 1"))
+    assert len(_use_warehouse(dbapi)) == 2
+
+
+def test_pool_sizes_need_a_queue_pool(dbapi):
+    engine = create_engine(_URL, module=dbapi, poolclass=NullPool)
+    with pytest.raises(sa_exc.ArgumentError, match="QueuePool"):
+        WarehouseRouter(engine, pool_sizes={"lookup_wh": 1})